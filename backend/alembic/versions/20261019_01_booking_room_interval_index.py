@@ -0,0 +1,24 @@
+"""index bookings by room and interval for overlap checks
+
+Revision ID: 20261019_01
+Revises: 20250214_02
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_01"
+down_revision = "20250214_02"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_bookings_room_interval", "bookings", ["room_id", "start_time", "end_time"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_room_interval", table_name="bookings")
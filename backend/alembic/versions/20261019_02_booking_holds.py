@@ -0,0 +1,33 @@
+"""tentative booking holds with expiry
+
+Revision ID: 20261019_02
+Revises: 20261019_01
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_02"
+down_revision = "20261019_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("hold_expires_at", sa.DateTime(timezone=True), nullable=True))
+    # Partial index: only live holds are indexed, so the sweeper's range scan stays tiny.
+    op.create_index(
+        "ix_bookings_hold_expiry",
+        "bookings",
+        ["hold_expires_at"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_hold_expiry", table_name="bookings")
+    op.drop_column("bookings", "hold_expires_at")
@@ -0,0 +1,120 @@
+"""normalize customer contact details and make them unique
+
+Revision ID: 20261019_04
+Revises: 20261019_03
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_04"
+down_revision = "20261019_03"
+branch_labels = None
+depends_on = None
+
+
+# Mirrors app.utils.contact.normalize_phone for rows written before normalization existed.
+NORMALIZE_PHONE_SQL = """
+WITH parsed AS (
+    SELECT id,
+           btrim(phone_number) LIKE '+%' AS has_plus,
+           regexp_replace(phone_number, '[^0-9]', '', 'g') AS digits
+    FROM customers
+    WHERE phone_number IS NOT NULL
+), normalized AS (
+    SELECT id,
+           CASE
+               WHEN has_plus THEN digits
+               WHEN digits LIKE '00%' THEN substr(digits, 3)
+               WHEN length(digits) = 11 AND digits LIKE '1%' THEN digits
+               WHEN length(digits) = 10 THEN '1' || digits
+               ELSE digits
+           END AS digits
+    FROM parsed
+)
+UPDATE customers
+SET phone_number = CASE WHEN length(normalized.digits) BETWEEN 8 AND 15 THEN '+' || normalized.digits END
+FROM normalized
+WHERE customers.id = normalized.id
+"""
+
+# A shared phone cannot merge customers known by different emails. Rows whose email
+# differs from the first email in their phone group give the phone up (kept in
+# attributes) so the unique index can be built; the rest merge below.
+DETACH_CONFLICTING_PHONES_SQL = """
+WITH grouped AS (
+    SELECT id, email, phone_number,
+           first_value(email) OVER (
+               PARTITION BY phone_number ORDER BY email IS NULL, id
+           ) AS group_email
+    FROM customers
+    WHERE phone_number IS NOT NULL
+)
+UPDATE customers
+SET attributes = customers.attributes || jsonb_build_object('unmerged_phone_number', grouped.phone_number),
+    phone_number = NULL
+FROM grouped
+WHERE customers.id = grouped.id
+  AND grouped.email IS NOT NULL
+  AND grouped.email <> grouped.group_email
+"""
+
+# Fold duplicates into the oldest row per key: re-point bookings, fill the keeper's
+# missing email, phone and name from the duplicates (oldest first), merge attributes
+# (newer duplicates win), then delete the rest.
+MERGE_DUPLICATES_SQL = """
+WITH ranked AS (
+    SELECT id, min(id) OVER (PARTITION BY {key}) AS keeper_id
+    FROM customers
+    WHERE {key} IS NOT NULL
+), duplicates AS (
+    SELECT id, keeper_id FROM ranked WHERE id <> keeper_id
+), moved AS (
+    UPDATE bookings SET customer_id = duplicates.keeper_id
+    FROM duplicates
+    WHERE bookings.customer_id = duplicates.id
+    RETURNING bookings.id
+), merged AS (
+    UPDATE customers
+    SET email = coalesce(customers.email, extra.email),
+        phone_number = coalesce(customers.phone_number, extra.phone_number),
+        name = coalesce(customers.name, extra.name),
+        attributes = customers.attributes || extra.attributes
+    FROM (
+        SELECT duplicates.keeper_id,
+               (array_agg(dup.email ORDER BY dup.id) FILTER (WHERE dup.email IS NOT NULL))[1] AS email,
+               (array_agg(dup.phone_number ORDER BY dup.id) FILTER (WHERE dup.phone_number IS NOT NULL))[1] AS phone_number,
+               (array_agg(dup.name ORDER BY dup.id) FILTER (WHERE dup.name IS NOT NULL))[1] AS name,
+               coalesce(
+                   jsonb_object_agg(kv.key, kv.value ORDER BY dup.id) FILTER (WHERE kv.key IS NOT NULL),
+                   '{{}}'::jsonb
+               ) AS attributes
+        FROM duplicates
+        JOIN customers dup ON dup.id = duplicates.id
+        LEFT JOIN LATERAL jsonb_each(coalesce(dup.attributes, '{{}}'::jsonb)) AS kv ON true
+        GROUP BY duplicates.keeper_id
+    ) AS extra
+    WHERE customers.id = extra.keeper_id
+    RETURNING customers.id
+)
+DELETE FROM customers USING duplicates WHERE customers.id = duplicates.id
+"""
+
+
+def upgrade() -> None:
+    op.execute("UPDATE customers SET email = nullif(lower(btrim(email)), '') WHERE email IS NOT NULL")
+    op.execute(NORMALIZE_PHONE_SQL)
+    op.execute(MERGE_DUPLICATES_SQL.format(key="email"))
+    op.execute(DETACH_CONFLICTING_PHONES_SQL)
+    op.execute(MERGE_DUPLICATES_SQL.format(key="phone_number"))
+    op.create_index("uq_customers_email_lower", "customers", [sa.text("lower(email)")], unique=True)
+    op.create_index("uq_customers_phone_number", "customers", ["phone_number"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_customers_phone_number", table_name="customers")
+    op.drop_index("uq_customers_email_lower", table_name="customers")
@@ -0,0 +1,88 @@
+"""recurring booking series with exceptions
+
+Revision ID: 20261019_05
+Revises: 20261019_04
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_05"
+down_revision = "20261019_04"
+branch_labels = None
+depends_on = None
+
+
+booking_status_enum = postgresql.ENUM(
+    "DRAFT",
+    "PENDING",
+    "CONFIRMED",
+    "CANCELLED",
+    name="booking_status",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "booking_series",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("session_id", sa.String(length=64), nullable=True),
+        sa.Column("customer_id", sa.Integer(), sa.ForeignKey("customers.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("venue_id", sa.String(length=64), sa.ForeignKey("venues.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("room_id", sa.String(length=64), sa.ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", booking_status_enum, nullable=False, server_default="CONFIRMED"),
+        sa.Column("rule", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("starts_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("attendee_count", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("details", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("materialized_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index("ix_booking_series_session_id", "booking_series", ["session_id"])
+    # The materializer only scans active series whose horizon is due.
+    op.create_index(
+        "ix_booking_series_materialized_until",
+        "booking_series",
+        ["materialized_until"],
+        postgresql_where=sa.text("status = 'CONFIRMED'"),
+    )
+
+    op.create_table(
+        "booking_series_exceptions",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("series_id", sa.Integer(), sa.ForeignKey("booking_series.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("occurrence_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("reason", sa.String(length=32), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.UniqueConstraint("series_id", "occurrence_start", name="uq_booking_series_exceptions_occurrence"),
+    )
+
+    op.add_column(
+        "bookings",
+        sa.Column("series_id", sa.Integer(), sa.ForeignKey("booking_series.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.create_index(
+        "uq_bookings_series_occurrence",
+        "bookings",
+        ["series_id", "start_time"],
+        unique=True,
+        postgresql_where=sa.text("series_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_bookings_series_occurrence", table_name="bookings")
+    op.drop_column("bookings", "series_id")
+    op.drop_table("booking_series_exceptions")
+    op.drop_index("ix_booking_series_materialized_until", table_name="booking_series")
+    op.drop_index("ix_booking_series_session_id", table_name="booking_series")
+    op.drop_table("booking_series")
@@ -0,0 +1,38 @@
+"""asynchronous payment processing
+
+Revision ID: 20261019_06
+Revises: 20261019_05
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_06"
+down_revision = "20261019_05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Payments are created before (or without) a booking and processed by a worker.
+    op.alter_column("payments", "booking_id", existing_type=sa.Integer(), nullable=True)
+    op.add_column("payments", sa.Column("session_id", sa.String(length=64), nullable=True))
+    op.create_index("ix_payments_session_id", "payments", ["session_id"])
+    op.create_index(
+        "ix_payments_pending",
+        "payments",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_pending", table_name="payments")
+    op.drop_index("ix_payments_session_id", table_name="payments")
+    op.drop_column("payments", "session_id")
+    op.execute("DELETE FROM payments WHERE booking_id IS NULL")
+    op.alter_column("payments", "booking_id", existing_type=sa.Integer(), nullable=False)
@@ -0,0 +1,40 @@
+"""keypad entry events and door code expiry index
+
+Revision ID: 20261019_08
+Revises: 20261019_07
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_08"
+down_revision = "20261019_07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "door_entry_events",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("venue_id", sa.String(length=64), nullable=False),
+        sa.Column("door_code", sa.String(length=32), nullable=False),
+        sa.Column("keypad_id", sa.String(length=64), nullable=True),
+        sa.Column("booking_id", sa.Integer(), nullable=True),
+        sa.Column("granted", sa.Boolean(), nullable=False),
+        sa.Column("reason", sa.String(length=32), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index("ix_door_entry_events_venue_occurred", "door_entry_events", ["venue_id", "occurred_at"])
+    # Rebuilding the keypad index and the code allocator both scan for unexpired codes.
+    op.create_index("ix_door_access_events_expires_at", "door_access_events", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_door_access_events_expires_at", table_name="door_access_events")
+    op.drop_index("ix_door_entry_events_venue_occurred", table_name="door_entry_events")
+    op.drop_table("door_entry_events")
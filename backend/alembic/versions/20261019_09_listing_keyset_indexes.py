@@ -0,0 +1,32 @@
+"""keyset pagination indexes for booking and payment listings
+
+Revision ID: 20261019_09
+Revises: 20261019_08
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_09"
+down_revision = "20261019_08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Listings walk (created_at, id) newest first; each page is one index range scan.
+    op.create_index("ix_bookings_created_at_id", "bookings", ["created_at", "id"])
+    op.create_index("ix_bookings_venue_created_at_id", "bookings", ["venue_id", "created_at", "id"])
+    op.create_index("ix_payments_created_at_id", "payments", ["created_at", "id"])
+    # The booking listing joins each row's first payment.
+    op.create_index("ix_payments_booking_id", "payments", ["booking_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_booking_id", table_name="payments")
+    op.drop_index("ix_payments_created_at_id", table_name="payments")
+    op.drop_index("ix_bookings_venue_created_at_id", table_name="bookings")
+    op.drop_index("ix_bookings_created_at_id", table_name="bookings")
@@ -0,0 +1,26 @@
+"""payment worker claims
+
+Revision ID: 20261019_10
+Revises: 20261019_09
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_10"
+down_revision = "20261019_09"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A worker leases a payment before calling the gateway so no other worker charges it too.
+    op.add_column("payments", sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("payments", "claimed_until")
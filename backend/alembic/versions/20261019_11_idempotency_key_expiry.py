@@ -0,0 +1,25 @@
+"""idempotency key expiry
+
+Revision ID: 20261019_11
+Revises: 20261019_10
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_11"
+down_revision = "20261019_10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Abandoned claims are taken over, and old keys purged, by their age.
+    op.create_index("ix_idempotency_keys_created_at", "idempotency_keys", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_idempotency_keys_created_at", table_name="idempotency_keys")
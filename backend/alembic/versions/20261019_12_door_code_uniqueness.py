@@ -0,0 +1,69 @@
+"""unique active door codes per venue
+
+Revision ID: 20261019_12
+Revises: 20261019_11
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_12"
+down_revision = "20261019_11"
+branch_labels = None
+depends_on = None
+
+# Codes that can no longer open a door: expired, never given an expiry, or of a cancelled booking.
+RELEASE_INACTIVE_SQL = """
+UPDATE door_access_events AS door
+SET released_at = now()
+FROM bookings
+WHERE bookings.id = door.booking_id
+  AND door.released_at IS NULL
+  AND (door.expires_at IS NULL OR door.expires_at <= now() OR bookings.status = 'CANCELLED')
+"""
+
+# Per-process allocators could hand the same code out twice; the newest keeps it.
+RELEASE_DUPLICATES_SQL = """
+UPDATE door_access_events
+SET released_at = now()
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, row_number() OVER (PARTITION BY venue_id, door_code ORDER BY id DESC) AS position
+        FROM door_access_events
+        WHERE released_at IS NULL
+    ) AS ranked
+    WHERE position > 1
+)
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "door_access_events",
+        sa.Column("venue_id", sa.String(length=64), sa.ForeignKey("venues.id", ondelete="CASCADE"), nullable=True),
+    )
+    op.add_column("door_access_events", sa.Column("released_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE door_access_events AS door SET venue_id = bookings.venue_id "
+        "FROM bookings WHERE bookings.id = door.booking_id"
+    )
+    op.alter_column("door_access_events", "venue_id", existing_type=sa.String(length=64), nullable=False)
+    op.execute(RELEASE_INACTIVE_SQL)
+    op.execute(RELEASE_DUPLICATES_SQL)
+    op.create_index(
+        "uq_door_access_events_active_code",
+        "door_access_events",
+        ["venue_id", "door_code"],
+        unique=True,
+        postgresql_where=sa.text("released_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_door_access_events_active_code", table_name="door_access_events")
+    op.drop_column("door_access_events", "released_at")
+    op.drop_column("door_access_events", "venue_id")
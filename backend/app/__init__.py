@@ -0,0 +1,5 @@
+import time
+
+# Taken when the package is first imported, before app.main loads its dependencies, so
+# startup metrics include import time.
+IMPORT_STARTED = time.perf_counter()
@@ -1,24 +1,161 @@
 from __future__ import annotations
 
 import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from threading import RLock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from app.utils.config import get_settings
 
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
 
-def load_venues() -> List[Dict[str, Any]]:
-    settings = get_settings()
-    venue_path = Path(settings.venue_data_path)
-    if not venue_path.exists():
-        return []
 
-    with venue_path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+def resolve_venue_path(path: str | os.PathLike[str] | None = None) -> Path:
+    """``VENUE_DATA_PATH`` as given, or relative to the repo root when it is not found from the cwd."""
+
+    venue_path = Path(path if path is not None else get_settings().venue_data_path)
+    if not venue_path.is_absolute() and not venue_path.exists():
+        venue_path = _REPO_ROOT / venue_path
+    return venue_path
+
+
+def iter_venues(path: str | os.PathLike[str], chunk_size: int = _CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield the venues of a top-level JSON array one at a time.
+
+    Only the element being decoded is buffered, so a large catalog never holds the raw
+    text and the parsed list in memory together.
+    """
+
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as handle:
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (started and buffer[pos] == ",")):
+                pos += 1
+            if pos >= len(buffer):
+                if fill():
+                    continue
+                if not started:
+                    return
+                raise ValueError(f"{path}: unterminated venue array")
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array of venues")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                venue, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Most likely the element straddles a chunk boundary; only EOF makes it an error.
+                if eof or not fill():
+                    raise
+                continue
+            pos = end
+            yield venue
+
+
+@dataclass(frozen=True)
+class VenueSnapshot:
+    venues: List[Dict[str, Any]]
+    by_id: Dict[str, Dict[str, Any]]
+    signature: Optional[Tuple[int, int]]
+
+
+_EMPTY = VenueSnapshot(venues=[], by_id={}, signature=None)
+
+
+class VenueIndex:
+    """Parsed, ID-indexed view of the venue data file.
+
+    Every read compares the file's ``(mtime_ns, size)`` with the snapshot's and reparses
+    only when they differ; :meth:`reload` forces it. Snapshots are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        self._path = path
+        self._snapshot = _EMPTY
+        self._lock = RLock()
+
+    @property
+    def path(self) -> Path:
+        # Resolved per use so tests and the seed script can point VENUE_DATA_PATH elsewhere.
+        return resolve_venue_path(self._path)
+
+    def snapshot(self) -> VenueSnapshot:
+        path = self.path
+        signature = _signature(path)
+        snapshot = self._snapshot
+        if snapshot.signature == signature:
+            return snapshot
+        with self._lock:
+            if self._snapshot.signature != signature:
+                self._snapshot = _load(path, signature)
+            return self._snapshot
+
+    def reload(self) -> VenueSnapshot:
+        with self._lock:
+            path = self.path
+            self._snapshot = _load(path, _signature(path))
+            return self._snapshot
+
+    def get(self, venue_id: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot().by_id.get(str(venue_id))
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self.snapshot().venues
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load(path: Path, signature: Optional[Tuple[int, int]]) -> VenueSnapshot:
+    if signature is None:
+        return _EMPTY
+    venues = list(iter_venues(path))
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for venue in venues:
+        # First occurrence wins, as with the old linear scan.
+        by_id.setdefault(str(venue.get("id")), venue)
+    return VenueSnapshot(venues=venues, by_id=by_id, signature=signature)
+
+
+venue_index = VenueIndex()
+
+
+def load_venues() -> List[Dict[str, Any]]:
+    return venue_index.all()
 
 
 def get_venue_by_id(venue_id: str) -> Dict[str, Any] | None:
-    for venue in load_venues():
-        if str(venue.get("id")) == str(venue_id):
-            return venue
-    return None
+    return venue_index.get(venue_id)
+
+
+def reload_venues() -> List[Dict[str, Any]]:
+    return venue_index.reload().venues
@@ -1,18 +1,297 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Connection, event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from app.utils.config import get_settings
+from app.db.queries import customer_by_email_stmt, room_occupancy_stmt, venue_room_columns_stmt
+from app.db.replica import ReplicaLagMonitor
+from app.models import Booking
+from app.utils.config import Settings, get_settings
+from app.utils.deadline import current_deadline
+from app.utils.metrics import metrics
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
-engine = create_async_engine(settings.database_url, echo=settings.database_echo)
 
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that publishes checkout wait time and saturation per pool."""
+
+    def connect(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            labels = {"pool": self.logging_name or "default"}
+            metrics.observe("db_pool_checkout_wait_ms", (time.perf_counter() - started) * 1000, labels=labels)
+            self.publish_saturation()
+
+    def _do_return_conn(self, record) -> None:  # type: ignore[override]
+        super()._do_return_conn(record)
+        self.publish_saturation()
+
+    def publish_saturation(self) -> None:
+        labels = {"pool": self.logging_name or "default"}
+        capacity = self.size() + max(self._max_overflow, 0)
+        checked_out = self.checkedout()
+        metrics.set_gauge("db_pool_checked_out", checked_out, labels=labels)
+        metrics.set_gauge("db_pool_overflow", max(self.overflow(), 0), labels=labels)
+        metrics.set_gauge("db_pool_saturation", checked_out / capacity if capacity else 0.0, labels=labels)
+
+
+POOL_REALTIME = "realtime"
+POOL_REPORTING = "reporting"
+POOL_REPLICA = "replica"
+
+
+def _pool_settings(config: Settings, name: str) -> Dict[str, Any]:
+    if name in (POOL_REPORTING, POOL_REPLICA):
+        return {
+            "pool_size": config.database_reporting_pool_size,
+            "max_overflow": config.database_reporting_max_overflow,
+            "pool_timeout": config.database_reporting_pool_timeout,
+            "statement_timeout_ms": config.database_reporting_statement_timeout_ms,
+        }
+    return {
+        "pool_size": config.database_pool_size,
+        "max_overflow": config.database_max_overflow,
+        "pool_timeout": config.database_pool_timeout,
+        "statement_timeout_ms": config.database_statement_timeout_ms,
+    }
+
+
+def _engine_options(config: Settings, name: str, url: str | None = None) -> Dict[str, Any]:
+    pool = _pool_settings(config, name)
+    options: Dict[str, Any] = {
+        "echo": config.database_echo,
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": pool["pool_size"],
+        "max_overflow": pool["max_overflow"],
+        "pool_timeout": pool["pool_timeout"],
+        "pool_recycle": config.database_pool_recycle,
+        "pool_pre_ping": config.database_pool_pre_ping,
+        "pool_logging_name": name,
+    }
+    if make_url(url or config.database_url).drivername.endswith("+asyncpg"):
+        server_settings: Dict[str, str] = {}
+        if pool["statement_timeout_ms"]:
+            server_settings["statement_timeout"] = str(int(pool["statement_timeout_ms"]))
+        if name == POOL_REPLICA:
+            server_settings["default_transaction_read_only"] = "on"
+        connect_args: Dict[str, Any] = {"prepared_statement_cache_size": config.database_statement_cache_size}
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+        options["connect_args"] = connect_args
+    return options
+
+
+class Database:
+    """Lazily builds one engine per named pool; owned and disposed by the app lifespan.
+
+    Latency-critical tool calls and dashboard/reporting reads use separate pools
+    (bulkheads) so a burst of heavy listings can only exhaust its own connections.
+    """
+
+    def __init__(self, config: Settings | None = None) -> None:
+        self.settings = config or get_settings()
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._session_factories: Dict[str, async_sessionmaker[AsyncSession]] = {}
+        self._replica_monitor: ReplicaLagMonitor | None = None
+
+    @property
+    def replica_configured(self) -> bool:
+        return bool(self.settings.database_read_url)
+
+    def engine(self, name: str = POOL_REALTIME) -> AsyncEngine:
+        engine = self._engines.get(name)
+        if engine is None:
+            url = self.settings.database_url
+            if name == POOL_REPLICA:
+                if not self.settings.database_read_url:
+                    raise LookupError("DATABASE_READ_URL is not configured")
+                url = self.settings.database_read_url
+            engine = self._engines[name] = create_async_engine(url, **_engine_options(self.settings, name, url))
+        return engine
+
+    def session_factory(self, name: str = POOL_REALTIME) -> async_sessionmaker[AsyncSession]:
+        factory = self._session_factories.get(name)
+        if factory is None:
+            factory = self._session_factories[name] = async_sessionmaker(
+                self.engine(name),
+                expire_on_commit=False,
+                class_=AsyncSession,
+            )
+        return factory
+
+    @property
+    def replica_monitor(self) -> ReplicaLagMonitor:
+        if self._replica_monitor is None:
+            self._replica_monitor = ReplicaLagMonitor(
+                self.engine(POOL_REPLICA) if self.replica_configured else None,
+                max_lag=self.settings.database_replica_max_lag_seconds,
+                interval=self.settings.database_replica_lag_check_interval,
+            )
+        return self._replica_monitor
+
+    def publish_pool_metrics(self) -> None:
+        for engine in self._engines.values():
+            pool = engine.pool
+            if isinstance(pool, InstrumentedAsyncQueuePool):
+                pool.publish_saturation()
+
+    async def dispose(self) -> None:
+        if self._replica_monitor is not None:
+            await self._replica_monitor.stop()
+            self._replica_monitor = None
+        engines = list(self._engines.values())
+        self._engines.clear()
+        self._session_factories.clear()
+        for engine in engines:
+            await engine.dispose()
+
+
+_database: Database | None = None
+
+
+def get_database() -> Database:
+    global _database
+    if not _database:
+        _database = Database()
+    return _database
+
+
+def get_session_factory(name: str = POOL_REALTIME) -> async_sessionmaker[AsyncSession]:
+    return get_database().session_factory(name)
+
+
+def resolve_session_factory(
+    injected: async_sessionmaker[AsyncSession] | None, name: str = POOL_REALTIME
+) -> async_sessionmaker[AsyncSession]:
+    """``injected`` if a caller supplied one, else the current factory for pool ``name``.
+
+    Long-lived services call this on every use instead of keeping the result: the
+    lifespan disposes and rebuilds engines, so a cached factory would pin a stale pool.
+    """
+
+    return injected or get_session_factory(name)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_request_deadline(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    """Cap every statement of the transaction at what is left of the request's deadline.
+
+    Only sent when that is tighter than the pool's own ``statement_timeout``; a deadline
+    that has already passed fails the transaction before it runs anything.
+    """
+
+    deadline = current_deadline()
+    if deadline is None or connection.dialect.name != "postgresql":
+        return
+    deadline.check()
+    timeout_ms = max(1, int(deadline.remaining() * 1000))
+    pool_timeout_ms = _pool_settings(get_settings(), connection.engine.pool.logging_name or POOL_REALTIME)["statement_timeout_ms"]
+    if pool_timeout_ms and timeout_ms >= pool_timeout_ms:
+        return
+    connection.execute(select(func.set_config("statement_timeout", str(timeout_ms), True)))
+    metrics.observe("db_deadline_statement_timeout_ms", timeout_ms)
+
+
+@asynccontextmanager
+async def _request_session(name: str) -> AsyncIterator[AsyncSession]:
+    session = get_session_factory(name)()
+    try:
+        yield session
+    except asyncio.CancelledError:
+        # Deadline hit or caller gone, possibly mid-query: drop the connection now rather
+        # than wait on a rollback behind a statement the server is still running.
+        await asyncio.shield(session.invalidate())
+        metrics.increment("db_sessions_invalidated_total", labels={"pool": name})
+        raise
+    finally:
+        await asyncio.shield(session.close())
 
 
 async def get_session() -> AsyncIterator[AsyncSession]:
-    async with async_session_factory() as session:
+    """Session on the realtime pool, reserved for live-call tool endpoints and writes."""
+
+    async with _request_session(POOL_REALTIME) as session:
+        yield session
+
+
+async def get_reporting_session() -> AsyncIterator[AsyncSession]:
+    """Session on the reporting pool for dashboard listings and exports."""
+
+    async with _request_session(POOL_REPORTING) as session:
+        yield session
+
+
+def read_pool_name() -> str:
+    """Pick the pool for lag-tolerant reads: the replica while it is caught up, else reporting."""
+
+    database = get_database()
+    if database.replica_configured and database.replica_monitor.is_healthy():
+        return POOL_REPLICA
+    return POOL_REPORTING
+
+
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """Session for read-only, lag-tolerant endpoints (venue catalog, listings).
+
+    Never use this for writes or for reads that must observe a write made in the same
+    flow (booking confirmation, door-code regeneration); those stay on ``get_session``.
+    """
+
+    name = read_pool_name()
+    metrics.increment("db_read_sessions_total", labels={"pool": name})
+    async with _request_session(name) as session:
         yield session
+
+
+async def _prime_connection(connection: AsyncConnection) -> None:
+    now = datetime.now(timezone.utc)
+    async with AsyncSession(bind=connection, expire_on_commit=False) as session:
+        await session.execute(venue_room_columns_stmt(""))
+        await session.execute(room_occupancy_stmt([""], now, now))
+        await session.execute(customer_by_email_stmt(""))
+        await session.get(Booking, 0)
+        await session.rollback()
+
+
+async def warm_up_pool(target: AsyncEngine | None = None, size: int | None = None) -> int:
+    """Open ``size`` pooled connections up front and prepare the hot statements on each.
+
+    Returns the number of connections that were warmed. Failures are logged rather than
+    raised so the API still boots when the database comes up after the app does.
+    """
+
+    target = target or get_database().engine(POOL_REALTIME)
+    size = get_settings().database_pool_min_size if size is None else size
+    started = time.perf_counter()
+    results = await asyncio.gather(*(target.connect() for _ in range(size)), return_exceptions=True)
+    connections = [result for result in results if isinstance(result, AsyncConnection)]
+    try:
+        await asyncio.gather(*(_prime_connection(connection) for connection in connections))
+    except Exception as exc:  # pragma: no cover - depends on database availability
+        logger.warning("db_pool_warmup_failed", extra={"error": str(exc)})
+    finally:
+        for connection in connections:
+            await connection.close()
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.warning("db_pool_warmup_incomplete", extra={"error": str(errors[0]), "failed": len(errors)})
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    metrics.set_gauge("db_pool_warmup_ms", elapsed_ms, labels={"pool": target.pool.logging_name or "default"})
+    logger.info("db_pool_warmed", extra={"connections": len(connections), "elapsed_ms": round(elapsed_ms, 2)})
+    return len(connections)
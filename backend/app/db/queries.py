@@ -0,0 +1,110 @@
+"""Hot-path statements shared by request handlers and the pool warm-up.
+
+Keeping the constructs in one place guarantees that the SQL primed on each pooled
+connection at startup is byte-for-byte the SQL issued during live calls, so the
+asyncpg prepared-statement cache is hit from the first request.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, DateTime, Integer, Select, String, Values, and_, column, exists, func, or_, select, values
+
+from app.models import Booking, BookingStatus, Customer, Room
+
+# First key of the two-int advisory lock space; keeps room locks apart from any other
+# advisory locks taken against the same database.
+ROOM_LOCK_NAMESPACE = 0x524F4F4D
+
+
+def venue_room_columns_stmt(venue_id: str) -> Select:
+    return select(Room.id, Room.label, Room.capacity).where(Room.venue_id == venue_id).order_by(Room.id)
+
+
+def active_hold_clause() -> ColumnElement[bool]:
+    return and_(Booking.status == BookingStatus.PENDING, Booking.hold_expires_at > func.now())
+
+
+def booking_overlap_clause(
+    room_id: str | ColumnElement[str],
+    start_time: datetime | ColumnElement[datetime],
+    end_time: datetime | ColumnElement[datetime],
+    holder_session_id: str | None = None,
+) -> ColumnElement[bool]:
+    """Bookings on ``room_id`` that still block the interval.
+
+    Cancelled bookings and expired holds never block. Active holds placed by
+    ``holder_session_id`` do not block that same session, so a caller can re-check or
+    confirm the slot they are holding. The interval may be given as values or as columns
+    of another relation (e.g. a ``VALUES`` list of requested slots).
+    """
+
+    clause = and_(
+        Booking.room_id == room_id,
+        Booking.status != BookingStatus.CANCELLED,
+        or_(Booking.status != BookingStatus.PENDING, Booking.hold_expires_at > func.now()),
+        Booking.start_time.is_not(None),
+        Booking.end_time.is_not(None),
+        Booking.start_time < end_time,
+        Booking.end_time > start_time,
+    )
+    if holder_session_id is not None:
+        clause = and_(
+            clause,
+            or_(Booking.status != BookingStatus.PENDING, Booking.session_id.is_distinct_from(holder_session_id)),
+        )
+    return clause
+
+
+def room_occupancy_stmt(room_ids: list[str], start_time: datetime, end_time: datetime) -> Select:
+    """Bookings and live holds blocking any of ``room_ids`` within the window.
+
+    The same blocking rule as :func:`booking_overlap_clause` without the holder
+    exemption, which the availability cache applies per caller instead.
+    """
+
+    return (
+        select(Booking.room_id, Booking.start_time, Booking.end_time, Booking.status, Booking.hold_expires_at, Booking.session_id)
+        .where(
+            Booking.room_id.in_(room_ids),
+            Booking.status != BookingStatus.CANCELLED,
+            or_(Booking.status != BookingStatus.PENDING, Booking.hold_expires_at > func.now()),
+            Booking.start_time < end_time,
+            Booking.end_time > start_time,
+        )
+        .order_by(Booking.room_id, Booking.start_time)
+    )
+
+
+def requested_slots(rows: list[tuple[int, str, datetime, datetime]]) -> Values:
+    """``VALUES (idx, room_id, start_time, end_time)`` relation of candidate intervals."""
+
+    return values(
+        column("idx", Integer),
+        column("room_id", String),
+        column("start_time", DateTime(timezone=True)),
+        column("end_time", DateTime(timezone=True)),
+        name="requested",
+    ).data(rows)
+
+
+def conflicting_slots_stmt(slots: Values, holder_session_id: str | None = None) -> Select:
+    """Indexes of ``slots`` that overlap a blocking booking, checked in one set-based query."""
+
+    return select(slots.c.idx).where(
+        exists().where(booking_overlap_clause(slots.c.room_id, slots.c.start_time, slots.c.end_time, holder_session_id))
+    )
+
+
+def room_lock_expr(room_id: str | ColumnElement[str]) -> ColumnElement[Any]:
+    """Transaction-scoped advisory lock serialising writers that book the same room."""
+
+    return func.pg_advisory_xact_lock(ROOM_LOCK_NAMESPACE, func.hashtext(room_id))
+
+
+def customer_by_email_stmt(email: str) -> Select:
+    """Lookup served by the ``lower(email)`` unique index; ``email`` must be normalised."""
+
+    return select(Customer).where(func.lower(Customer.email) == email)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# A standalone (non-recovery) server has no replay lag; a caught-up standby reports 0
+# even when the primary is idle, which pg_last_xact_replay_timestamp() alone would not.
+# "Caught up" only counts while the WAL receiver is streaming: a standby that lost its
+# upstream also has receive = replay, so it is measured by its last replayed commit
+# instead, which grows every second (NULL, i.e. unhealthy, if it never replayed one).
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+            AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class ReplicaLagMonitor:
+    """Periodically measures replica replay lag so reads can fall back to the primary."""
+
+    def __init__(self, engine: AsyncEngine | None, max_lag: float = 5.0, interval: float = 2.0) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def configured(self) -> bool:
+        return self.engine is not None
+
+    def is_healthy(self) -> bool:
+        if not self.configured or self.lag_seconds is None or self.checked_at is None:
+            return False
+        # A stale measurement means the replica stopped answering; do not trust it.
+        if time.monotonic() - self.checked_at > self.interval * 3:
+            return False
+        return self.lag_seconds <= self.max_lag
+
+    def record(self, lag_seconds: Optional[float]) -> None:
+        self.lag_seconds = lag_seconds
+        self.checked_at = time.monotonic() if lag_seconds is not None else None
+        if lag_seconds is not None:
+            metrics.set_gauge("db_replica_lag_seconds", lag_seconds)
+        metrics.set_gauge("db_replica_healthy", 1.0 if self.is_healthy() else 0.0)
+
+    async def measure(self) -> Optional[float]:
+        if self.engine is None:
+            return None
+        try:
+            async with self.engine.connect() as connection:
+                value = (await connection.execute(REPLICA_LAG_SQL)).scalar_one()
+            lag = float(value) if value is not None else None
+        except Exception as exc:
+            logger.warning("db_replica_lag_check_failed", extra={"error": str(exc)})
+            lag = None
+        self.record(lag)
+        return lag
+
+    def start(self) -> None:
+        if not self.configured or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="replica-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.measure()
+            await asyncio.sleep(self.interval)
@@ -1,35 +1,156 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import booking, calls, events, metadata, realtime, vapi_tools
+from app import IMPORT_STARTED
+from app.db.database import get_database, warm_up_pool
+from app.routes import access, booking, calls, events, metadata, realtime, vapi_tools
+from app.services.availability_service import get_availability_service
+from app.services.hold_sweeper import get_hold_sweeper
+from app.services.keypad_service import get_keypad_service
+from app.services.outbox import get_outbox_dispatcher
+from app.services.payment_worker import get_payment_worker
+from app.services.recurring_booking_service import get_series_materializer
+from app.services.vapi_service import get_vapi_service
+from app.services.venue_catalog_service import get_venue_catalog_service
+from app.stores.event_bus import event_bus
+from app.utils.admission import AdmissionMiddleware, LoadShedder, TokenBuckets
+from app.utils.background import task_supervisor
 from app.utils.config import get_settings
+from app.utils.deadline import DeadlineMiddleware
+from app.utils.lifecycle import InFlightMiddleware, RequestTracker
+from app.utils.loop_monitor import get_loop_monitor
+from app.utils.metrics import metrics
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-settings = get_settings()
+request_tracker = RequestTracker(started_at=IMPORT_STARTED)
 
-app = FastAPI(title="VoiceBooking API", version="0.1.0")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.frontend_origins,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    allow_credentials=True,
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Own process-wide resources: DB pools, HTTP clients, background work and the event bus."""
 
-app.include_router(metadata.router, prefix="/api")
-app.include_router(calls.router, prefix="/api")
-app.include_router(booking.router, prefix="/api")
-app.include_router(events.router, prefix="/api")
-app.include_router(vapi_tools.router, prefix="/api")
-app.include_router(realtime.router)
+    settings = get_settings()
+    started = time.perf_counter()
+    loop_monitor = get_loop_monitor()
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
 
+    database = get_database()
+    if settings.database_pool_warmup:
+        await warm_up_pool()
+    database.replica_monitor.start()
+    hold_sweeper = get_hold_sweeper()
+    hold_sweeper.start()
+    series_materializer = get_series_materializer()
+    series_materializer.start()
+    payment_worker = get_payment_worker()
+    payment_worker.start()
+    outbox_dispatcher = get_outbox_dispatcher()
+    outbox_dispatcher.start()
+    keypad_service = get_keypad_service()
+    keypad_service.start()
+    venue_catalog = get_venue_catalog_service()
+    await venue_catalog.start()
+    availability = get_availability_service()
+    await availability.start()
+    metrics.set_gauge("startup_lifespan_ms", (time.perf_counter() - started) * 1000)
 
-@app.get("/health")
-def healthcheck() -> dict[str, str]:
-    return {"status": "ok"}
+    try:
+        yield
+    finally:
+        # One deadline for the whole shutdown, so it fits inside the orchestrator's kill timeout.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.shutdown_grace_seconds
+
+        def remaining() -> float:
+            return max(0.0, deadline - loop.time())
+
+        # Open SSE streams never finish on their own; end them so the wait is only for real work.
+        await event_bus.close()
+        if not await request_tracker.wait_idle(remaining()):
+            logger.warning("shutdown_inflight_requests_abandoned", extra={"active": request_tracker.active})
+        grace = remaining()
+        stopped = await asyncio.gather(
+            hold_sweeper.stop(),
+            series_materializer.stop(),
+            payment_worker.stop(timeout=grace),
+            outbox_dispatcher.stop(flush_timeout=grace),
+            keypad_service.stop(),
+            venue_catalog.stop(),
+            availability.stop(),
+            task_supervisor.drain(grace),
+            return_exceptions=True,
+        )
+        for error in stopped:
+            if isinstance(error, BaseException):
+                logger.warning("shutdown_stop_failed", extra={"error": repr(error)})
+        await get_vapi_service().aclose()
+        await loop_monitor.stop()
+        await database.dispose()
+        logger.info("shutdown_complete")
+
+
+def create_app() -> FastAPI:
+    settings = get_settings()
+    application = FastAPI(title="VoiceBooking API", version="0.1.0", lifespan=lifespan)
+
+    if settings.admission_enabled:
+        # Added first so it sits inside CORS: browsers can read the 503/429 it returns.
+        application.add_middleware(
+            AdmissionMiddleware,
+            shedder=LoadShedder(settings.admission_latency_slo_ms / 1000, window=settings.admission_window_seconds),
+            concurrency=settings.admission_concurrency_limits,
+            session_buckets=TokenBuckets(settings.admission_session_rate, settings.admission_session_burst),
+            source_buckets=TokenBuckets(settings.admission_source_rate, settings.admission_source_burst),
+            retry_after=settings.admission_retry_after_seconds,
+        )
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.frontend_origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        allow_credentials=True,
+    )
+    application.add_middleware(
+        DeadlineMiddleware,
+        prefix="/api/vapi/tools",
+        header=settings.tool_deadline_header,
+        default=settings.tool_deadline_seconds,
+        budgets=settings.tool_deadline_budgets,
+        reserve=settings.tool_deadline_reserve_ms / 1000,
+    )
+    application.add_middleware(InFlightMiddleware, tracker=request_tracker)
+
+    application.include_router(metadata.router, prefix="/api")
+    application.include_router(calls.router, prefix="/api")
+    application.include_router(booking.router, prefix="/api")
+    application.include_router(events.router, prefix="/api")
+    application.include_router(vapi_tools.router, prefix="/api")
+    application.include_router(access.router, prefix="/api")
+    application.include_router(realtime.router)
+
+    @application.get("/health")
+    def healthcheck() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @application.get("/metrics")
+    async def metrics_snapshot() -> dict:
+        get_database().publish_pool_metrics()
+        return metrics.snapshot()
+
+    return application
+
+
+app = create_app()
+
+metrics.set_gauge("startup_import_ms", (time.perf_counter() - IMPORT_STARTED) * 1000)
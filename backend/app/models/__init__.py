@@ -1,5 +1,7 @@
 from .booking import (
     Booking,
+    BookingSeries,
+    BookingSeriesException,
     BookingStatus,
     CallLog,
     DoorAccessEvent,
@@ -9,6 +11,9 @@ from .booking import (
     SurveyResponse,
 )
 from .customer import Customer
+from .door_entry import DoorEntryEvent
+from .idempotency import IdempotencyKey
+from .outbox import OutboxMessage
 from .venue import Room, Venue
 
 __all__ = [
@@ -16,11 +21,16 @@ __all__ = [
     "Room",
     "Customer",
     "Booking",
+    "BookingSeries",
+    "BookingSeriesException",
     "BookingStatus",
     "Payment",
     "PaymentStatus",
     "PaymentProvider",
     "DoorAccessEvent",
+    "DoorEntryEvent",
     "SurveyResponse",
     "CallLog",
+    "IdempotencyKey",
+    "OutboxMessage",
 ]
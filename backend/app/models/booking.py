@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from sqlalchemy import DateTime, Enum as PgEnum, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint, func
+from sqlalchemy import DateTime, Enum as PgEnum, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
 
@@ -54,6 +54,8 @@ class Booking(Base):
     attendee_count: Mapped[int | None] = mapped_column(Integer)
     notes: Mapped[str | None] = mapped_column(Text)
     details: Mapped[Dict[str, Any]] = mapped_column(JSONType, default=dict)
+    hold_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    series_id: Mapped[int | None] = mapped_column(ForeignKey("booking_series.id", ondelete="SET NULL"))
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -65,22 +67,91 @@ class Booking(Base):
     survey_responses: Mapped[list["SurveyResponse"]] = relationship(back_populates="booking", cascade="all, delete-orphan", lazy="selectin")
     call_logs: Mapped[list["CallLog"]] = relationship(back_populates="booking", cascade="all, delete-orphan", lazy="selectin")
 
+    __table_args__ = (
+        Index("ix_bookings_room_interval", "room_id", "start_time", "end_time"),
+        Index("ix_bookings_hold_expiry", "hold_expires_at", postgresql_where=text("status = 'PENDING'")),
+        Index("ix_bookings_created_at_id", "created_at", "id"),
+        Index("ix_bookings_venue_created_at_id", "venue_id", "created_at", "id"),
+        Index(
+            "uq_bookings_series_occurrence",
+            "series_id",
+            "start_time",
+            unique=True,
+            postgresql_where=text("series_id IS NOT NULL"),
+        ),
+    )
+
+
+class BookingSeries(Base):
+    """A recurring booking: the rule plus its exceptions, with occurrences materialized lazily.
+
+    Only occurrences up to ``materialized_until`` exist as ``bookings`` rows; the rest are
+    implied by ``rule`` and expanded by the rolling-horizon materializer.
+    """
+
+    __tablename__ = "booking_series"
+    __table_args__ = (
+        Index("ix_booking_series_materialized_until", "materialized_until", postgresql_where=text("status = 'CONFIRMED'")),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    session_id: Mapped[str | None] = mapped_column(String(64), index=True)
+    customer_id: Mapped[int | None] = mapped_column(ForeignKey("customers.id", ondelete="SET NULL"))
+    venue_id: Mapped[str] = mapped_column(ForeignKey("venues.id", ondelete="CASCADE"), nullable=False)
+    room_id: Mapped[str] = mapped_column(ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[BookingStatus] = mapped_column(PgEnum(BookingStatus, name="booking_status"), default=BookingStatus.CONFIRMED, nullable=False)
+    rule: Mapped[Dict[str, Any]] = mapped_column(JSONType, nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    attendee_count: Mapped[int | None] = mapped_column(Integer)
+    notes: Mapped[str | None] = mapped_column(Text)
+    details: Mapped[Dict[str, Any]] = mapped_column(JSONType, default=dict)
+    materialized_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    exceptions: Mapped[list["BookingSeriesException"]] = relationship(back_populates="series", cascade="all, delete-orphan", lazy="selectin")
+
+
+class BookingSeriesException(Base):
+    """An occurrence of a series that is not booked (``conflict`` or ``cancelled``)."""
+
+    __tablename__ = "booking_series_exceptions"
+    __table_args__ = (UniqueConstraint("series_id", "occurrence_start", name="uq_booking_series_exceptions_occurrence"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    series_id: Mapped[int] = mapped_column(ForeignKey("booking_series.id", ondelete="CASCADE"), nullable=False)
+    occurrence_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    reason: Mapped[str] = mapped_column(String(32), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    series: Mapped[BookingSeries] = relationship(back_populates="exceptions")
+
 
 class Payment(Base):
     __tablename__ = "payments"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    booking_id: Mapped[int] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
+    booking_id: Mapped[int | None] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"))
+    session_id: Mapped[str | None] = mapped_column(String(64), index=True)
     provider: Mapped[PaymentProvider] = mapped_column(PgEnum(PaymentProvider, name="payment_provider"), nullable=False)
     status: Mapped[PaymentStatus] = mapped_column(PgEnum(PaymentStatus, name="payment_status"), default=PaymentStatus.PENDING, nullable=False)
     amount: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
     currency: Mapped[str | None] = mapped_column(String(8))
     sandbox_reference: Mapped[str | None] = mapped_column(String(128))
     extras: Mapped[Dict[str, Any]] = mapped_column(JSONType, default=dict)
+    # Set while a worker has the row out at the gateway; other workers skip it until then.
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    booking: Mapped[Booking] = relationship(back_populates="payments")
+    booking: Mapped[Optional[Booking]] = relationship(back_populates="payments")
+
+    __table_args__ = (
+        Index("ix_payments_pending", "created_at", postgresql_where=text("status = 'PENDING'")),
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        Index("ix_payments_booking_id", "booking_id"),
+    )
 
 
 class DoorAccessEvent(Base):
@@ -88,15 +159,28 @@ class DoorAccessEvent(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     booking_id: Mapped[int] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
+    venue_id: Mapped[str] = mapped_column(ForeignKey("venues.id", ondelete="CASCADE"), nullable=False)
     door_code: Mapped[str] = mapped_column(String(32))
     instructions: Mapped[str | None] = mapped_column(Text)
     issued_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Set once the code has expired and may be handed out again.
+    released_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     context: Mapped[Dict[str, Any]] = mapped_column(JSONType, default=dict)
 
     booking: Mapped[Booking] = relationship(back_populates="door_access_events")
 
-    __table_args__ = (UniqueConstraint("booking_id", name="uq_door_event_booking"),)
+    __table_args__ = (
+        UniqueConstraint("booking_id", name="uq_door_event_booking"),
+        Index("ix_door_access_events_expires_at", "expires_at"),
+        Index(
+            "uq_door_access_events_active_code",
+            "venue_id",
+            "door_code",
+            unique=True,
+            postgresql_where=text("released_at IS NULL"),
+        ),
+    )
 
 
 class SurveyResponse(Base):
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List
 
-from sqlalchemy import String, func
+from sqlalchemy import Index, String, func, text
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,10 @@ except ImportError:  # pragma: no cover
 
 class Customer(Base):
     __tablename__ = "customers"
+    __table_args__ = (
+        Index("uq_customers_email_lower", text("lower(email)"), unique=True),
+        Index("uq_customers_phone_number", "phone_number", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     external_id: Mapped[str | None] = mapped_column(String(64), unique=True)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DoorEntryEvent(Base):
+    """One keypad verification, granted or not.
+
+    Append-only and written in batches, so there are deliberately no foreign keys:
+    ``booking_id`` is whatever the keypad index resolved at the time.
+    """
+
+    __tablename__ = "door_entry_events"
+    __table_args__ = (Index("ix_door_entry_events_venue_occurred", "venue_id", "occurred_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    venue_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    door_code: Mapped[str] = mapped_column(String(32), nullable=False)
+    keypad_id: Mapped[str | None] = mapped_column(String(64))
+    booking_id: Mapped[int | None] = mapped_column(Integer)
+    granted: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    reason: Mapped[str] = mapped_column(String(32), nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import Index, String, UniqueConstraint, func
+from sqlalchemy.types import JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+try:  # pragma: no cover
+    from sqlalchemy.dialects.postgresql import JSONB as JSONType  # type: ignore
+except ImportError:  # pragma: no cover
+    JSONType = JSON  # type: ignore
+
+
+class IdempotencyKey(Base):
+    """Response recorded for a tool call, replayed when the same key is retried.
+
+    A row whose ``response`` is still ``NULL`` marks a request that is in flight.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[Dict[str, Any] | None] = mapped_column(JSONType)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+    completed_at: Mapped[datetime | None] = mapped_column()
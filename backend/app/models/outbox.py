@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.types import JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+try:  # pragma: no cover
+    from sqlalchemy.dialects.postgresql import JSONB as JSONType  # type: ignore
+except ImportError:  # pragma: no cover
+    JSONType = JSON  # type: ignore
+
+
+class OutboxMessage(Base):
+    """An outbound side effect written in the same transaction as the change that caused it.
+
+    Rows are pending until ``delivered_at`` is set; ``failed_at`` marks a message that
+    exhausted its retries. ``available_at`` is both the retry schedule and the claim lease.
+    """
+
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        Index(
+            "ix_outbox_messages_pending",
+            "available_at",
+            postgresql_where=text("delivered_at IS NULL AND failed_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSONType, default=dict, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
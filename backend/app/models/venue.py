@@ -39,16 +39,6 @@ class Venue(Base):
         lazy="selectin",
     )
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "address": self.address,
-            "contact": self.contact,
-            "policies": self.policies or {},
-            "rooms": [room.to_dict(include_venue=False) for room in self.rooms],
-        }
-
 
 class Room(Base):
     __tablename__ = "rooms"
@@ -68,19 +58,3 @@ class Room(Base):
         back_populates="room",
         lazy="selectin",
     )
-
-    def to_dict(self, include_venue: bool = True) -> Dict[str, Any]:
-        data: Dict[str, Any] = {
-            "id": self.id,
-            "venue_id": self.venue_id,
-            "label": self.label,
-            "capacity": self.capacity,
-            "amenities": self.amenities or [],
-            "availability": self.availability or {},
-        }
-        if include_venue:
-            data["venue"] = {
-                "id": self.venue.id,
-                "name": self.venue.name,
-            }
-        return data
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.schemas import KeypadVerifyRequest, KeypadVerifyResponse
+from app.services.keypad_service import KeypadService, get_keypad_service
+
+router = APIRouter(prefix="/access", tags=["access"])
+
+
+@router.post("/verify", response_model=KeypadVerifyResponse)
+async def verify_code(
+    request: KeypadVerifyRequest,
+    keypad: KeypadService = Depends(get_keypad_service),
+) -> KeypadVerifyResponse:
+    # Served from memory only; a keypad that gets 503 while the index loads should retry.
+    if not keypad.loaded:
+        raise HTTPException(status_code=503, detail="Keypad index is loading")
+    decision = keypad.verify(request.venue_id, request.code, request.room_id, request.keypad_id)
+    entry = decision.entry if decision.granted else None
+    return KeypadVerifyResponse(
+        granted=decision.granted,
+        reason=decision.reason,
+        booking_id=entry.booking_id if entry else None,
+        room_id=entry.room_id if entry else None,
+        valid_until=datetime.fromtimestamp(entry.valid_until, timezone.utc) if entry else None,
+    )
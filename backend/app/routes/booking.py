@@ -5,15 +5,24 @@ from typing import Any, Dict
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_session
+from app.db.database import get_read_session, get_session
 from app.models import Booking
-from app.schemas.booking import BookingSubmission, CustomerInfo
+from app.schemas.booking import BookingSubmission, BulkBookingSubmission, CustomerInfo
+from app.serializers import FastJSONResponse, booking_detail, booking_detail_stmt, confirmation_shape
 from app.services.booking_service import (
+    BookingConflictError,
     BookingPayload,
     BookingService,
     CustomerPayload,
     get_booking_service,
 )
+from app.services.recurrence import RecurrenceRule
+from app.services.recurring_booking_service import (
+    RecurringBookingService,
+    SeriesConfirmation,
+    SeriesConflictError,
+    get_recurring_booking_service,
+)
 from app.stores.session_store import BookingStatus as StoreBookingStatus
 from app.stores.session_store import session_store
 
@@ -21,76 +30,90 @@ from app.stores.session_store import session_store
 router = APIRouter(prefix="/booking", tags=["booking"])
 
 
-def _serialize_booking(booking: Booking) -> Dict[str, Any]:
-    door_event = booking.door_access_events[0] if booking.door_access_events else None
-    payment = booking.payments[0] if booking.payments else None
+def _serialize_series(series: SeriesConfirmation) -> Dict[str, Any]:
     return {
-        "id": booking.id,
-        "session_id": booking.session_id,
-        "status": booking.status.value.lower(),
+        "id": series.id,
+        "session_id": series.session_id,
         "customer": {
-            "id": booking.customer.id if booking.customer else None,
-            "name": booking.customer.name if booking.customer else None,
-            "email": booking.customer.email if booking.customer else None,
-            "phone_number": booking.customer.phone_number if booking.customer else None,
-        },
-        "venue": {
-            "id": booking.venue.id,
-            "name": booking.venue.name,
+            "id": series.customer.get("id"),
+            "name": series.customer.get("name"),
+            "email": series.customer.get("email"),
+            "phone_number": series.customer.get("phone_number"),
         },
-        "room": {
-            "id": booking.room.id,
-            "label": booking.room.label,
-        } if booking.room else None,
-        "start_time": booking.start_time.isoformat() if booking.start_time else None,
-        "end_time": booking.end_time.isoformat() if booking.end_time else None,
-        "duration_minutes": booking.duration_minutes,
-        "attendee_count": booking.attendee_count,
-        "notes": booking.notes,
-        "details": booking.details,
-        "payment": {
-            "status": payment.status.value.lower(),
-            "amount": str(payment.amount) if payment.amount is not None else None,
-            "currency": payment.currency,
-            "provider": payment.provider.value.lower(),
-        } if payment else None,
-        "door_access": {
-            "code": door_event.door_code,
-            "instructions": door_event.instructions,
-            "expires_at": door_event.expires_at.isoformat() if door_event.expires_at else None,
-        } if door_event else None,
+        "venue": series.venue,
+        "room": {"id": series.room["id"], "label": series.room["label"]} if series.room else None,
+        "rule": series.rule,
+        "starts_at": series.starts_at.isoformat(),
+        "duration_minutes": series.duration_minutes,
+        "occurrence_count": series.occurrence_count,
+        "conflicts": [start.isoformat() for start in series.conflicts],
+        "materialized_until": series.materialized_until.isoformat(),
+        "occurrences": [
+            {
+                "booking_id": occurrence["booking_id"],
+                "start_time": occurrence["start_time"].isoformat(),
+                "end_time": occurrence["end_time"].isoformat(),
+                "door_code": occurrence["door_code"],
+            }
+            for occurrence in series.materialized
+        ],
     }
 
 
+def _series_conflict_detail(exc: SeriesConflictError) -> Dict[str, Any]:
+    return {"message": str(exc), "conflicts": [start.isoformat() for start in exc.occurrences]}
+
+
 @router.post("/{session_id}/confirm")
 async def confirm_booking(
     session_id: str,
     payload: BookingSubmission,
     db: AsyncSession = Depends(get_session),
     booking_service: BookingService = Depends(get_booking_service),
-) -> Dict[str, Any]:
+    recurring_service: RecurringBookingService = Depends(get_recurring_booking_service),
+) -> Any:
+    customer_payload = CustomerPayload(
+        name=payload.customer.name,
+        email=payload.customer.email,
+        phone_number=payload.customer.phone_number,
+        attributes=payload.customer.attributes,
+    )
+    booking_payload = BookingPayload(
+        session_id=session_id,
+        venue_id=payload.venue_id,
+        room_id=payload.room_id,
+        start_time=payload.start_time,
+        duration_minutes=payload.duration_minutes,
+        attendee_count=payload.attendee_count,
+        notes=payload.notes,
+        details=payload.details,
+        payment_amount=payload.payment_amount,
+        payment_currency=payload.payment_currency,
+    )
+
+    if payload.recurrence is not None:
+        try:
+            series = await recurring_service.create_series(
+                session=db,
+                customer_payload=customer_payload,
+                booking_payload=booking_payload,
+                rule=RecurrenceRule.from_dict(payload.recurrence.model_dump()),
+                skip_conflicts=payload.recurrence.skip_conflicts,
+            )
+        except SeriesConflictError as exc:
+            raise HTTPException(status_code=409, detail=_series_conflict_detail(exc)) from exc
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {"series": _serialize_series(series)}
+
     try:
         booking = await booking_service.confirm_booking(
             session=db,
-            customer_payload=CustomerPayload(
-                name=payload.customer.name,
-                email=payload.customer.email,
-                phone_number=payload.customer.phone_number,
-                attributes=payload.customer.attributes,
-            ),
-            booking_payload=BookingPayload(
-                session_id=session_id,
-                venue_id=payload.venue_id,
-                room_id=payload.room_id,
-                start_time=payload.start_time,
-                duration_minutes=payload.duration_minutes,
-                attendee_count=payload.attendee_count,
-                notes=payload.notes,
-                details=payload.details,
-                payment_amount=payload.payment_amount,
-                payment_currency=payload.payment_currency,
-            ),
+            customer_payload=customer_payload,
+            booking_payload=booking_payload,
         )
+    except BookingConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except ValueError as exc:  # venue / room not found
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -98,15 +121,80 @@ async def confirm_booking(
     store_record = StoreBookingStatus(
         status=booking.status.value.lower(),
         booking_id=str(booking.id),
-        room_id=booking.room.id if booking.room else None,
+        room_id=booking.room["id"] if booking.room else None,
         check_in_time=booking.start_time.isoformat() if booking.start_time else None,
     )
-    if booking.door_access_events:
-        store_record.key_token = booking.door_access_events[0].door_code
+    if booking.door_access:
+        store_record.key_token = booking.door_access["code"]
     store_record.payment_required = False
     session_store.update_booking_status(session_id, store_record)
 
-    return {"booking": _serialize_booking(booking)}
+    return FastJSONResponse({"booking": confirmation_shape(booking)})
+
+
+@router.post("/{session_id}/bulk")
+async def confirm_bulk_bookings(
+    session_id: str,
+    payload: BulkBookingSubmission,
+    db: AsyncSession = Depends(get_session),
+    booking_service: BookingService = Depends(get_booking_service),
+) -> FastJSONResponse:
+    """Book many rooms/dates for one organizer; conflicts are checked for the whole batch at once."""
+
+    try:
+        results = await booking_service.confirm_bulk(
+            session=db,
+            customer_payload=CustomerPayload(
+                name=payload.customer.name,
+                email=payload.customer.email,
+                phone_number=payload.customer.phone_number,
+                attributes=payload.customer.attributes,
+            ),
+            booking_payloads=[
+                BookingPayload(
+                    session_id=session_id,
+                    venue_id=payload.venue_id,
+                    room_id=item.room_id,
+                    start_time=item.start_time,
+                    duration_minutes=item.duration_minutes,
+                    attendee_count=item.attendee_count,
+                    notes=item.notes,
+                    details=item.details,
+                    payment_amount=item.payment_amount,
+                    payment_currency=item.payment_currency,
+                )
+                for item in payload.items
+            ],
+            all_or_nothing=payload.mode == "all_or_nothing",
+        )
+    except ValueError as exc:  # venue not found
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    confirmed = sum(1 for result in results if result.status == "confirmed")
+    if confirmed == len(results):
+        outcome, status_code = "confirmed", 200
+    elif confirmed:
+        outcome, status_code = "partial", 207
+    else:
+        outcome, status_code = "rejected", 409
+
+    return FastJSONResponse(
+        status_code=status_code,
+        content={
+            "mode": payload.mode,
+            "status": outcome,
+            "confirmed": confirmed,
+            "results": [
+                {
+                    "index": result.index,
+                    "status": result.status,
+                    "reason": result.reason,
+                    "booking": confirmation_shape(result.confirmation) if result.confirmation else None,
+                }
+                for result in results
+            ],
+        },
+    )
 
 
 @router.post("/{booking_id}/door-code")
@@ -114,31 +202,32 @@ async def regenerate_door_code(
     booking_id: int,
     db: AsyncSession = Depends(get_session),
     booking_service: BookingService = Depends(get_booking_service),
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     try:
-        booking = await booking_service.regenerate_door_code(db, booking_id)
+        await booking_service.regenerate_door_code(db, booking_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    if booking.session_id:
+    booking = booking_detail((await db.execute(booking_detail_stmt().where(Booking.id == booking_id))).one())
+    if booking["session_id"]:
         store_record = StoreBookingStatus(
-            status=booking.status.value.lower(),
-            booking_id=str(booking.id),
-            room_id=booking.room.id if booking.room else None,
-            check_in_time=booking.start_time.isoformat() if booking.start_time else None,
+            status=booking["status"],
+            booking_id=str(booking["id"]),
+            room_id=booking["room"]["id"] if booking["room"] else None,
+            check_in_time=booking["start_time"],
         )
-        store_record.key_token = booking.door_access_events[0].door_code
+        store_record.key_token = booking["door_access"]["code"]
         store_record.payment_required = False
-        session_store.update_booking_status(booking.session_id, store_record)
+        session_store.update_booking_status(booking["session_id"], store_record)
 
-    return {"booking": _serialize_booking(booking)}
+    return FastJSONResponse({"booking": booking})
 
 
 @router.get("/recent")
 async def list_recent_bookings(
     limit: int = 25,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     booking_service: BookingService = Depends(get_booking_service),
-) -> Dict[str, Any]:
-    bookings = await booking_service.list_bookings(db, limit=limit)
-    return {"bookings": [_serialize_booking(booking) for booking in bookings]}
+) -> FastJSONResponse:
+    rows = await booking_service.list_bookings(db, limit=limit)
+    return FastJSONResponse({"bookings": [booking_detail(row) for row in rows]})
@@ -6,12 +6,20 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
-
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_session
+from app.services.customer_context_service import (
+    CustomerContextService,
+    caller_phone_from_webhook,
+    get_customer_context_service,
+)
 from app.services.vapi_service import VapiService, get_vapi_service
-from app.services.summary_service import SummaryService, get_summary_service
+from app.services.outbox import TOPIC_CALL_SUMMARY, OutboxDispatcher, get_outbox_dispatcher, outbox_stmt
 from app.stores.session_store import SessionRecord, session_store
 from app.stores.session_store import TranscriptEntry
 from app.stores.event_bus import event_bus
+from app.utils.contact import normalize_phone
 
 
 class CallBrief(BaseModel):
@@ -70,7 +78,9 @@ async def launch_call(
 async def handle_vapi_webhook(
     request: Request,
     vapi_service: VapiService = Depends(get_vapi_service),
-    summary_service: SummaryService = Depends(get_summary_service),
+    db: AsyncSession = Depends(get_session),
+    outbox: OutboxDispatcher = Depends(get_outbox_dispatcher),
+    context_service: CustomerContextService = Depends(get_customer_context_service),
 ) -> dict[str, str]:
     payload = await request.json()
     session_id = payload.get("session_id") or payload.get("sessionId")
@@ -117,8 +127,18 @@ async def handle_vapi_webhook(
         if record:
             record.brief.setdefault("statuses", []).append(event_type)
             session_store.upsert(record)
+        if event_type in {"call.ringing", "call.started"}:
+            # Look the caller up while the phone rings so the first tool call is a cache hit.
+            phone_number = caller_phone_from_webhook(payload) or normalize_phone(
+                record.brief.get("phone_number") if record else None
+            )
+            if phone_number:
+                context_service.warm(session_id, phone_number)
         if event_type == "call.completed":
-            summary_service.schedule_summary(session_id)
+            # Durable: the summary is generated by the outbox dispatcher, even across a restart.
+            await db.execute(outbox_stmt(TOPIC_CALL_SUMMARY, [{"session_id": session_id}]))
+            await db.commit()
+            outbox.notify()
 
     return {"status": "accepted"}
 
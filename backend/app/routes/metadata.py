@@ -1,42 +1,57 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
-from app.db.database import get_session
-from app.models import Venue
+from app.services.summary_service import SummaryService, get_summary_service
+from app.services.venue_catalog_service import VenueCatalogService, get_venue_catalog_service
 from app.stores.session_store import session_store
+from app.stores.venue_catalog import CatalogEntry, etag_matches
 
 
 router = APIRouter(prefix="/metadata", tags=["metadata"])
 
 
+def _cached_response(request: Request, entry: CatalogEntry) -> Response:
+    # no-cache: clients may keep the body but must revalidate, which costs us a dict lookup.
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
 @router.get("/venues")
-async def list_venues(session: AsyncSession = Depends(get_session)) -> list[dict]:
-    result = await session.execute(select(Venue).order_by(Venue.name))
-    venues = result.scalars().unique().all()
-    return [venue.to_dict() for venue in venues]
+async def list_venues(
+    request: Request,
+    catalog: VenueCatalogService = Depends(get_venue_catalog_service),
+) -> Response:
+    return _cached_response(request, await catalog.listing())
 
 
 @router.get("/venues/{venue_id}")
-async def get_venue(venue_id: str, session: AsyncSession = Depends(get_session)) -> dict:
-    result = await session.execute(select(Venue).where(Venue.id == venue_id))
-    venue = result.scalar_one_or_none()
-    if not venue:
+async def get_venue(
+    venue_id: str,
+    request: Request,
+    catalog: VenueCatalogService = Depends(get_venue_catalog_service),
+) -> Response:
+    entry = await catalog.venue(venue_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Venue not found")
-    return venue.to_dict()
+    return _cached_response(request, entry)
 
 
 @router.get("/sessions/{session_id}")
-def get_session(session_id: str) -> dict:
+async def get_session(session_id: str, summaries: SummaryService = Depends(get_summary_service)) -> dict:
     record = session_store.get(session_id)
     if not record:
         raise HTTPException(status_code=404, detail="Session not found")
+    # Summaries are generated by whichever process's outbox dispatcher delivered them.
+    summary = record.summary
+    if summary is None and "call.completed" in record.brief.get("statuses", ()):
+        summary = await summaries.get_summary(session_id)
     return {
         "session_id": record.session_id,
         "call_type": record.call_type,
         "brief": record.brief,
-        "summary": record.summary,
+        "summary": summary,
         "booking_status": record.booking_status.__dict__,
     }
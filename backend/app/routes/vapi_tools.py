@@ -1,27 +1,60 @@
 from __future__ import annotations
 
-import asyncio
-from collections import deque
 from datetime import date, datetime, time, timedelta, timezone
 import logging
 from decimal import Decimal, InvalidOperation
-from typing import Any, Deque, Dict
+from typing import Any, Callable, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import and_, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_session
-from app.models import Booking, Room, Payment, PaymentStatus
+from app.db.database import get_read_session, get_session
+from app.db.pagination import decode_cursor, keyset_stmt, page_of, stream_ndjson
+from app.models import Booking, BookingStatus, Payment, PaymentStatus
 from app.schemas.booking import (
     AvailabilityRequest,
     AvailabilityResponse,
     AvailabilityResponseRoom,
     BookingSubmission,
     CustomerInfo,
+    HoldInfo,
+    HoldRequest,
+)
+from app.serializers import (
+    PAYMENT_COLUMNS,
+    FastJSONResponse,
+    booking_summary,
+    booking_summary_stmt,
+    payment_shape,
+    tool_confirmation_shape,
+)
+from app.services.availability_service import AvailabilityService, get_availability_service
+from app.services.booking_service import (
+    BookingConflictError,
+    BookingHold,
+    BookingPayload,
+    BookingService,
+    CustomerPayload,
+    get_booking_service,
+)
+from app.services.customer_context_service import CustomerContextService, get_customer_context_service
+from app.services.idempotency_service import (
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    IdempotencyService,
+    get_idempotency_service,
+    request_fingerprint,
+)
+from app.services.payment_service import PAYMENT_TRANSITIONS, PaymentService, get_payment_service
+from app.services.payment_worker import PaymentWorker, get_payment_worker
+from app.services.recurrence import RecurrenceRule
+from app.services.recurring_booking_service import (
+    RecurringBookingService,
+    SeriesConflictError,
+    get_recurring_booking_service,
 )
-from app.services.booking_service import BookingPayload, BookingService, CustomerPayload, get_booking_service
-from app.services.payment_service import PaymentService, get_payment_service
 from app.stores.event_bus import event_bus
 from app.stores.session_store import SessionRecord, session_store
 
@@ -29,11 +62,52 @@ router = APIRouter(prefix="/vapi/tools", tags=["vapi-tools"])
 logger = logging.getLogger(__name__)
 
 
-_mock_payment_events: Deque[dict[str, Any]] = deque(maxlen=50)
+IDEMPOTENCY_SCOPE_BOOKING = "vapi.booking"
+IDEMPOTENCY_SCOPE_APPLE_PAY = "vapi.payment.apple_pay"
+
+
+async def _claim_idempotency_key(
+    db: AsyncSession,
+    idempotency: IdempotencyService,
+    scope: str,
+    header_key: str | None,
+    request: Dict[str, Any],
+) -> tuple[str, Dict[str, Any] | None]:
+    """Resolve the key (header, else derived from the normalized request) and claim it.
+
+    Returns ``(key, stored_response)``; a stored response means this is a retry that
+    must be answered without re-running the pipeline.
+    """
+
+    request_hash = request_fingerprint(request)
+    key = header_key or f"derived:{request_hash}"
+    try:
+        return key, await idempotency.claim(db, scope, key, request_hash)
+    except IdempotencyKeyReusedError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except IdempotencyInProgressError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+def _fill_from_known_customer(customer: CustomerInfo, known: Dict[str, Any] | None) -> CustomerInfo:
+    """Complete what the caller said with what we already have on file; spoken values win."""
+
+    if not known:
+        return customer
+    return customer.model_copy(
+        update={
+            "name": customer.name or known.get("name"),
+            "email": customer.email or known.get("email"),
+            "phone_number": customer.phone_number or known.get("phone_number"),
+        }
+    )
 
 
 @router.post("/customer")
-async def store_customer_profile(payload: Dict[str, Any]) -> Dict[str, Any]:
+async def store_customer_profile(
+    payload: Dict[str, Any],
+    context_service: CustomerContextService = Depends(get_customer_context_service),
+) -> Dict[str, Any]:
     session_id = payload.get("session_id")
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id is required")
@@ -44,7 +118,10 @@ async def store_customer_profile(payload: Dict[str, Any]) -> Dict[str, Any]:
         "phone_number": payload.get("phone_number"),
         "attributes": payload.get("attributes", {}),
     }
-    customer = CustomerInfo(**customer_data)
+    context = context_service.lookup(session_id) or await context_service.resolve(
+        session_id, customer_data.get("phone_number")
+    )
+    customer = _fill_from_known_customer(CustomerInfo(**customer_data), context.customer if context else None)
 
     record = session_store.get(session_id) or SessionRecord(session_id=session_id, call_type="unknown")
     record.brief.setdefault("customer", {})
@@ -66,7 +143,34 @@ async def store_customer_profile(payload: Dict[str, Any]) -> Dict[str, Any]:
             "customer": customer.model_dump(exclude_none=True),
         },
     )
-    return {"status": "stored"}
+    if context and context.known:
+        return {
+            "status": "stored",
+            "returning_customer": True,
+            "customer": customer.model_dump(exclude_none=True),
+            "recent_bookings": context.recent_bookings,
+            "preferred_rooms": context.preferred_rooms,
+        }
+    return {"status": "stored", "returning_customer": False}
+
+
+@router.get("/customer/context")
+async def customer_context(
+    session_id: str,
+    context_service: CustomerContextService = Depends(get_customer_context_service),
+) -> Dict[str, Any]:
+    """Cached caller context for the session; empty until the ringing prefetch completes."""
+
+    context = context_service.lookup(session_id)
+    if context is None or not context.known:
+        return {"session_id": session_id, "returning_customer": False}
+    return {
+        "session_id": session_id,
+        "returning_customer": True,
+        "customer": context.customer,
+        "recent_bookings": context.recent_bookings,
+        "preferred_rooms": context.preferred_rooms,
+    }
 
 
 DEFAULT_VENUE_ID = "aurora-hall"
@@ -133,6 +237,17 @@ def _convert_workflow_payload(raw: Dict[str, Any]) -> AvailabilityRequest:
         duration_minutes=duration_minutes,
         attendee_count=attendee_count,
         notes=notes,
+        hold_room_id=raw.get("hold_room_id") or raw.get("holdRoomId"),
+    )
+
+
+def _hold_info(hold: BookingHold) -> HoldInfo:
+    return HoldInfo(
+        hold_id=hold.id,
+        room_id=hold.room_id,
+        start_time=hold.start_time,
+        end_time=hold.end_time,
+        expires_at=hold.expires_at,
     )
 
 
@@ -140,44 +255,62 @@ def _convert_workflow_payload(raw: Dict[str, Any]) -> AvailabilityRequest:
 async def check_room_availability(
     payload: Dict[str, Any],
     db: AsyncSession = Depends(get_session),
+    booking_service: BookingService = Depends(get_booking_service),
+    availability: AvailabilityService = Depends(get_availability_service),
 ) -> AvailabilityResponse:
     try:
         request_payload = AvailabilityRequest.model_validate(payload)
     except Exception:  # Payload did not match direct schema; attempt workflow conversion
         request_payload = _convert_workflow_payload(payload)
 
-    stmt = select(Room).where(Room.venue_id == DEFAULT_VENUE_ID)
-    rooms = (await db.execute(stmt)).scalars().all()
-
+    end_window = request_payload.start_time + timedelta(minutes=request_payload.duration_minutes)
+    checked = await availability.check(DEFAULT_VENUE_ID, request_payload.start_time, end_window, request_payload.session_id)
     results: list[AvailabilityResponseRoom] = []
-    for room in rooms:
-        end_window = request_payload.start_time + timedelta(minutes=request_payload.duration_minutes)
-        conflicts_stmt = select(Booking).where(
-            and_(
-                Booking.room_id == room.id,
-                Booking.start_time.is_not(None),
-                Booking.end_time.is_not(None),
-                Booking.start_time < end_window,
-                Booking.end_time > request_payload.start_time,
-            )
-        )
-        conflicts = (await db.execute(conflicts_stmt)).scalars().all()
-        available = len(conflicts) == 0
+    for room in checked.rooms:
+        available = room.free
         reasons: list[str] = []
-        if not available:
+        if room.booked:
             reasons.append("Existing booking overlaps with requested time")
+        elif room.held:
+            reasons.append("Room is temporarily held by another caller")
         if request_payload.attendee_count and room.capacity < request_payload.attendee_count:
             available = False
             reasons.append("Capacity too small for requested attendees")
+        if not room.verified:
+            reasons.append("Availability could not be confirmed in time; confirm before booking")
         results.append(
             AvailabilityResponseRoom(
-                room_id=room.id,
+                room_id=room.room_id,
                 label=room.label,
                 capacity=room.capacity,
                 available=available,
+                verified=room.verified,
                 reasons=reasons,
             )
         )
+    degraded = checked.degraded
+
+    hold: HoldInfo | None = None
+    # A degraded answer has no budget left for the hold, and may be wrong about the room.
+    if not degraded and request_payload.hold_room_id and any(
+        r.room_id == request_payload.hold_room_id and r.available for r in results
+    ):
+        try:
+            placed = await booking_service.place_hold(
+                session=db,
+                session_id=request_payload.session_id,
+                venue_id=DEFAULT_VENUE_ID,
+                room_id=request_payload.hold_room_id,
+                start_time=request_payload.start_time,
+                end_time=end_window,
+            )
+            hold = _hold_info(placed)
+        except BookingConflictError:
+            # Lost the race between the check above and the hold; report the room as taken.
+            for r in results:
+                if r.room_id == request_payload.hold_room_id:
+                    r.available = False
+                    r.reasons.append("Room is temporarily held by another caller")
 
     response = AvailabilityResponse(
         session_id=request_payload.session_id,
@@ -185,6 +318,8 @@ async def check_room_availability(
         start_time=request_payload.start_time,
         duration_minutes=request_payload.duration_minutes,
         rooms=results,
+        hold=hold,
+        degraded=degraded,
     )
 
     await event_bus.publish(
@@ -192,6 +327,8 @@ async def check_room_availability(
         {
             "type": "availability",
             "rooms": [room.model_dump() for room in results],
+            "hold": hold.model_dump(mode="json") if hold else None,
+            "degraded": degraded,
         },
     )
     logger.info(
@@ -227,6 +364,70 @@ async def availability_help() -> Dict[str, Any]:
     }
 
 
+@router.post("/holds", response_model=HoldInfo)
+async def place_hold(
+    payload: Dict[str, Any],
+    db: AsyncSession = Depends(get_session),
+    booking_service: BookingService = Depends(get_booking_service),
+) -> HoldInfo:
+    """Reserve a room for the caller while they decide; confirming the same slot converts it."""
+
+    normalized = dict(payload)
+    normalized.setdefault("venue_id", payload.get("venueId") or DEFAULT_VENUE_ID)
+    normalized.setdefault("room_id", payload.get("roomId"))
+    normalized.setdefault("start_time", payload.get("startTime"))
+    normalized.setdefault("duration_minutes", payload.get("durationMinutes"))
+    try:
+        request_payload = HoldRequest.model_validate(normalized)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="session_id, room_id, startTime and durationMinutes are required") from exc
+
+    try:
+        hold = await booking_service.place_hold(
+            session=db,
+            session_id=request_payload.session_id,
+            venue_id=request_payload.venue_id,
+            room_id=request_payload.room_id,
+            start_time=request_payload.start_time,
+            end_time=request_payload.start_time + timedelta(minutes=request_payload.duration_minutes),
+        )
+    except BookingConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    info = _hold_info(hold)
+    await event_bus.publish(request_payload.session_id, {"type": "hold.placed", **info.model_dump(mode="json")})
+    logger.info(
+        "session_event",
+        extra={
+            "session_id": request_payload.session_id,
+            "event": "hold.placed",
+            "hold_id": hold.id,
+            "room_id": hold.room_id,
+            "expires_at": hold.expires_at.isoformat(),
+        },
+    )
+    return info
+
+
+@router.post("/holds/release")
+async def release_hold(
+    payload: Dict[str, Any],
+    db: AsyncSession = Depends(get_session),
+    booking_service: BookingService = Depends(get_booking_service),
+) -> Dict[str, Any]:
+    session_id = payload.get("session_id")
+    hold_id = payload.get("hold_id") or payload.get("holdId")
+    if not session_id or hold_id is None:
+        raise HTTPException(status_code=400, detail="session_id and hold_id are required")
+
+    released = await booking_service.release_hold(db, session_id=session_id, hold_id=int(hold_id))
+    if released:
+        await event_bus.publish(session_id, {"type": "hold.released", "hold_id": int(hold_id)})
+    return {"hold_id": int(hold_id), "status": "released" if released else "not_found"}
+
+
 def _normalize_booking_payload(raw: Dict[str, Any]) -> BookingSubmission:
     try:
         session_id = raw["session_id"]
@@ -278,7 +479,64 @@ def _normalize_booking_payload(raw: Dict[str, Any]) -> BookingSubmission:
         customer=customer_normalized,
         payment_amount=raw.get("payment_amount") or raw.get("paymentAmount"),
         payment_currency=raw.get("payment_currency") or raw.get("paymentCurrency", "USD"),
+        recurrence=raw.get("recurrence"),
+    )
+
+
+async def _confirm_series(
+    db: AsyncSession,
+    submission: BookingSubmission,
+    customer_payload: CustomerPayload,
+    booking_payload: BookingPayload,
+    recurring_service: RecurringBookingService,
+) -> Dict[str, Any]:
+    recurrence = submission.recurrence
+    series = await recurring_service.create_series(
+        session=db,
+        customer_payload=customer_payload,
+        booking_payload=booking_payload,
+        rule=RecurrenceRule.from_dict(recurrence.model_dump()),
+        skip_conflicts=recurrence.skip_conflicts,
     )
+    await event_bus.publish(
+        submission.session_id,
+        {
+            "type": "booking.series_confirmed",
+            "series_id": series.id,
+            "room": series.room,
+            "occurrences": series.occurrence_count,
+            "conflicts": len(series.conflicts),
+        },
+    )
+    logger.info(
+        "session_event",
+        extra={
+            "session_id": submission.session_id,
+            "event": "booking.series_confirmed",
+            "series_id": series.id,
+            "room_id": series.room["id"] if series.room else None,
+            "occurrences": series.occurrence_count,
+        },
+    )
+    return {
+        "series_id": series.id,
+        "status": "CONFIRMED",
+        "occurrence_count": series.occurrence_count,
+        "skipped_occurrences": [start.isoformat() for start in series.conflicts],
+        "upcoming": [
+            {
+                "booking_id": occurrence["booking_id"],
+                "start_time": occurrence["start_time"].isoformat(),
+                "door_code": occurrence["door_code"],
+            }
+            for occurrence in series.materialized
+        ],
+        "customer": {
+            "name": series.customer.get("name"),
+            "email": series.customer.get("email"),
+            "phone_number": series.customer.get("phone_number"),
+        },
+    }
 
 
 @router.post("/booking")
@@ -286,66 +544,90 @@ async def confirm_booking(
     payload: Dict[str, Any],
     db: AsyncSession = Depends(get_session),
     booking_service: BookingService = Depends(get_booking_service),
-) -> Dict[str, Any]:
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    context_service: CustomerContextService = Depends(get_customer_context_service),
+    recurring_service: RecurringBookingService = Depends(get_recurring_booking_service),
+) -> Any:
     try:
         submission = BookingSubmission.model_validate(payload)
     except Exception:
         submission = _normalize_booking_payload(payload)
 
-    existing_stmt = select(Booking).where(
-        Booking.session_id == submission.session_id,
-        Booking.room_id == submission.room_id,
-        Booking.start_time == submission.start_time,
+    idempotency_key, replay = await _claim_idempotency_key(
+        db, idempotency, IDEMPOTENCY_SCOPE_BOOKING, idempotency_key, submission.model_dump(mode="json")
     )
-    existing = (await db.execute(existing_stmt)).scalar_one_or_none()
-
-    if existing:
+    if replay is not None:
         logger.info(
             "session_event",
             extra={
                 "session_id": submission.session_id,
-                "event": "booking.already_exists",
-                "booking_id": existing.id,
+                "event": "booking.replayed",
+                "booking_id": replay.get("booking_id"),
             },
         )
-        return {
-            "booking_id": existing.id,
-            "door_code": existing.door_access_events[0].door_code if existing.door_access_events else None,
-            "status": existing.status.value,
-        }
+        return replay
 
-    try:
-        booking = await booking_service.confirm_booking(
-            session=db,
-            customer_payload=CustomerPayload(
-                name=submission.customer.name,
-                email=submission.customer.email,
-                phone_number=submission.customer.phone_number,
-                attributes=submission.customer.attributes,
-            ),
-            booking_payload=BookingPayload(
-                session_id=submission.session_id,
-                venue_id=submission.venue_id,
-                room_id=submission.room_id,
-                start_time=submission.start_time,
-                duration_minutes=submission.duration_minutes,
-                attendee_count=submission.attendee_count,
-                notes=submission.notes,
-                details=submission.details,
-                payment_amount=submission.payment_amount,
-                payment_currency=submission.payment_currency,
-            ),
-        )
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    context = context_service.lookup(submission.session_id)
+    submission.customer = _fill_from_known_customer(submission.customer, context.customer if context else None)
 
+    customer_payload = CustomerPayload(
+        name=submission.customer.name,
+        email=submission.customer.email,
+        phone_number=submission.customer.phone_number,
+        attributes=submission.customer.attributes,
+    )
+    booking_payload = BookingPayload(
+        session_id=submission.session_id,
+        venue_id=submission.venue_id,
+        room_id=submission.room_id,
+        start_time=submission.start_time,
+        duration_minutes=submission.duration_minutes,
+        attendee_count=submission.attendee_count,
+        notes=submission.notes,
+        details=submission.details,
+        payment_amount=submission.payment_amount,
+        payment_currency=submission.payment_currency,
+    )
+
+    try:
+        if submission.recurrence is not None:
+            series_response = await _confirm_series(
+                db, submission, customer_payload, booking_payload, recurring_service
+            )
+        else:
+            booking = await booking_service.confirm_booking(
+                session=db,
+                customer_payload=customer_payload,
+                booking_payload=booking_payload,
+            )
+    except Exception as exc:
+        # Not on cancellation: no more DB work then; the claim is taken over once it times out.
+        await idempotency.release(db, IDEMPOTENCY_SCOPE_BOOKING, idempotency_key)
+        if isinstance(exc, SeriesConflictError):
+            raise HTTPException(
+                status_code=409,
+                detail={"message": str(exc), "conflicts": [start.isoformat() for start in exc.occurrences]},
+            ) from exc
+        if isinstance(exc, BookingConflictError):
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        if isinstance(exc, ValueError):
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        raise
+
+    context_service.invalidate_session(submission.session_id)
+    if submission.recurrence is not None:
+        await idempotency.complete(db, IDEMPOTENCY_SCOPE_BOOKING, idempotency_key, series_response)
+        return series_response
+
+    door_code = booking.door_access["code"] if booking.door_access else None
     await event_bus.publish(
         submission.session_id,
         {
             "type": "booking.confirmed",
             "booking_id": booking.id,
-            "room": booking.room.to_dict(include_venue=False) if booking.room else None,
-            "door_code": booking.door_access_events[0].door_code if booking.door_access_events else None,
+            "room": booking.room,
+            "door_code": door_code,
         },
     )
     logger.info(
@@ -354,38 +636,27 @@ async def confirm_booking(
             "session_id": submission.session_id,
             "event": "booking.confirmed",
             "booking_id": booking.id,
-            "room_id": booking.room.id if booking.room else None,
-            "door_code": booking.door_access_events[0].door_code if booking.door_access_events else None,
+            "room_id": booking.room["id"] if booking.room else None,
+            "door_code": door_code,
         },
     )
 
-    payment = booking.payments[0] if booking.payments else None
-    customer = booking.customer
-
-    return {
-        "booking_id": booking.id,
-        "door_code": booking.door_access_events[0].door_code if booking.door_access_events else None,
-        "status": booking.status.value,
-        "customer": {
-            "name": customer.name if customer else None,
-            "email": customer.email if customer else None,
-            "phone_number": customer.phone_number if customer else None,
-        },
-        "payment": {
-            "amount": float(payment.amount) if getattr(payment, "amount", None) is not None else None,
-            "currency": payment.currency if payment else None,
-            "provider": payment.provider.value if payment else None,
-            "status": payment.status.value if payment else None,
-        } if payment else None,
-    }
+    response = tool_confirmation_shape(booking)
+    await idempotency.complete(db, IDEMPOTENCY_SCOPE_BOOKING, idempotency_key, response)
+    return FastJSONResponse(response)
 
 
-@router.post("/payment/apple-pay")
+@router.post("/payment/apple-pay", status_code=202)
 async def mock_apple_pay(
     payload: Dict[str, Any],
     db: AsyncSession = Depends(get_session),
     payment_service: PaymentService = Depends(get_payment_service),
-) -> Dict[str, Any]:
+    payment_worker: PaymentWorker = Depends(get_payment_worker),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> JSONResponse:
+    """Accept a payment and return ``202`` with its id; the worker settles it and emits ``payment.*``."""
+
     session_id = payload.get("session_id") or payload.get("sessionId")
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id is required")
@@ -401,69 +672,79 @@ async def mock_apple_pay(
         except (InvalidOperation, ValueError) as exc:
             raise HTTPException(status_code=400, detail="amount must be numeric") from exc
 
-    transaction_id = payload.get("transaction_id") or f"applepay_demo_{int(datetime.utcnow().timestamp() * 1000)}"
+    idempotency_key, replay = await _claim_idempotency_key(
+        db,
+        idempotency,
+        IDEMPOTENCY_SCOPE_APPLE_PAY,
+        idempotency_key,
+        {
+            "session_id": session_id,
+            "booking_id": booking_id,
+            "amount": str(amount_decimal) if amount_decimal is not None else None,
+            "currency": currency,
+            "transaction_id": payload.get("transaction_id"),
+        },
+    )
+    if replay is not None:
+        return JSONResponse(status_code=202, content=replay)
 
-    await asyncio.sleep(float(payload.get("processing_delay", 1.0)))
+    try:
+        response = await _accept_apple_pay(payload, db, payment_service, session_id, amount_decimal, currency, booking_id)
+    except Exception:
+        await idempotency.release(db, IDEMPOTENCY_SCOPE_APPLE_PAY, idempotency_key)
+        raise
+    await idempotency.complete(db, IDEMPOTENCY_SCOPE_APPLE_PAY, idempotency_key, response)
+    try:
+        payment_worker.submit(response["payment_id"])
+    except RuntimeError as exc:
+        # The row is committed and PENDING; a worker sweep charges it.
+        logger.warning("payment_submit_failed", extra={"payment_id": response["payment_id"], "error": str(exc)})
+    return JSONResponse(status_code=202, content=response)
 
-    booking: Booking | None = None
-    if booking_id is not None:
-        booking = await db.get(Booking, booking_id)
-        if not booking:
-            raise HTTPException(status_code=404, detail="booking not found")
 
-    if booking is not None:
-        await payment_service.record_payment(
-            session=db,
-            booking=booking,
-            amount=amount_decimal,
-            currency=currency,
-            metadata={
-                "transaction_id": transaction_id,
-                "provider": "apple_pay",
-            },
-            status=PaymentStatus.SUCCEEDED,
-        )
-        await db.commit()
-    else:
-        _mock_payment_events.appendleft(
-            {
-                "id": transaction_id,
-                "provider": "apple_pay",
-                "status": PaymentStatus.SUCCEEDED.value,
-                "amount": float(amount_decimal) if amount_decimal is not None else None,
-                "currency": currency,
-                "transaction_id": transaction_id,
-                "created_at": datetime.utcnow().isoformat(),
-            }
-        )
+async def _accept_apple_pay(
+    payload: Dict[str, Any],
+    db: AsyncSession,
+    payment_service: PaymentService,
+    session_id: str,
+    amount_decimal: Decimal | None,
+    currency: str,
+    booking_id: Any,
+) -> Dict[str, Any]:
+    transaction_id = payload.get("transaction_id") or f"applepay_demo_{int(datetime.utcnow().timestamp() * 1000)}"
 
-    record = session_store.get(session_id) or SessionRecord(session_id=session_id, call_type="booking")
-    record.booking_status.payment_required = False
-    session_store.upsert(record)
+    if booking_id is not None and await db.get(Booking, booking_id) is None:
+        raise HTTPException(status_code=404, detail="booking not found")
 
-    event_payload = {
-        "type": "payment.succeeded",
-        "provider": "apple_pay",
-        "amount": float(amount_decimal) if amount_decimal is not None else None,
-        "currency": currency,
-        "transaction_id": transaction_id,
-        "booking_id": booking_id,
-    }
+    metadata: Dict[str, Any] = {"transaction_id": transaction_id, "provider": "apple_pay"}
+    for option in ("processing_delay", "simulate"):
+        if option in payload:
+            metadata[option] = payload[option]
+    payment_id = await payment_service.create_pending(
+        db,
+        session_id=session_id,
+        booking_id=booking_id,
+        amount=amount_decimal,
+        currency=currency,
+        metadata=metadata,
+    )
+    await db.commit()
 
-    await event_bus.publish(session_id, event_payload)
     logger.info(
         "session_event",
         extra={
             "session_id": session_id,
-            "event": "payment.succeeded",
-            "amount": event_payload["amount"],
+            "event": "payment.pending",
+            "payment_id": payment_id,
+            "amount": float(amount_decimal) if amount_decimal is not None else None,
             "currency": currency,
             "booking_id": booking_id,
         },
     )
 
     return {
-        "status": "SUCCEEDED",
+        "status": PaymentStatus.PENDING.value,
+        "payment_id": payment_id,
         "transaction_id": transaction_id,
         "provider": "apple_pay",
         "amount": float(amount_decimal) if amount_decimal is not None else None,
@@ -472,6 +753,30 @@ async def mock_apple_pay(
     }
 
 
+@router.get("/payments/{payment_id}")
+async def get_payment(payment_id: int, db: AsyncSession = Depends(get_session)) -> FastJSONResponse:
+    payment = (await db.execute(select(*PAYMENT_COLUMNS).where(Payment.id == payment_id))).first()
+    if payment is None:
+        raise HTTPException(status_code=404, detail="payment not found")
+    return FastJSONResponse({"payment": payment_shape(payment)})
+
+
+@router.post("/payments/{payment_id}/refund", status_code=202)
+async def refund_payment(
+    payment_id: int,
+    db: AsyncSession = Depends(get_session),
+    payment_worker: PaymentWorker = Depends(get_payment_worker),
+) -> Dict[str, Any]:
+    status = (await db.execute(select(Payment.status).where(Payment.id == payment_id))).scalar_one_or_none()
+    await db.rollback()
+    if status is None:
+        raise HTTPException(status_code=404, detail="payment not found")
+    if PaymentStatus.REFUNDED not in PAYMENT_TRANSITIONS[status]:
+        raise HTTPException(status_code=409, detail=f"cannot refund a {status.value} payment")
+    payment_worker.submit(payment_id, "refund")
+    return {"payment_id": payment_id, "status": status.value, "requested": "refund"}
+
+
 @router.post("/survey")
 async def log_survey(payload: Dict[str, Any]) -> Dict[str, Any]:
     session_id = payload.get("session_id")
@@ -487,63 +792,115 @@ async def log_survey(payload: Dict[str, Any]) -> Dict[str, Any]:
     return {"status": "logged"}
 
 
-@router.get("/bookings")
-async def list_bookings(db: AsyncSession = Depends(get_session)) -> Dict[str, Any]:
-    result = await db.execute(select(Booking))
-    bookings = []
-    for booking in result.scalars().unique():
-        payment = booking.payments[0] if booking.payments else None
-        customer = booking.customer
-        bookings.append(
-            {
-                "id": booking.id,
-                "session_id": booking.session_id,
-                "venue_id": booking.venue_id,
-                "room_id": booking.room_id,
-                "status": booking.status.value,
-                "start_time": booking.start_time.isoformat() if booking.start_time else None,
-                "end_time": booking.end_time.isoformat() if booking.end_time else None,
-                "attendee_count": booking.attendee_count,
-                "notes": booking.notes,
-                "customer": {
-                    "name": customer.name if customer else None,
-                    "email": customer.email if customer else None,
-                    "phone_number": customer.phone_number if customer else None,
-                },
-                "payment": {
-                    "amount": float(payment.amount) if getattr(payment, "amount", None) is not None else None,
-                    "currency": payment.currency if payment else None,
-                    "provider": payment.provider.value if payment else None,
-                    "status": payment.status.value if payment else None,
-                } if payment else None,
-            }
-        )
-    return {"bookings": bookings}
+def _booking_listing_stmt(
+    venue_id: Optional[str],
+    status: Optional[BookingStatus],
+    start_from: Optional[datetime],
+    start_to: Optional[datetime],
+) -> Select:
+    stmt = booking_summary_stmt()
+    if venue_id:
+        stmt = stmt.where(Booking.venue_id == venue_id)
+    if status:
+        stmt = stmt.where(Booking.status == status)
+    if start_from:
+        stmt = stmt.where(Booking.start_time >= start_from)
+    if start_to:
+        stmt = stmt.where(Booking.start_time < start_to)
+    return stmt
+
+
+def _payment_listing_stmt(
+    venue_id: Optional[str],
+    status: Optional[PaymentStatus],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+) -> Select:
+    stmt = select(*PAYMENT_COLUMNS)
+    if venue_id:
+        stmt = stmt.where(Payment.booking_id.in_(select(Booking.id).where(Booking.venue_id == venue_id)))
+    if status:
+        stmt = stmt.where(Payment.status == status)
+    # created_at is stored without a zone (UTC); compare like with like.
+    if created_from:
+        stmt = stmt.where(Payment.created_at >= created_from.astimezone(timezone.utc).replace(tzinfo=None))
+    if created_to:
+        stmt = stmt.where(Payment.created_at < created_to.astimezone(timezone.utc).replace(tzinfo=None))
+    return stmt
+
+
+async def _listing(
+    db: AsyncSession,
+    key: str,
+    stmt: Select,
+    created_column: Any,
+    id_column: Any,
+    serialize: Callable[[Any], Dict[str, Any]],
+    cursor: Optional[str],
+    limit: int,
+    export: bool,
+) -> Any:
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    stmt = keyset_stmt(stmt, created_column, id_column, after)
+    if export:
+        return StreamingResponse(stream_ndjson(stmt, serialize), media_type="application/x-ndjson")
+    rows, next_cursor = page_of((await db.execute(stmt.limit(limit + 1))).all(), limit)
+    return FastJSONResponse({key: [serialize(row) for row in rows], "next_cursor": next_cursor})
 
 
-@router.get("/payments")
-async def list_payments(db: AsyncSession = Depends(get_session)) -> Dict[str, Any]:
-    result = await db.execute(select(Payment).order_by(Payment.created_at.desc()))
-    payments: list[dict[str, Any]] = []
-    for payment in result.scalars().unique():
-        extras = payment.extras or {}
-        transaction_id = extras.get("transaction_id") if isinstance(extras, dict) else None
-        provider_hint = extras.get("provider") if isinstance(extras, dict) else None
-        payments.append(
-            {
-                "id": payment.id,
-                "booking_id": payment.booking_id,
-                "provider": payment.provider.value,
-                "status": payment.status.value,
-                "amount": float(payment.amount) if getattr(payment, "amount", None) is not None else None,
-                "currency": payment.currency,
-                "transaction_id": transaction_id,
-                "provider_hint": provider_hint,
-                "created_at": payment.created_at.isoformat() if payment.created_at else None,
-            }
-        )
+@router.get("/bookings")
+async def list_bookings(
+    venue_id: Optional[str] = None,
+    status: Optional[BookingStatus] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_session),
+) -> Any:
+    """Bookings newest first, ``limit`` per page; pass ``next_cursor`` back as ``cursor``.
+
+    ``format=ndjson`` streams every matching row (from ``cursor``, if given) instead.
+    """
+
+    return await _listing(
+        db,
+        "bookings",
+        _booking_listing_stmt(venue_id, status, start_from, start_to),
+        Booking.created_at,
+        Booking.id,
+        booking_summary,
+        cursor,
+        limit,
+        format == "ndjson",
+    )
 
-    mock_payments = list(_mock_payment_events)
-    combined = mock_payments + payments
 
-    return {"payments": combined}
+@router.get("/payments")
+async def list_payments(
+    venue_id: Optional[str] = None,
+    status: Optional[PaymentStatus] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_session),
+) -> Any:
+    """Payments newest first; paging and ``format=ndjson`` work as for ``/bookings``."""
+
+    return await _listing(
+        db,
+        "payments",
+        _payment_listing_stmt(venue_id, status, created_from, created_to),
+        Payment.created_at,
+        Payment.id,
+        payment_shape,
+        cursor,
+        limit,
+        format == "ndjson",
+    )
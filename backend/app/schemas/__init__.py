@@ -1,15 +1,28 @@
+from .access import KeypadVerifyRequest, KeypadVerifyResponse
 from .booking import (
     AvailabilityRequest,
     AvailabilityResponse,
     AvailabilityResponseRoom,
     BookingSubmission,
+    BulkBookingItem,
+    BulkBookingSubmission,
     CustomerInfo,
+    HoldInfo,
+    HoldRequest,
+    RecurrenceRuleIn,
 )
 
 __all__ = [
     "CustomerInfo",
     "BookingSubmission",
+    "BulkBookingItem",
+    "BulkBookingSubmission",
     "AvailabilityRequest",
     "AvailabilityResponse",
     "AvailabilityResponseRoom",
+    "HoldInfo",
+    "HoldRequest",
+    "RecurrenceRuleIn",
+    "KeypadVerifyRequest",
+    "KeypadVerifyResponse",
 ]
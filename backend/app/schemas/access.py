@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class KeypadVerifyRequest(BaseModel):
+    venue_id: str
+    code: str = Field(min_length=1, max_length=32)
+    room_id: Optional[str] = None
+    keypad_id: Optional[str] = None
+
+
+class KeypadVerifyResponse(BaseModel):
+    granted: bool
+    reason: str
+    booking_id: Optional[int] = None
+    room_id: Optional[str] = None
+    valid_until: Optional[datetime] = None
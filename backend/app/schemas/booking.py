@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -14,6 +14,17 @@ class CustomerInfo(BaseModel):
     attributes: Dict[str, Any] = Field(default_factory=dict)
 
 
+class RecurrenceRuleIn(BaseModel):
+    """``DAILY``/``WEEKLY`` repeat rule; bounded by ``count`` or ``until``."""
+
+    freq: Literal["DAILY", "WEEKLY"] = "WEEKLY"
+    interval: int = Field(1, ge=1)
+    by_weekday: list[Literal["MO", "TU", "WE", "TH", "FR", "SA", "SU"]] = Field(default_factory=list)
+    count: Optional[int] = Field(None, ge=1, le=366)
+    until: Optional[datetime] = None
+    skip_conflicts: bool = False
+
+
 class BookingSubmission(BaseModel):
     session_id: str
     venue_id: str
@@ -26,6 +37,25 @@ class BookingSubmission(BaseModel):
     customer: CustomerInfo
     payment_amount: Optional[Decimal] = None
     payment_currency: str = "USD"
+    recurrence: Optional[RecurrenceRuleIn] = None
+
+
+class BulkBookingItem(BaseModel):
+    room_id: str
+    start_time: datetime
+    duration_minutes: int = Field(gt=0)
+    attendee_count: Optional[int] = None
+    notes: Optional[str] = None
+    details: Dict[str, Any] = Field(default_factory=dict)
+    payment_amount: Optional[Decimal] = None
+    payment_currency: str = "USD"
+
+
+class BulkBookingSubmission(BaseModel):
+    venue_id: str
+    customer: CustomerInfo
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+    items: list[BulkBookingItem] = Field(min_length=1, max_length=200)
 
 
 class AvailabilityRequest(BaseModel):
@@ -34,6 +64,23 @@ class AvailabilityRequest(BaseModel):
     duration_minutes: int
     attendee_count: Optional[int] = None
     notes: Optional[str] = None
+    hold_room_id: Optional[str] = None
+
+
+class HoldRequest(BaseModel):
+    session_id: str
+    venue_id: str
+    room_id: str
+    start_time: datetime
+    duration_minutes: int = Field(gt=0)
+
+
+class HoldInfo(BaseModel):
+    hold_id: int
+    room_id: str
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
 
 
 class AvailabilityResponseRoom(BaseModel):
@@ -41,6 +88,7 @@ class AvailabilityResponseRoom(BaseModel):
     label: str
     capacity: int
     available: bool
+    verified: bool = True
     reasons: list[str] = Field(default_factory=list)
 
 
@@ -50,3 +98,6 @@ class AvailabilityResponse(BaseModel):
     start_time: datetime
     duration_minutes: int
     rooms: list[AvailabilityResponseRoom]
+    hold: Optional[HoldInfo] = None
+    # Some rooms could not be confirmed within the request deadline; see ``rooms[].verified``.
+    degraded: bool = False
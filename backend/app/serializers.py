@@ -0,0 +1,348 @@
+"""Response shapes built straight from column tuples, encoded to bytes once.
+
+Each shape pairs a column list (or statement) with a function that unpacks one row
+positionally into the response dict. No ORM objects are hydrated and no relationship
+loads run. Values are converted to JSON-native types here, so routes return
+:class:`FastJSONResponse` directly and FastAPI's ``jsonable_encoder`` pass is skipped.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, select, true
+
+from app.models import Booking, Customer, DoorAccessEvent, Payment, Room, Venue
+
+try:  # pragma: no cover - optional fast encoder
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    # orjson encodes datetimes and UUIDs itself; the stdlib fallback must match it.
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Encodes with orjson when it is installed; return it directly to bypass ``jsonable_encoder``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _first_payment():
+    return (
+        select(Payment.status, Payment.amount, Payment.currency, Payment.provider)
+        .where(Payment.booking_id == Booking.id)
+        .order_by(Payment.id)
+        .limit(1)
+        .lateral("first_payment")
+    )
+
+
+def booking_detail_stmt() -> Select:
+    """Columns for :func:`booking_detail` (``/booking/recent``, door-code regeneration)."""
+
+    payment = _first_payment()
+    return (
+        select(
+            Booking.id,
+            Booking.session_id,
+            Booking.status,
+            Customer.id,
+            Customer.name,
+            Customer.email,
+            Customer.phone_number,
+            Venue.id,
+            Venue.name,
+            Room.id,
+            Room.label,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.duration_minutes,
+            Booking.attendee_count,
+            Booking.notes,
+            Booking.details,
+            payment.c.status,
+            payment.c.amount,
+            payment.c.currency,
+            payment.c.provider,
+            DoorAccessEvent.door_code,
+            DoorAccessEvent.instructions,
+            DoorAccessEvent.expires_at,
+        )
+        .join(Venue, Venue.id == Booking.venue_id)
+        .outerjoin(Customer, Customer.id == Booking.customer_id)
+        .outerjoin(Room, Room.id == Booking.room_id)
+        .outerjoin(payment, true())
+        # uq_door_event_booking: at most one row per booking, so this cannot fan out.
+        .outerjoin(DoorAccessEvent, DoorAccessEvent.booking_id == Booking.id)
+    )
+
+
+def booking_detail(row: Sequence[Any]) -> Dict[str, Any]:
+    (
+        booking_id, session_id, status,
+        customer_id, customer_name, customer_email, customer_phone,
+        venue_id, venue_name, room_id, room_label,
+        start_time, end_time, duration_minutes, attendee_count, notes, details,
+        payment_status, payment_amount, payment_currency, payment_provider,
+        door_code, door_instructions, door_expires_at,
+    ) = row
+    return {
+        "id": booking_id,
+        "session_id": session_id,
+        "status": status.value.lower(),
+        "customer": {
+            "id": customer_id,
+            "name": customer_name,
+            "email": customer_email,
+            "phone_number": customer_phone,
+        },
+        "venue": {"id": venue_id, "name": venue_name},
+        "room": {"id": room_id, "label": room_label} if room_id is not None else None,
+        "start_time": _iso(start_time),
+        "end_time": _iso(end_time),
+        "duration_minutes": duration_minutes,
+        "attendee_count": attendee_count,
+        "notes": notes,
+        "details": details,
+        "payment": {
+            "status": payment_status.value.lower(),
+            "amount": str(payment_amount) if payment_amount is not None else None,
+            "currency": payment_currency,
+            "provider": payment_provider.value.lower(),
+        } if payment_status is not None else None,
+        "door_access": {
+            "code": door_code,
+            "instructions": door_instructions,
+            "expires_at": _iso(door_expires_at),
+        } if door_code is not None else None,
+    }
+
+
+def booking_summary_stmt() -> Select:
+    """Columns for :func:`booking_summary` (the ``/vapi/tools/bookings`` listing)."""
+
+    payment = _first_payment()
+    return (
+        select(
+            Booking.id,
+            Booking.session_id,
+            Booking.venue_id,
+            Booking.room_id,
+            Booking.status,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.attendee_count,
+            Booking.notes,
+            Booking.created_at,
+            Customer.name,
+            Customer.email,
+            Customer.phone_number,
+            payment.c.amount,
+            payment.c.currency,
+            payment.c.provider,
+            payment.c.status,
+        )
+        .outerjoin(Customer, Customer.id == Booking.customer_id)
+        .outerjoin(payment, true())
+    )
+
+
+def booking_summary(row: Sequence[Any]) -> Dict[str, Any]:
+    (
+        booking_id, session_id, venue_id, room_id, status,
+        start_time, end_time, attendee_count, notes, created_at,
+        customer_name, customer_email, customer_phone,
+        payment_amount, payment_currency, payment_provider, payment_status,
+    ) = row
+    return {
+        "id": booking_id,
+        "session_id": session_id,
+        "venue_id": venue_id,
+        "room_id": room_id,
+        "status": status.value,
+        "start_time": _iso(start_time),
+        "end_time": _iso(end_time),
+        "attendee_count": attendee_count,
+        "notes": notes,
+        "created_at": created_at.isoformat(),
+        "customer": {"name": customer_name, "email": customer_email, "phone_number": customer_phone},
+        "payment": {
+            "amount": float(payment_amount) if payment_amount is not None else None,
+            "currency": payment_currency,
+            "provider": payment_provider.value,
+            "status": payment_status.value,
+        } if payment_provider is not None else None,
+    }
+
+
+PAYMENT_COLUMNS = (
+    Payment.id,
+    Payment.session_id,
+    Payment.booking_id,
+    Payment.provider,
+    Payment.status,
+    Payment.amount,
+    Payment.currency,
+    Payment.extras,
+    Payment.sandbox_reference,
+    Payment.created_at,
+)
+
+
+def payment_shape(row: Sequence[Any]) -> Dict[str, Any]:
+    payment_id, session_id, booking_id, provider, status, amount, currency, extras, reference, created_at = row
+    extras = extras if isinstance(extras, dict) else {}
+    return {
+        "id": payment_id,
+        "session_id": session_id,
+        "booking_id": booking_id,
+        "provider": provider.value,
+        "status": status.value,
+        "amount": float(amount) if amount is not None else None,
+        "currency": currency,
+        "transaction_id": extras.get("transaction_id"),
+        "provider_hint": extras.get("provider"),
+        "reference": reference,
+        "failure_reason": extras.get("failure_reason"),
+        "created_at": _iso(created_at),
+    }
+
+
+def confirmation_shape(confirmation: Any) -> Dict[str, Any]:
+    """Full confirmation for the booking routes; same shape as :func:`booking_detail`."""
+
+    customer = confirmation.customer
+    payment = confirmation.payment
+    door_access = confirmation.door_access
+    room = confirmation.room
+    return {
+        "id": confirmation.id,
+        "session_id": confirmation.session_id,
+        "status": confirmation.status.value.lower(),
+        "customer": {
+            "id": customer.get("id"),
+            "name": customer.get("name"),
+            "email": customer.get("email"),
+            "phone_number": customer.get("phone_number"),
+        },
+        "venue": confirmation.venue,
+        "room": {"id": room["id"], "label": room["label"]} if room else None,
+        "start_time": _iso(confirmation.start_time),
+        "end_time": _iso(confirmation.end_time),
+        "duration_minutes": confirmation.duration_minutes,
+        "attendee_count": confirmation.attendee_count,
+        "notes": confirmation.notes,
+        "details": confirmation.details,
+        "payment": {
+            "status": payment["status"].value.lower(),
+            "amount": str(payment["amount"]) if payment["amount"] is not None else None,
+            "currency": payment["currency"],
+            "provider": payment["provider"].value.lower(),
+        } if payment else None,
+        "door_access": {
+            "code": door_access["code"],
+            "instructions": door_access["instructions"],
+            "expires_at": _iso(door_access["expires_at"]),
+        } if door_access else None,
+    }
+
+
+def tool_confirmation_shape(confirmation: Any) -> Dict[str, Any]:
+    """The compact confirmation the voice agent reads back."""
+
+    customer = confirmation.customer
+    payment = confirmation.payment
+    return {
+        "booking_id": confirmation.id,
+        "door_code": confirmation.door_access["code"] if confirmation.door_access else None,
+        "status": confirmation.status.value,
+        "customer": {
+            "name": customer.get("name"),
+            "email": customer.get("email"),
+            "phone_number": customer.get("phone_number"),
+        },
+        "payment": {
+            "amount": float(payment["amount"]) if payment["amount"] is not None else None,
+            "currency": payment["currency"],
+            "provider": payment["provider"].value,
+            "status": payment["status"].value,
+        } if payment else None,
+    }
+
+
+def venue_catalog_stmt() -> Select:
+    """One row per room (or one per venue without rooms), grouped by venue."""
+
+    return (
+        select(
+            Venue.id,
+            Venue.name,
+            Venue.address,
+            Venue.contact,
+            Venue.policies,
+            Room.id,
+            Room.label,
+            Room.capacity,
+            Room.amenities,
+            Room.availability,
+        )
+        .outerjoin(Room, Room.venue_id == Venue.id)
+        .order_by(Venue.name, Venue.id, Room.id)
+    )
+
+
+def venue_shapes(rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    venues: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for venue_id, name, address, contact, policies, room_id, label, capacity, amenities, availability in rows:
+        if current is None or current["id"] != venue_id:
+            current = {
+                "id": venue_id,
+                "name": name,
+                "address": address,
+                "contact": contact,
+                "policies": policies or {},
+                "rooms": [],
+            }
+            venues.append(current)
+        if room_id is not None:
+            current["rooms"].append(
+                {
+                    "id": room_id,
+                    "venue_id": venue_id,
+                    "label": label,
+                    "capacity": capacity,
+                    "amenities": amenities or [],
+                    "availability": availability or {},
+                }
+            )
+    return venues
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+from sqlalchemy import ColumnElement, event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.db.database import POOL_REALTIME, resolve_session_factory
+from app.db.queries import room_occupancy_stmt, venue_room_columns_stmt
+from app.models import BookingStatus
+from app.services.venue_catalog_service import get_venue_catalog_service
+from app.stores.availability_cache import (
+    AvailabilityCache,
+    DayKey,
+    DaySnapshot,
+    RoomOccupancy,
+    build_occupancy,
+    day_bounds,
+    days_spanned,
+    utc,
+)
+from app.utils.config import get_settings
+from app.utils.deadline import Deadline, current_deadline
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_CHANNEL = "booking_availability"
+_CHANGES_KEY = "availability_changes"
+# Lets the listener skip this process's own notifications; its cache was invalidated at commit.
+_ORIGIN = uuid.uuid4().hex
+# pg_notify payloads are capped at 8000 bytes.
+_MAX_PAYLOAD = 7000
+
+
+@dataclass(frozen=True)
+class _Change:
+    venue_id: str
+    room_id: str
+    days: Tuple[date, ...]
+    notified: bool
+
+
+def _payloads(changes: List[_Change]) -> List[str]:
+    payloads: List[str] = []
+    batch: List[Any] = []
+    size = 0
+    for change in changes:
+        item = [change.venue_id, change.room_id, [day.isoformat() for day in change.days]]
+        item_size = len(json.dumps(item))
+        if batch and size + item_size > _MAX_PAYLOAD:
+            payloads.append(json.dumps({"origin": _ORIGIN, "at": time.time(), "changes": batch}))
+            batch, size = [], 0
+        batch.append(item)
+        size += item_size
+    if batch:
+        payloads.append(json.dumps({"origin": _ORIGIN, "at": time.time(), "changes": batch}))
+    return payloads
+
+
+def availability_notify_expr(venue_id: str, room_id: str, start_time: datetime, end_time: datetime) -> ColumnElement[Any]:
+    """``pg_notify`` for one change, to embed in a statement the write already runs.
+
+    Pair it with ``mark_availability_changed(..., notified=True)``.
+    """
+
+    change = _Change(venue_id, room_id, tuple(days_spanned(start_time, end_time)), True)
+    return func.pg_notify(AVAILABILITY_CHANNEL, _payloads([change])[0])
+
+
+def mark_availability_changed(
+    session: AsyncSession,
+    venue_id: str,
+    room_id: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    notified: bool = False,
+) -> None:
+    """Invalidate ``room_id`` on the days ``[start_time, end_time)`` spans when ``session`` commits.
+
+    This process's cache is updated after the commit and other processes hear one
+    ``NOTIFY`` per commit, sent just before it, so neither ever sees a rolled-back write.
+    """
+
+    if room_id is None or start_time is None or end_time is None:
+        return
+    change = _Change(venue_id, room_id, tuple(days_spanned(start_time, end_time)), notified)
+    session.sync_session.info.setdefault(_CHANGES_KEY, []).append(change)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_availability_changes(session: Session) -> None:
+    pending = [change for change in session.info.get(_CHANGES_KEY, ()) if not change.notified]
+    if not pending:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    for payload in _payloads(pending):
+        connection.execute(select(func.pg_notify(AVAILABILITY_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_availability_commit(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        service = get_availability_service()
+        for change in changes:
+            service.invalidate(change.venue_id, change.room_id, change.days, "write")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_availability_changes(session: Session) -> None:
+    session.info.pop(_CHANGES_KEY, None)
+
+
+@dataclass(frozen=True)
+class RoomAvailability:
+    room_id: str
+    label: str
+    capacity: int
+    booked: bool
+    held: bool
+    verified: bool = True
+
+    @property
+    def free(self) -> bool:
+        return not (self.booked or self.held)
+
+
+@dataclass(frozen=True)
+class AvailabilityCheck:
+    rooms: List[RoomAvailability]
+    # Part of the answer came from stale or missing data because the deadline ran out.
+    degraded: bool = False
+
+
+class AvailabilityService:
+    """Answers availability checks from cached per-room occupancy of ``(venue, day)``.
+
+    A miss reads the venue's rooms and that day's blocking bookings once, shared by all
+    concurrent callers. Booking confirms, holds and releases mark only the affected
+    room and days stale, locally at commit and in other processes through ``LISTEN
+    booking_availability``; the next lookup re-reads just those rooms. A listener
+    reconnect or a venue catalog change clears the cache, and ``ttl_seconds`` bounds
+    staleness for writes that bypass both.
+
+    Under a request deadline a check answers with whatever it has when the budget runs
+    out: days still loading (or failed) fall back to the cached snapshot, and rooms it
+    cannot vouch for (marked stale, past the TTL or not cached) come back ``verified=False``.
+    """
+
+    # Kept back from the deadline to build and send the answer.
+    respond_margin = 0.1
+
+    def __init__(
+        self,
+        cache: AvailabilityCache | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        retry_interval: float = 5.0,
+    ) -> None:
+        self.cache = cache or AvailabilityCache()
+        self._session_factory = session_factory
+        self.retry_interval = retry_interval
+        self._flight: SingleFlight[DaySnapshot] = SingleFlight("availability_day")
+        self._task: asyncio.Task[None] | None = None
+        self._listening = asyncio.Event()
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        # The primary, not a replica: a caller must see the hold they placed a moment ago.
+        return resolve_session_factory(self._session_factory, POOL_REALTIME)
+
+    def invalidate(self, venue_id: str, room_id: str, days: Any, source: str) -> None:
+        touched = self.cache.invalidate(venue_id, room_id, days)
+        metrics.increment("availability_cache_invalidations_total", labels={"source": source})
+        if touched:
+            metrics.increment("availability_cache_days_invalidated_total", touched, labels={"source": source})
+
+    def clear(self, reason: str) -> None:
+        self.cache.clear()
+        metrics.increment("availability_cache_clears_total", labels={"reason": reason})
+
+    async def check(
+        self,
+        venue_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        session_id: Optional[str] = None,
+    ) -> AvailabilityCheck:
+        start_time, end_time = utc(start_time), utc(end_time)
+        days = days_spanned(start_time, end_time)
+        deadline = current_deadline()
+        if deadline is None:
+            fresh = await asyncio.gather(*(self.day(venue_id, day) for day in days))
+            snapshots: List[Tuple[Optional[DaySnapshot], bool]] = [(snapshot, True) for snapshot in fresh]
+        else:
+            snapshots = await self._days_within(venue_id, days, deadline)
+        start, end, now = start_time.timestamp(), end_time.timestamp(), time.time()
+        listed = next((snapshot for snapshot, _ in snapshots if snapshot is not None), None)
+        results: List[RoomAvailability] = []
+        for room in listed.rooms if listed is not None else ():
+            booked = held = False
+            verified = True
+            for snapshot, current in snapshots:
+                if snapshot is None:
+                    verified = False
+                    continue
+                verified = verified and current and room.room_id not in snapshot.stale
+                occupancy = next((other for other in snapshot.rooms if other.room_id == room.room_id), None)
+                if occupancy is not None:
+                    day_booked, day_held = occupancy.blockers(start, end, session_id, now)
+                    booked, held = booked or day_booked, held or day_held
+            results.append(RoomAvailability(room.room_id, room.label, room.capacity, booked, held, verified))
+        return AvailabilityCheck(results, degraded=listed is None or not all(room.verified for room in results))
+
+    async def _days_within(
+        self, venue_id: str, days: List[date], deadline: Deadline
+    ) -> List[Tuple[Optional[DaySnapshot], bool]]:
+        """``(snapshot, current)`` per day: loaded in time, else whatever the cache still holds.
+
+        ``current`` is false for entries past their TTL; their rooms cannot be vouched for.
+        """
+
+        waiters = [asyncio.ensure_future(self.day(venue_id, day)) for day in days]
+        try:
+            done, _ = await asyncio.wait(waiters, timeout=deadline.remaining(self.respond_margin))
+        finally:
+            # Only stops waiting: a shared load carries on and fills the cache for the next call.
+            for waiter in waiters:
+                waiter.cancel()
+        snapshots: List[Tuple[Optional[DaySnapshot], bool]] = []
+        for day, waiter in zip(days, waiters):
+            if waiter in done and waiter.exception() is None:
+                snapshots.append((waiter.result(), True))
+                continue
+            if waiter in done:
+                logger.warning(
+                    "availability_day_load_failed",
+                    extra={"venue_id": venue_id, "day": day.isoformat(), "error": str(waiter.exception())},
+                )
+            snapshot = self.cache.peek((venue_id, day))
+            # Within its TTL the entry is as good as a hit for every room not marked stale.
+            current = snapshot is not None and time.monotonic() - snapshot.loaded_at <= self.cache.ttl_seconds
+            if not current or snapshot.stale:
+                metrics.increment("availability_degraded_total", labels={"reason": "error" if waiter in done else "timeout"})
+            snapshots.append((snapshot, current))
+        return snapshots
+
+    async def day(self, venue_id: str, day: date) -> DaySnapshot:
+        key = (venue_id, day)
+        snapshot = self.cache.get(key)
+        if snapshot is not None and not snapshot.stale:
+            metrics.increment("availability_cache_total", labels={"result": "hit"})
+            metrics.observe("availability_cache_age_seconds", time.monotonic() - snapshot.loaded_at)
+            self._publish_ratio()
+            return snapshot
+        metrics.increment("availability_cache_total", labels={"result": "miss" if snapshot is None else "stale"})
+        self._publish_ratio()
+        return await self._flight.do(key, lambda: self._load(key))
+
+    async def _load(self, key: DayKey) -> DaySnapshot:
+        venue_id, day = key
+        token, previous = self.cache.begin_load(key)
+        start, end = day_bounds(day)
+        try:
+            async with self.session_factory() as session:
+                if previous is None:
+                    rooms = [tuple(row) for row in await session.execute(venue_room_columns_stmt(venue_id))]
+                else:
+                    rooms = [(room.room_id, room.label, room.capacity) for room in previous.rooms if room.room_id in previous.stale]
+                rows = (await session.execute(room_occupancy_stmt([room[0] for room in rooms], start, end))).all() if rooms else []
+        except BaseException:
+            self.cache.abandon(key, token)
+            raise
+
+        intervals: Dict[str, list] = {}
+        for row in rows:
+            hold_expires_at = row.hold_expires_at if row.status == BookingStatus.PENDING else None
+            intervals.setdefault(row.room_id, []).append((row.start_time, row.end_time, hold_expires_at, row.session_id))
+        fresh: List[RoomOccupancy] = [
+            build_occupancy(room_id, label, capacity, intervals.get(room_id, ())) for room_id, label, capacity in rooms
+        ]
+        snapshot = DaySnapshot(venue_id, day, tuple(fresh)) if previous is None else previous.with_rooms(fresh)
+        kind = "full" if previous is None else "rooms"
+        if not self.cache.install(snapshot, token):
+            # Invalidated mid-read: good enough for the callers already waiting, not for the cache.
+            metrics.increment("availability_cache_loads_discarded_total")
+        metrics.increment("availability_cache_loads_total", labels={"kind": kind})
+        metrics.set_gauge("availability_cache_entries", len(self.cache))
+        return snapshot
+
+    def _publish_ratio(self) -> None:
+        metrics.set_gauge("availability_cache_hit_ratio", self.cache.hit_ratio)
+
+    def _on_notification(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("availability_notification_invalid", extra={"payload": payload[:200]})
+            self.clear("invalid_notification")
+            return
+        if message.get("origin") == _ORIGIN:
+            return
+        # How long other processes served occupancy older than the commit.
+        metrics.observe("availability_cache_invalidation_delay_seconds", max(0.0, time.time() - message.get("at", time.time())))
+        for venue_id, room_id, days in message.get("changes", ()):
+            self.invalidate(venue_id, room_id, [date.fromisoformat(day) for day in days], "notify")
+
+    async def start(self, timeout: float = 5.0) -> None:
+        """Start the listener and wait up to ``timeout`` for its first ``LISTEN``.
+
+        Connecting clears the cache, so serving before that would throw away the first
+        loads; if the database is not reachable in time the app starts anyway.
+        """
+
+        if self._task is not None and not self._task.done():
+            return
+        self._flight.clear()
+        self._listening = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="availability-listener")
+        listening = asyncio.ensure_future(self._listening.wait())
+        try:
+            await asyncio.wait({self._task, listening}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            listening.cancel()
+        if not self._listening.is_set() and not self._task.done():
+            logger.warning("availability_listen_pending", extra={"timeout": timeout})
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        url = make_url(get_settings().database_url)
+        if url.get_backend_name() != "postgresql":
+            return
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception as exc:
+                logger.warning("availability_listen_failed", extra={"error": str(exc)})
+                await asyncio.sleep(self.retry_interval)
+                continue
+            try:
+                connection.add_termination_listener(lambda _connection: closed.set())
+                await connection.add_listener(
+                    AVAILABILITY_CHANNEL, lambda _connection, _pid, _channel, payload: self._on_notification(payload)
+                )
+                # Notifications sent while we were not listening are gone.
+                self.clear("listen")
+                self._listening.set()
+                await closed.wait()
+                logger.warning("availability_listener_disconnected")
+            finally:
+                await connection.close()
+            await asyncio.sleep(self.retry_interval)
+
+
+_availability_service: AvailabilityService | None = None
+
+
+def get_availability_service() -> AvailabilityService:
+    global _availability_service
+    if _availability_service is None:
+        settings = get_settings()
+        _availability_service = AvailabilityService(
+            AvailabilityCache(
+                max_entries=settings.availability_cache_size,
+                ttl_seconds=settings.availability_cache_ttl_seconds,
+            ),
+            retry_interval=settings.availability_listen_retry_seconds,
+        )
+        # Room additions, removals and capacity edits change the room list of every cached day.
+        get_venue_catalog_service().on_invalidate(lambda: _availability_service.clear("venue_catalog"))
+    return _availability_service
@@ -3,14 +3,52 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    CTE,
+    Column,
+    ColumnElement,
+    DateTime,
+    Insert,
+    Integer,
+    Row,
+    String,
+    Text,
+    Update,
+    cast,
+    column,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Booking, BookingStatus, Customer, Room, Venue
+from app.db.queries import (
+    active_hold_clause,
+    booking_overlap_clause,
+    conflicting_slots_stmt,
+    requested_slots,
+    room_lock_expr,
+)
+from app.models import Booking, BookingStatus, Customer, DoorAccessEvent, OutboxMessage, Payment, PaymentStatus, Room, Venue
+from app.serializers import booking_detail_stmt
+from app.services.availability_service import availability_notify_expr, mark_availability_changed
 from app.services.door_access_service import DoorAccessService, get_door_access_service
+from app.services.outbox import (
+    TOPIC_BOOKING_CONFIRMED,
+    booking_confirmed_payload,
+    get_outbox_dispatcher,
+    outbox_stmt,
+)
 from app.services.payment_service import PaymentService, get_payment_service
+from app.utils.config import get_settings
+from app.utils.contact import normalize_email, normalize_phone
 
 
 @dataclass
@@ -35,6 +73,82 @@ class BookingPayload:
     payment_currency: str
 
 
+class BookingConflictError(ValueError):
+    """Raised when the requested room is already booked for an overlapping interval."""
+
+
+@dataclass
+class BookingHold:
+    """A PENDING booking that reserves a room for one caller until ``expires_at``."""
+
+    id: int
+    session_id: str
+    venue_id: str
+    room_id: str
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
+
+
+@dataclass
+class BookingConfirmation:
+    """Outcome of :meth:`BookingService.confirm_booking`, assembled from RETURNING rows."""
+
+    id: int
+    session_id: Optional[str]
+    status: BookingStatus
+    venue: Dict[str, Any]
+    room: Optional[Dict[str, Any]]
+    customer: Dict[str, Any]
+    start_time: datetime
+    end_time: Optional[datetime]
+    duration_minutes: Optional[int]
+    attendee_count: Optional[int]
+    notes: Optional[str]
+    details: Dict[str, Any]
+    payment: Optional[Dict[str, Any]]
+    door_access: Optional[Dict[str, Any]]
+
+
+@dataclass
+class BulkBookingResult:
+    """Per-item outcome of :meth:`BookingService.confirm_bulk`.
+
+    ``status`` is ``confirmed``, ``conflict`` (overlaps an existing booking or another
+    item), ``invalid`` (room not in the venue) or ``skipped`` (all-or-nothing batch
+    rejected because of another item).
+    """
+
+    index: int
+    status: str
+    confirmation: Optional[BookingConfirmation] = None
+    reason: Optional[str] = None
+
+
+def _bind(column: Column[Any], value: Any) -> ColumnElement[Any]:
+    """Bound parameter carrying the column's type, so enums/JSONB are cast correctly."""
+
+    return literal(value, column.type)
+
+
+def _start_time(payload: BookingPayload) -> datetime:
+    """The requested start, defaulting to now; a naive value is taken as UTC."""
+
+    start_time = payload.start_time or datetime.now(timezone.utc)
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    return start_time
+
+
+def _end_time(payload: BookingPayload, start_time: datetime) -> Optional[datetime]:
+    end_time = payload.details.get("end_time")
+    if isinstance(end_time, str):
+        end_time = datetime.fromisoformat(end_time)
+    if not end_time and payload.duration_minutes:
+        end_time = start_time + timedelta(minutes=payload.duration_minutes)
+    return end_time
+
+
 class BookingService:
     """Coordinates persistence of bookings, payments, and door access."""
 
@@ -42,42 +156,105 @@ class BookingService:
         self,
         payment_service: PaymentService | None = None,
         door_access_service: DoorAccessService | None = None,
+        hold_ttl: timedelta | None = None,
     ) -> None:
         self.payment_service = payment_service or get_payment_service()
         self.door_access_service = door_access_service or get_door_access_service()
+        self.hold_ttl = hold_ttl or timedelta(seconds=get_settings().booking_hold_ttl_seconds)
 
-    async def _upsert_customer(self, session: AsyncSession, payload: CustomerPayload) -> Customer:
-        if payload.email:
-            stmt = select(Customer).where(Customer.email == payload.email)
-            existing = (await session.execute(stmt)).scalar_one_or_none()
-            if existing:
-                existing.name = payload.name or existing.name
-                existing.phone_number = payload.phone_number or existing.phone_number
-                if payload.attributes:
-                    existing.attributes.update(payload.attributes)
-                await session.flush()
-                return existing
-
-        customer = Customer(
-            name=payload.name,
-            email=payload.email,
-            phone_number=payload.phone_number,
-            attributes=payload.attributes,
-        )
-        session.add(customer)
-        await session.flush()
-        return customer
+    def _customer_upsert_stmt(self, payload: CustomerPayload) -> Insert:
+        """``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` keyed on normalised email, else phone.
 
-    async def _load_room_and_venue(self, session: AsyncSession, venue_id: str, room_id: Optional[str]) -> tuple[Venue, Optional[Room]]:
-        venue = await session.get(Venue, venue_id)
-        if not venue:
-            raise ValueError("Venue not found")
+        Attributes are merged with JSONB ``||`` and missing name/phone keep their stored
+        values. A phone number already owned by a different customer is not copied onto
+        the email-matched row, so the phone unique index never rejects the upsert.
+        """
+
+        email = normalize_email(payload.email)
+        phone = normalize_phone(payload.phone_number)
+        columns = Customer.__table__.c
+        returned = (Customer.id, Customer.name, Customer.email, Customer.phone_number)
+        values: Dict[str, Any] = {
+            "name": payload.name,
+            "email": email,
+            "phone_number": phone,
+            "attributes": payload.attributes or {},
+        }
+        if email is None and phone is None:
+            return pg_insert(Customer).values(**values).returning(*returned)
+
+        if email is not None:
+            conflict_target = [func.lower(Customer.email)]
+            if phone is not None:
+                values["phone_number"] = (
+                    select(_bind(columns.phone_number, phone))
+                    .where(
+                        ~exists().where(
+                            Customer.phone_number == phone,
+                            func.lower(Customer.email).is_distinct_from(email),
+                        )
+                    )
+                    .scalar_subquery()
+                )
+        else:
+            conflict_target = [Customer.phone_number]
+
+        stmt = pg_insert(Customer).values(**values)
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_target,
+            set_={
+                "name": func.coalesce(stmt.excluded.name, Customer.name),
+                "phone_number": func.coalesce(stmt.excluded.phone_number, Customer.phone_number),
+                "attributes": Customer.attributes.op("||")(stmt.excluded.attributes),
+                "updated_at": func.now(),
+            },
+        ).returning(*returned)
+
+    async def _lock_room_and_load_context(
+        self,
+        session: AsyncSession,
+        venue_id: str,
+        room_id: Optional[str],
+    ) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Validate venue/room and take the room's advisory lock in one round trip."""
 
-        room = None
         if room_id:
-            room = await session.get(Room, room_id)
-            if not room:
-                raise ValueError("Room not found")
+            stmt = (
+                select(
+                    Venue.id,
+                    Venue.name,
+                    Room.id.label("room_id"),
+                    Room.venue_id.label("room_venue_id"),
+                    Room.label,
+                    Room.capacity,
+                    Room.amenities,
+                    Room.availability,
+                    room_lock_expr(room_id).label("room_lock"),
+                )
+                .select_from(Venue)
+                .outerjoin(Room, Room.id == room_id)
+                .where(Venue.id == venue_id)
+            )
+        else:
+            stmt = select(Venue.id, Venue.name).where(Venue.id == venue_id)
+
+        row = (await session.execute(stmt)).mappings().first()
+        if row is None:
+            raise ValueError("Venue not found")
+        venue = {"id": row["id"], "name": row["name"]}
+        if not room_id:
+            return venue, None
+        # The join is on the room id alone, so a room of another venue still matches.
+        if row["room_id"] is None or row["room_venue_id"] != venue_id:
+            raise ValueError("Room not found")
+        room = {
+            "id": row["room_id"],
+            "venue_id": row["room_venue_id"],
+            "label": row["label"],
+            "capacity": row["capacity"],
+            "amenities": row["amenities"] or [],
+            "availability": row["availability"] or {},
+        }
         return venue, room
 
     async def confirm_booking(
@@ -85,75 +262,662 @@ class BookingService:
         session: AsyncSession,
         customer_payload: CustomerPayload,
         booking_payload: BookingPayload,
-    ) -> Booking:
-        customer = await self._upsert_customer(session, customer_payload)
-        venue, room = await self._load_room_and_venue(session, booking_payload.venue_id, booking_payload.room_id)
-
-        start_time = booking_payload.start_time
-        if start_time is None:
-            start_time = datetime.now(timezone.utc)
-        end_time = booking_payload.details.get("end_time")
-        if isinstance(end_time, str):
-            end_time = datetime.fromisoformat(end_time)
-        if not end_time and booking_payload.duration_minutes:
-            end_time = start_time + timedelta(minutes=booking_payload.duration_minutes)
-
-        booking = Booking(
+    ) -> BookingConfirmation:
+        """Confirm a booking; see :meth:`_confirm_booking`.
+
+        Runs again with a new door code if another process committed the same one first.
+        """
+
+        return await self.door_access_service.retry_on_code_conflict(
+            booking_payload.venue_id, lambda: self._confirm_booking(session, customer_payload, booking_payload)
+        )
+
+    async def _confirm_booking(
+        self,
+        session: AsyncSession,
+        customer_payload: CustomerPayload,
+        booking_payload: BookingPayload,
+    ) -> BookingConfirmation:
+        """Confirm a booking in one transaction of three statements plus commit.
+
+        1. validate venue/room and take a per-room advisory lock,
+        2. upsert the customer,
+        3. conflict-checked ``INSERT ... RETURNING`` of the booking with its payment, door
+           code and ``booking.confirmed`` outbox message chained through data-modifying CTEs.
+
+        The lock serialises concurrent confirms for the same room, so the ``NOT EXISTS``
+        overlap check in step 3 always sees the winner's committed row. When the session
+        holds exactly this room and interval, step 3 converts the hold in place instead
+        of inserting a new row. Raises :class:`BookingConflictError` when the interval is
+        already taken. The first confirm for a venue in this process also loads the
+        venue's active door codes, so the new code cannot collide with one in use.
+        """
+
+        start_time = _start_time(booking_payload)
+        end_time = _end_time(booking_payload, start_time)
+
+        door_code: Optional[str] = None
+        try:
+            venue, room = await self._lock_room_and_load_context(session, booking_payload.venue_id, booking_payload.room_id)
+            customer = (await session.execute(self._customer_upsert_stmt(customer_payload))).mappings().one()
+            await self.door_access_service.prepare(session, booking_payload.venue_id)
+
+            booking_columns = Booking.__table__.c
+            booking_values = select(
+                _bind(booking_columns.session_id, booking_payload.session_id),
+                _bind(booking_columns.customer_id, customer["id"]),
+                _bind(booking_columns.venue_id, booking_payload.venue_id),
+                _bind(booking_columns.room_id, booking_payload.room_id),
+                _bind(booking_columns.status, BookingStatus.CONFIRMED),
+                _bind(booking_columns.start_time, start_time),
+                _bind(booking_columns.end_time, end_time),
+                _bind(booking_columns.duration_minutes, booking_payload.duration_minutes),
+                _bind(booking_columns.attendee_count, booking_payload.attendee_count),
+                _bind(booking_columns.notes, booking_payload.notes),
+                _bind(booking_columns.details, booking_payload.details),
+            )
+            converted_hold = None
+            if booking_payload.room_id and end_time is not None:
+                booking_values = booking_values.where(
+                    ~exists().where(
+                        booking_overlap_clause(booking_payload.room_id, start_time, end_time, booking_payload.session_id)
+                    )
+                )
+                if booking_payload.session_id:
+                    converted_hold = self._convert_hold_stmt(booking_payload, customer["id"], start_time, end_time)
+                    booking_values = booking_values.where(~exists(select(converted_hold.c.id)))
+            inserted_booking = (
+                insert(Booking)
+                .from_select(
+                    [
+                        "session_id",
+                        "customer_id",
+                        "venue_id",
+                        "room_id",
+                        "status",
+                        "start_time",
+                        "end_time",
+                        "duration_minutes",
+                        "attendee_count",
+                        "notes",
+                        "details",
+                    ],
+                    booking_values,
+                )
+                .returning(Booking.id)
+                .cte("inserted_booking")
+            )
+            if converted_hold is not None:
+                new_booking = select(converted_hold.c.id).union_all(select(inserted_booking.c.id)).cte("new_booking")
+            else:
+                new_booking = inserted_booking
+
+            door_code, instructions, expires_at = self.door_access_service.plan_access(
+                start_time, end_time, venue_id=booking_payload.venue_id
+            )
+            door_columns = DoorAccessEvent.__table__.c
+            new_door = (
+                insert(DoorAccessEvent)
+                .from_select(
+                    ["booking_id", "venue_id", "door_code", "instructions", "expires_at", "context"],
+                    select(
+                        new_booking.c.id,
+                        _bind(door_columns.venue_id, booking_payload.venue_id),
+                        _bind(door_columns.door_code, door_code),
+                        _bind(door_columns.instructions, instructions),
+                        _bind(door_columns.expires_at, expires_at),
+                        _bind(door_columns.context, {"source": "demo"}),
+                    ),
+                )
+                .returning(DoorAccessEvent.booking_id)
+                .cte("new_door_access")
+            )
+            stmt = select(new_booking.c.id).join(new_door, new_door.c.booking_id == new_booking.c.id)
+            if booking_payload.room_id and end_time is not None:
+                # Riding on the row the confirm returns: sent only if the booking is written.
+                stmt = stmt.add_columns(
+                    availability_notify_expr(booking_payload.venue_id, booking_payload.room_id, start_time, end_time)
+                )
+
+            payment: Optional[Dict[str, Any]] = None
+            if booking_payload.payment_amount is not None:
+                payment = {
+                    "status": PaymentStatus.SUCCEEDED,
+                    "amount": Decimal(booking_payload.payment_amount),
+                    "currency": booking_payload.payment_currency,
+                    "provider": self.payment_service.provider,
+                }
+                payment_columns = Payment.__table__.c
+                new_payment = (
+                    insert(Payment)
+                    .from_select(
+                        ["booking_id", "provider", "status", "amount", "currency", "extras"],
+                        select(
+                            new_booking.c.id,
+                            _bind(payment_columns.provider, payment["provider"]),
+                            _bind(payment_columns.status, payment["status"]),
+                            _bind(payment_columns.amount, payment["amount"]),
+                            _bind(payment_columns.currency, payment["currency"]),
+                            _bind(payment_columns.extras, {"source": "seed"}),
+                        ),
+                    )
+                    .returning(Payment.booking_id)
+                    .cte("new_payment")
+                )
+                stmt = stmt.join(new_payment, new_payment.c.booking_id == new_booking.c.id)
+
+            outbox_columns = OutboxMessage.__table__.c
+            message = booking_confirmed_payload(
+                None,
+                booking_payload.session_id,
+                booking_payload.room_id,
+                start_time,
+                door_code,
+                expires_at,
+                venue_id=booking_payload.venue_id,
+            )
+            new_message = (
+                insert(OutboxMessage)
+                .from_select(
+                    ["topic", "payload"],
+                    select(
+                        _bind(outbox_columns.topic, TOPIC_BOOKING_CONFIRMED),
+                        _bind(outbox_columns.payload, message).op("||")(
+                            func.jsonb_build_object(_bind(outbox_columns.topic, "booking_id"), new_booking.c.id)
+                        ),
+                    ),
+                )
+                .cte("new_outbox_message")
+            )
+            stmt = stmt.add_cte(new_message)
+
+            booking_id = (await session.execute(stmt)).scalar_one_or_none()
+            if booking_id is None:
+                raise BookingConflictError("Room is already booked for the requested time")
+            mark_availability_changed(
+                session, booking_payload.venue_id, booking_payload.room_id, start_time, end_time, notified=True
+            )
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            if door_code is not None:
+                self.door_access_service.release_code(booking_payload.venue_id, door_code)
+            raise
+        get_outbox_dispatcher().notify()
+
+        return BookingConfirmation(
+            id=booking_id,
             session_id=booking_payload.session_id,
-            customer=customer,
+            status=BookingStatus.CONFIRMED,
             venue=venue,
             room=room,
-            status=BookingStatus.CONFIRMED,
+            customer=dict(customer),
             start_time=start_time,
             end_time=end_time,
             duration_minutes=booking_payload.duration_minutes,
             attendee_count=booking_payload.attendee_count,
             notes=booking_payload.notes,
             details=booking_payload.details,
+            payment=payment,
+            door_access={"code": door_code, "instructions": instructions, "expires_at": expires_at},
+        )
+
+    async def confirm_bulk(
+        self,
+        session: AsyncSession,
+        customer_payload: CustomerPayload,
+        booking_payloads: list[BookingPayload],
+        all_or_nothing: bool = True,
+    ) -> list[BulkBookingResult]:
+        """Confirm many bookings for one customer and venue in a single transaction.
+
+        Independent of batch size this costs at most nine statements: lock and load every
+        requested room (in room-id order, so concurrent batches cannot deadlock), one
+        set-based overlap check of all items against existing bookings, the customer
+        upsert, one update converting the session's holds on exactly the requested slots
+        (as :meth:`confirm_booking` does), one multi-row insert each for the remaining
+        bookings, door codes, payments and outbox messages, and the availability
+        ``NOTIFY`` sent at commit.
+        Items that overlap each other are detected in memory. In ``all_or_nothing`` mode any
+        failed item rejects the whole batch and nothing is written.
+        """
+
+        if not booking_payloads:
+            return []
+        venue_id = booking_payloads[0].venue_id
+        session_id = booking_payloads[0].session_id
+        results: list[Optional[BulkBookingResult]] = [None] * len(booking_payloads)
+        intervals: list[tuple[datetime, Optional[datetime]]] = []
+        for payload in booking_payloads:
+            start_time = _start_time(payload)
+            intervals.append((start_time, _end_time(payload, start_time)))
+
+        planned_codes: list[str] = []
+        try:
+            room_ids = sorted({payload.room_id for payload in booking_payloads if payload.room_id})
+            rows = (
+                await session.execute(
+                    select(
+                        Venue.id.label("venue_id"),
+                        Venue.name.label("venue_name"),
+                        Room.id,
+                        Room.label,
+                        Room.capacity,
+                        Room.amenities,
+                        Room.availability,
+                        room_lock_expr(Room.id).label("room_lock"),
+                    )
+                    .join(Room, Room.venue_id == Venue.id)
+                    .where(Venue.id == venue_id, Room.id.in_(room_ids))
+                    .order_by(Room.id)
+                )
+            ).mappings().all()
+            if not rows:
+                venue_row = (await session.execute(select(Venue.id, Venue.name).where(Venue.id == venue_id))).first()
+                if venue_row is None:
+                    raise ValueError("Venue not found")
+                venue = {"id": venue_row.id, "name": venue_row.name}
+            else:
+                venue = {"id": rows[0]["venue_id"], "name": rows[0]["venue_name"]}
+            rooms = {
+                row["id"]: {
+                    "id": row["id"],
+                    "venue_id": venue["id"],
+                    "label": row["label"],
+                    "capacity": row["capacity"],
+                    "amenities": row["amenities"] or [],
+                    "availability": row["availability"] or {},
+                }
+                for row in rows
+            }
+
+            candidates: list[int] = []
+            for index, payload in enumerate(booking_payloads):
+                if payload.room_id not in rooms:
+                    results[index] = BulkBookingResult(index, "invalid", reason="Room not found")
+                elif intervals[index][1] is None:
+                    results[index] = BulkBookingResult(index, "invalid", reason="duration_minutes is required")
+                else:
+                    candidates.append(index)
+
+            # Items overlapping an earlier item in the same batch lose to it.
+            accepted_by_room: dict[str, list[tuple[datetime, datetime]]] = {}
+            for index in sorted(candidates, key=lambda i: (booking_payloads[i].room_id, intervals[i][0])):
+                start_time, end_time = intervals[index]
+                taken = accepted_by_room.setdefault(booking_payloads[index].room_id, [])
+                if taken and taken[-1][1] > start_time:
+                    results[index] = BulkBookingResult(index, "conflict", reason="Overlaps another item in this request")
+                else:
+                    taken.append((start_time, end_time))
+
+            candidates = [index for index in candidates if results[index] is None]
+            if candidates:
+                requested = requested_slots(
+                    [(index, booking_payloads[index].room_id, *intervals[index]) for index in candidates]
+                )
+                conflict_stmt = conflicting_slots_stmt(requested, session_id)
+                for index in (await session.execute(conflict_stmt)).scalars():
+                    results[index] = BulkBookingResult(
+                        index, "conflict", reason="Room is already booked for the requested time"
+                    )
+
+            accepted = [index for index in candidates if results[index] is None]
+            if all_or_nothing and len(accepted) < len(booking_payloads):
+                await session.rollback()
+                return [
+                    result or BulkBookingResult(index, "skipped", reason="Batch rejected: another item failed")
+                    for index, result in enumerate(results)
+                ]
+            if not accepted:
+                await session.rollback()
+                return [result for result in results if result is not None]
+
+            customer = (await session.execute(self._customer_upsert_stmt(customer_payload))).mappings().one()
+            await self.door_access_service.prepare(session, venue_id)
+            booking_ids: dict[int, int] = {}
+            if session_id:
+                converted = await session.execute(
+                    self._convert_holds_stmt(session_id, venue_id, customer["id"], booking_payloads, intervals, accepted)
+                )
+                booking_ids.update({row.idx: row.id for row in converted})
+            to_insert = [index for index in accepted if index not in booking_ids]
+            if to_insert:
+                inserted = (
+                    await session.execute(
+                        insert(Booking)
+                        .values(
+                            [
+                                {
+                                    "session_id": booking_payloads[index].session_id,
+                                    "customer_id": customer["id"],
+                                    "venue_id": venue_id,
+                                    "room_id": booking_payloads[index].room_id,
+                                    "status": BookingStatus.CONFIRMED,
+                                    "start_time": intervals[index][0],
+                                    "end_time": intervals[index][1],
+                                    "duration_minutes": booking_payloads[index].duration_minutes,
+                                    "attendee_count": booking_payloads[index].attendee_count,
+                                    "notes": booking_payloads[index].notes,
+                                    "details": booking_payloads[index].details,
+                                }
+                                for index in to_insert
+                            ]
+                        )
+                        .returning(Booking.id, Booking.room_id, Booking.start_time)
+                    )
+                ).all()
+                # Accepted items never share (room, start), so that pair identifies each new row.
+                inserted_ids = {(row.room_id, row.start_time): row.id for row in inserted}
+                for index in to_insert:
+                    booking_ids[index] = inserted_ids[(booking_payloads[index].room_id, intervals[index][0])]
+
+            door_rows: list[Dict[str, Any]] = []
+            payment_rows: list[Dict[str, Any]] = []
+            for index in accepted:
+                payload = booking_payloads[index]
+                start_time, end_time = intervals[index]
+                booking_id = booking_ids[index]
+                door_code, instructions, expires_at = self.door_access_service.plan_access(
+                    start_time, end_time, venue_id=venue_id
+                )
+                planned_codes.append(door_code)
+                door_access = {"code": door_code, "instructions": instructions, "expires_at": expires_at}
+                door_rows.append(
+                    {
+                        "booking_id": booking_id,
+                        "venue_id": venue_id,
+                        "door_code": door_code,
+                        "instructions": instructions,
+                        "expires_at": expires_at,
+                        "context": {"source": "bulk"},
+                    }
+                )
+                payment: Optional[Dict[str, Any]] = None
+                if payload.payment_amount is not None:
+                    payment = {
+                        "status": PaymentStatus.SUCCEEDED,
+                        "amount": Decimal(payload.payment_amount),
+                        "currency": payload.payment_currency,
+                        "provider": self.payment_service.provider,
+                    }
+                    payment_rows.append({"booking_id": booking_id, **payment, "extras": {"source": "bulk"}})
+                results[index] = BulkBookingResult(
+                    index,
+                    "confirmed",
+                    confirmation=BookingConfirmation(
+                        id=booking_id,
+                        session_id=payload.session_id,
+                        status=BookingStatus.CONFIRMED,
+                        venue=venue,
+                        room=rooms[payload.room_id],
+                        customer=dict(customer),
+                        start_time=start_time,
+                        end_time=end_time,
+                        duration_minutes=payload.duration_minutes,
+                        attendee_count=payload.attendee_count,
+                        notes=payload.notes,
+                        details=payload.details,
+                        payment=payment,
+                        door_access=door_access,
+                    ),
+                )
+
+            await self.door_access_service.insert_access_rows(session, venue_id, door_rows)
+            # Codes another process took meanwhile were replaced in door_rows.
+            planned_codes = [row["door_code"] for row in door_rows]
+            for index, row in zip(accepted, door_rows):
+                confirmation = results[index].confirmation
+                if confirmation is not None and confirmation.door_access is not None:
+                    confirmation.door_access["code"] = row["door_code"]
+            if payment_rows:
+                await session.execute(insert(Payment).values(payment_rows))
+            await session.execute(
+                outbox_stmt(
+                    TOPIC_BOOKING_CONFIRMED,
+                    [
+                        booking_confirmed_payload(
+                            row["booking_id"],
+                            session_id,
+                            booking_payloads[index].room_id,
+                            intervals[index][0],
+                            row["door_code"],
+                            row["expires_at"],
+                            venue_id=venue_id,
+                        )
+                        for index, row in zip(accepted, door_rows)
+                    ],
+                )
+            )
+            for index in accepted:
+                mark_availability_changed(session, venue_id, booking_payloads[index].room_id, *intervals[index])
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            for door_code in planned_codes:
+                self.door_access_service.release_code(venue_id, door_code)
+            raise
+        get_outbox_dispatcher().notify()
+
+        return [result for result in results if result is not None]
+
+    def _convert_hold_stmt(
+        self,
+        booking_payload: BookingPayload,
+        customer_id: int,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> CTE:
+        """CTE promoting the session's live hold on the exact room/interval to CONFIRMED."""
+
+        return (
+            update(Booking)
+            .where(
+                Booking.session_id == booking_payload.session_id,
+                Booking.room_id == booking_payload.room_id,
+                Booking.start_time == start_time,
+                Booking.end_time == end_time,
+                active_hold_clause(),
+            )
+            .values(
+                status=BookingStatus.CONFIRMED,
+                hold_expires_at=None,
+                customer_id=customer_id,
+                venue_id=booking_payload.venue_id,
+                duration_minutes=booking_payload.duration_minutes,
+                attendee_count=booking_payload.attendee_count,
+                notes=booking_payload.notes,
+                details=booking_payload.details,
+            )
+            .returning(Booking.id)
+            .cte("converted_hold")
         )
-        session.add(booking)
-        await session.flush()
-
-        if booking_payload.payment_amount is not None:
-            amount = Decimal(booking_payload.payment_amount)
-            await self.payment_service.record_payment(
-                session=session,
-                booking=booking,
-                amount=amount,
-                currency=booking_payload.payment_currency,
-                metadata={"source": "seed"},
-            )
-
-        await session.refresh(
-            booking,
-            attribute_names=["payments", "door_access_events", "customer", "room", "venue"],
+
+    def _convert_holds_stmt(
+        self,
+        session_id: str,
+        venue_id: str,
+        customer_id: int,
+        booking_payloads: Sequence[BookingPayload],
+        intervals: Sequence[tuple[datetime, Optional[datetime]]],
+        accepted: Sequence[int],
+    ) -> Update:
+        """Bulk form of :meth:`_convert_hold_stmt`: promote the session's live holds on the
+        exact room/interval of any accepted item, returning ``(idx, id)`` per converted item.
+        """
+
+        held = values(
+            column("idx", Integer),
+            column("room_id", String),
+            column("start_time", DateTime(timezone=True)),
+            column("end_time", DateTime(timezone=True)),
+            column("duration_minutes", Integer),
+            column("attendee_count", Integer),
+            column("notes", Text),
+            column("details", Booking.__table__.c.details.type),
+            name="held",
+        ).data(
+            [
+                (
+                    index,
+                    booking_payloads[index].room_id,
+                    *intervals[index],
+                    booking_payloads[index].duration_minutes,
+                    booking_payloads[index].attendee_count,
+                    booking_payloads[index].notes,
+                    booking_payloads[index].details,
+                )
+                for index in accepted
+            ]
+        )
+        return (
+            update(Booking)
+            .where(
+                Booking.session_id == session_id,
+                Booking.room_id == held.c.room_id,
+                Booking.start_time == held.c.start_time,
+                Booking.end_time == held.c.end_time,
+                active_hold_clause(),
+            )
+            .values(
+                status=BookingStatus.CONFIRMED,
+                hold_expires_at=None,
+                customer_id=customer_id,
+                venue_id=venue_id,
+                # A column that is NULL in every row would be inferred as text, so cast back.
+                duration_minutes=cast(held.c.duration_minutes, Integer),
+                attendee_count=cast(held.c.attendee_count, Integer),
+                notes=held.c.notes,
+                details=cast(held.c.details, Booking.__table__.c.details.type),
+            )
+            .returning(held.c.idx, Booking.id)
         )
-        await session.flush()
-        await self.door_access_service.issue_access(session=session, booking=booking)
 
-        await session.commit()
-        await session.refresh(
-            booking,
-            attribute_names=["payments", "door_access_events", "customer", "room", "venue"],
+    async def place_hold(
+        self,
+        session: AsyncSession,
+        session_id: str,
+        venue_id: str,
+        room_id: str,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> BookingHold:
+        """Reserve ``room_id`` for ``session_id`` until the hold TTL elapses.
+
+        Re-placing the same hold extends it. Runs under the same per-room advisory lock as
+        :meth:`confirm_booking`, and the lock is released at commit, so no row lock is kept
+        while the caller is still on the phone. Raises :class:`BookingConflictError` when
+        another booking or live hold overlaps.
+        """
+
+        expires_at = func.now() + literal(self.hold_ttl)
+        returned = (Booking.id, Booking.hold_expires_at)
+        try:
+            await self._lock_room_and_load_context(session, venue_id, room_id)
+
+            refreshed = (
+                update(Booking)
+                .where(
+                    Booking.session_id == session_id,
+                    Booking.room_id == room_id,
+                    Booking.start_time == start_time,
+                    Booking.end_time == end_time,
+                    active_hold_clause(),
+                )
+                .values(hold_expires_at=expires_at)
+                .returning(*returned)
+                .cte("refreshed_hold")
+            )
+            booking_columns = Booking.__table__.c
+            hold_values = select(
+                _bind(booking_columns.session_id, session_id),
+                _bind(booking_columns.venue_id, venue_id),
+                _bind(booking_columns.room_id, room_id),
+                _bind(booking_columns.status, BookingStatus.PENDING),
+                _bind(booking_columns.start_time, start_time),
+                _bind(booking_columns.end_time, end_time),
+                _bind(booking_columns.duration_minutes, int((end_time - start_time).total_seconds() // 60)),
+                _bind(booking_columns.details, {"source": "hold"}),
+                expires_at,
+            ).where(
+                ~exists(select(refreshed.c.id)),
+                ~exists().where(booking_overlap_clause(room_id, start_time, end_time, session_id)),
+            )
+            inserted = (
+                insert(Booking)
+                .from_select(
+                    [
+                        "session_id",
+                        "venue_id",
+                        "room_id",
+                        "status",
+                        "start_time",
+                        "end_time",
+                        "duration_minutes",
+                        "details",
+                        "hold_expires_at",
+                    ],
+                    hold_values,
+                )
+                .returning(*returned)
+                .cte("inserted_hold")
+            )
+            row = (await session.execute(select(refreshed).union_all(select(inserted)))).first()
+            if row is None:
+                raise BookingConflictError("Room is already booked or held for the requested time")
+            mark_availability_changed(session, venue_id, room_id, start_time, end_time)
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+
+        return BookingHold(
+            id=row.id,
+            session_id=session_id,
+            venue_id=venue_id,
+            room_id=room_id,
+            start_time=start_time,
+            end_time=end_time,
+            expires_at=row.hold_expires_at,
+        )
+
+    async def release_hold(self, session: AsyncSession, session_id: str, hold_id: int) -> bool:
+        """Cancel a live hold owned by ``session_id``. Returns ``False`` if there was none."""
+
+        stmt = (
+            update(Booking)
+            .where(Booking.id == hold_id, Booking.session_id == session_id, Booking.status == BookingStatus.PENDING)
+            .values(status=BookingStatus.CANCELLED, hold_expires_at=None)
+            .returning(Booking.venue_id, Booking.room_id, Booking.start_time, Booking.end_time)
         )
-        return booking
+        released = (await session.execute(stmt)).first()
+        if released is not None:
+            mark_availability_changed(session, *released)
+        await session.commit()
+        return released is not None
 
     async def regenerate_door_code(self, session: AsyncSession, booking_id: int) -> Booking:
+        async def regenerate() -> Booking:
+            booking = await session.get(Booking, booking_id)
+            if not booking:
+                raise ValueError("Booking not found")
+            try:
+                await self.door_access_service.issue_access(session=session, booking=booking)
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+            return booking
+
         booking = await session.get(Booking, booking_id)
         if not booking:
             raise ValueError("Booking not found")
-        await self.door_access_service.issue_access(session=session, booking=booking)
-        await session.commit()
-        await session.refresh(
-            booking,
-            attribute_names=["door_access_events", "customer", "room", "venue"],
-        )
-        return booking
+        return await self.door_access_service.retry_on_code_conflict(booking.venue_id, regenerate)
+
+    async def list_bookings(self, session: AsyncSession, limit: int = 25) -> Sequence[Row[Any]]:
+        """Rows shaped for :func:`app.serializers.booking_detail`, latest start first."""
 
-    async def list_bookings(self, session: AsyncSession, limit: int = 25) -> list[Booking]:
-        stmt = select(Booking).order_by(Booking.start_time.desc()).limit(limit)
-        result = await session.execute(stmt)
-        return result.scalars().unique().all()
+        stmt = booking_detail_stmt().order_by(Booking.start_time.desc(), Booking.id.desc()).limit(limit)
+        return (await session.execute(stmt)).all()
 
 
 def get_booking_service() -> BookingService:
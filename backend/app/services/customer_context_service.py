@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_session_factory, read_pool_name
+from app.models import Booking, Customer, Room
+from app.stores.customer_context import CustomerContext, CustomerContextCache
+from app.utils.background import task_supervisor
+from app.utils.config import get_settings
+from app.utils.contact import normalize_phone
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+RECENT_BOOKINGS = 5
+HISTORY_WINDOW = 20
+PREFERRED_ROOMS = 3
+
+
+def caller_phone_from_webhook(payload: Dict[str, Any]) -> Optional[str]:
+    """Pull the caller's number from the shapes Vapi uses for call events."""
+
+    call = payload.get("call") or {}
+    customer = payload.get("customer") or call.get("customer") or {}
+    return normalize_phone(
+        payload.get("phone_number")
+        or payload.get("phoneNumber")
+        or customer.get("number")
+        or customer.get("phoneNumber")
+    )
+
+
+class CustomerContextService:
+    """Prefetches returning-caller context while the phone is still ringing."""
+
+    def __init__(self, cache: CustomerContextCache) -> None:
+        self.cache = cache
+        # Spawned under the supervisor so shutdown drains prefetches instead of dropping them.
+        self._flight: SingleFlight[CustomerContext] = SingleFlight("customer_context", spawn=task_supervisor.spawn)
+
+    async def load(self, session: AsyncSession, phone_number: str) -> CustomerContext:
+        customer = (
+            await session.execute(select(Customer).where(Customer.phone_number == phone_number))
+        ).scalar_one_or_none()
+        if customer is None:
+            return CustomerContext(phone_number=phone_number)
+
+        rows = (
+            await session.execute(
+                select(
+                    Booking.id,
+                    Booking.room_id,
+                    Room.label,
+                    Booking.status,
+                    Booking.start_time,
+                    Booking.attendee_count,
+                )
+                .outerjoin(Room, Room.id == Booking.room_id)
+                .where(Booking.customer_id == customer.id)
+                .order_by(Booking.start_time.desc())
+                .limit(HISTORY_WINDOW)
+            )
+        ).all()
+        room_counts = Counter(row.room_id for row in rows if row.room_id)
+        return CustomerContext(
+            phone_number=phone_number,
+            customer={
+                "id": customer.id,
+                "name": customer.name,
+                "email": customer.email,
+                "phone_number": customer.phone_number,
+                "attributes": customer.attributes or {},
+            },
+            recent_bookings=[
+                {
+                    "booking_id": row.id,
+                    "room_id": row.room_id,
+                    "room_label": row.label,
+                    "status": row.status.value,
+                    "start_time": row.start_time.isoformat() if row.start_time else None,
+                    "attendee_count": row.attendee_count,
+                }
+                for row in rows[:RECENT_BOOKINGS]
+            ],
+            preferred_rooms=[room_id for room_id, _ in room_counts.most_common(PREFERRED_ROOMS)],
+        )
+
+    async def _load_and_cache(self, phone_number: str) -> CustomerContext:
+        async with get_session_factory(read_pool_name())() as session:
+            context = await self.load(session, phone_number)
+        self.cache.put(context)
+        metrics.increment("customer_context_loads_total", labels={"known": str(context.known).lower()})
+        return context
+
+    def warm(self, session_id: str, phone_number: str) -> None:
+        """Bind the session to the caller and load their context in the background."""
+
+        self.cache.bind_session(session_id, phone_number)
+        if self.cache.get(phone_number) is None:
+            self._flight.start(phone_number, lambda: self._load_and_cache(phone_number))
+
+    async def resolve(self, session_id: str, phone_number: Optional[str] = None) -> Optional[CustomerContext]:
+        """Context for the caller on ``session_id``, joining the ringing prefetch if it is still running.
+
+        Loads it when nothing is cached or in flight; ``None`` if the caller's number is unknown.
+        """
+
+        phone_number = normalize_phone(phone_number) if phone_number else self.cache.phone_for_session(session_id)
+        if not phone_number:
+            return None
+        self.cache.bind_session(session_id, phone_number)
+        context = self.cache.get(phone_number)
+        if context is not None:
+            return context
+        try:
+            return await self._flight.do(phone_number, lambda: self._load_and_cache(phone_number))
+        except Exception as exc:
+            # Personalisation is optional; the tool call must still succeed without it.
+            logger.warning("customer_context_load_failed", extra={"session_id": session_id, "error": str(exc)})
+            return None
+
+    def lookup(self, session_id: str) -> Optional[CustomerContext]:
+        """Context for the caller on ``session_id`` if it is already cached; never hits the DB."""
+
+        context = self.cache.for_session(session_id)
+        metrics.increment("customer_context_cache_total", labels={"result": "hit" if context else "miss"})
+        return context
+
+    def invalidate_session(self, session_id: str) -> None:
+        phone_number = self.cache.phone_for_session(session_id)
+        if phone_number:
+            self.cache.invalidate(phone_number)
+
+
+_customer_context_service: CustomerContextService | None = None
+
+
+def get_customer_context_service() -> CustomerContextService:
+    global _customer_context_service
+    if _customer_context_service is None:
+        settings = get_settings()
+        _customer_context_service = CustomerContextService(
+            CustomerContextCache(
+                max_entries=settings.customer_context_cache_size,
+                ttl_seconds=settings.customer_context_ttl_seconds,
+            )
+        )
+    return _customer_context_service
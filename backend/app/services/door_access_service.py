@@ -1,24 +1,119 @@
 from __future__ import annotations
 
+import logging
 import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
 
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Booking, DoorAccessEvent
+from app.services.door_code_allocator import DoorCodeAllocator, get_door_code_allocator, is_door_code_conflict
+from app.services.keypad_service import KeypadService, get_keypad_service
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Another process taking the same code twice in a row is already very unlikely.
+DOOR_CODE_ATTEMPTS = 3
 
 
 class DoorAccessService:
     """Generates and persists mock door codes for bookings."""
 
-    def __init__(self, code_length: int = 4, expiry_offset: timedelta = timedelta(hours=2)) -> None:
+    def __init__(
+        self,
+        code_length: int = 4,
+        expiry_offset: timedelta = timedelta(hours=2),
+        allocator: DoorCodeAllocator | None = None,
+        keypad: KeypadService | None = None,
+    ) -> None:
         self.code_length = code_length
         self.expiry_offset = expiry_offset
+        self.allocator = allocator or get_door_code_allocator()
+        self.keypad = keypad or get_keypad_service()
 
     def _generate_code(self) -> str:
         return "".join(secrets.choice("0123456789") for _ in range(self.code_length))
 
+    async def prepare(self, session: AsyncSession, venue_id: str) -> None:
+        """Load the venue's active codes into the allocator (one query, first use only)."""
+
+        if not self.allocator.is_loaded(venue_id):
+            await self.allocator.load(session, venue_id)
+
+    def plan_access(
+        self,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        instructions: Optional[str] = None,
+        venue_id: Optional[str] = None,
+    ) -> tuple[str, str, datetime]:
+        """Return ``(code, instructions, expires_at)`` for a booking window without touching the DB.
+
+        With a prepared ``venue_id`` the code is unique among the venue's active codes;
+        otherwise it is random.
+        """
+
+        expires_at = (end_time or start_time or datetime.now(timezone.utc)) + self.expiry_offset
+        code = self.allocator.allocate(venue_id, expires_at) if venue_id else None
+        return (
+            code or self._generate_code(),
+            instructions or "Use the provided code at the main entrance keypad.",
+            expires_at,
+        )
+
+    def release_code(self, venue_id: str, code: str) -> None:
+        """Return a planned code that was never committed (or was replaced) to the pool."""
+
+        self.allocator.release(venue_id, code)
+
+    def _code_conflict(self, venue_id: str, exc: IntegrityError, attempt: int) -> None:
+        """Reload the venue after a code collision; re-raise anything else, or once attempts run out."""
+
+        if not is_door_code_conflict(exc):
+            raise exc
+        metrics.increment("door_code_conflicts_total")
+        logger.info("door_code_conflict", extra={"venue_id": venue_id, "attempt": attempt + 1})
+        self.allocator.forget(venue_id)
+        if attempt + 1 >= DOOR_CODE_ATTEMPTS:
+            raise exc
+
+    async def insert_access_rows(self, session: AsyncSession, venue_id: str, rows: List[Dict[str, Any]]) -> None:
+        """Insert planned ``door_access_events`` rows in a savepoint.
+
+        If another process committed one of the codes first, the venue is reloaded and
+        every row gets a fresh code (``rows`` is updated in place) before trying again.
+        """
+
+        for attempt in range(DOOR_CODE_ATTEMPTS):
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert(DoorAccessEvent).values(rows))
+                return
+            except IntegrityError as exc:
+                self._code_conflict(venue_id, exc, attempt)
+            await self.prepare(session, venue_id)
+            for row in rows:
+                row["door_code"] = self.allocator.allocate(venue_id, row["expires_at"]) or self._generate_code()
+
+    async def retry_on_code_conflict(self, venue_id: str, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run a whole write again when its door code collided with another process's.
+
+        ``operation`` must roll its session back when it fails.
+        """
+
+        for attempt in range(DOOR_CODE_ATTEMPTS):
+            try:
+                return await operation()
+            except IntegrityError as exc:
+                self._code_conflict(venue_id, exc, attempt)
+        raise AssertionError("unreachable")
+
     async def issue_access(
         self,
         session: AsyncSession,
@@ -28,19 +123,27 @@ class DoorAccessService:
         # Reuse existing event if present
         existing = booking.door_access_events[0] if booking.door_access_events else None
 
-        door_code = self._generate_code()
-        expires_at = (booking.end_time or booking.start_time or datetime.now(timezone.utc)) + self.expiry_offset
-        instructions = instructions or "Use the provided code at the main entrance keypad."
+        await self.prepare(session, booking.venue_id)
+        door_code, instructions, expires_at = self.plan_access(
+            booking.start_time, booking.end_time, instructions, venue_id=booking.venue_id
+        )
 
         if existing:
+            self.release_code(booking.venue_id, existing.door_code)
+            # Both take effect in every process only once the caller commits.
+            self.keypad.stage(session, "deactivate", booking.venue_id, existing.door_code, booking.id)
             existing.door_code = door_code
             existing.instructions = instructions
             existing.expires_at = expires_at
             await session.flush()
+            self.keypad.stage(
+                session, "activate", booking.venue_id, door_code, booking.id, booking.room_id, booking.start_time, expires_at
+            )
             return existing
 
         event = DoorAccessEvent(
             booking=booking,
+            venue_id=booking.venue_id,
             door_code=door_code,
             instructions=instructions,
             expires_at=expires_at,
@@ -48,8 +151,37 @@ class DoorAccessService:
         )
         session.add(event)
         await session.flush()
+        self.keypad.stage(
+            session, "activate", booking.venue_id, door_code, booking.id, booking.room_id, booking.start_time, expires_at
+        )
         return event
 
+    async def push_to_lock(self, booking: Dict[str, Any]) -> None:
+        """Deliver a confirmed booking's code to the smart lock (mock: the keypad index).
+
+        Called from the outbox dispatcher, so it may run more than once per booking and
+        must stay idempotent when a real lock integration replaces it.
+        """
+
+        if booking.get("venue_id") and booking.get("door_code") and booking.get("expires_at"):
+            await self.keypad.publish(
+                [
+                    {
+                        "action": "activate",
+                        "venue_id": booking["venue_id"],
+                        "code": booking["door_code"],
+                        "booking_id": booking.get("booking_id"),
+                        "room_id": booking.get("room_id"),
+                        "start_time": booking.get("start_time"),
+                        "expires_at": booking["expires_at"],
+                    }
+                ]
+            )
+        logger.info(
+            "door_code_pushed",
+            extra={"booking_id": booking.get("booking_id"), "room_id": booking.get("room_id")},
+        )
+
 
 def get_door_access_service() -> DoorAccessService:
     return DoorAccessService()
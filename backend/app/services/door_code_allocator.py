@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import Update, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DoorAccessEvent
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Random probes before falling back to a linear scan; at <= 50% occupancy 16 misses in a row
+# happen with probability < 2e-5.
+MAX_PROBES = 16
+# Partial unique index over (venue_id, door_code) of the rows whose released_at is NULL.
+ACTIVE_CODE_INDEX = "uq_door_access_events_active_code"
+
+
+def is_door_code_conflict(exc: IntegrityError) -> bool:
+    """Whether ``exc`` is another process having committed the same active code first."""
+
+    return ACTIVE_CODE_INDEX in str(exc.orig)
+
+
+def release_expired_codes_stmt(batch_size: int) -> Update:
+    """Release up to ``batch_size`` expired codes so the unique index lets them be reused."""
+
+    expired = (
+        select(DoorAccessEvent.id)
+        .where(DoorAccessEvent.released_at.is_(None), DoorAccessEvent.expires_at <= func.now())
+        .order_by(DoorAccessEvent.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(DoorAccessEvent)
+        .where(DoorAccessEvent.id.in_(expired.scalar_subquery()))
+        .values(released_at=func.now())
+    )
+
+
+class CodeBitmap:
+    """One bit per possible ``length``-digit code."""
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self.capacity = 10**length
+        self.count = 0
+        self._bits = bytearray((self.capacity + 7) // 8)
+
+    def __contains__(self, value: int) -> bool:
+        return bool(self._bits[value >> 3] & (1 << (value & 7)))
+
+    def set(self, value: int) -> bool:
+        if value in self:
+            return False
+        self._bits[value >> 3] |= 1 << (value & 7)
+        self.count += 1
+        return True
+
+    def clear(self, value: int) -> None:
+        if value in self:
+            self._bits[value >> 3] &= ~(1 << (value & 7))
+            self.count -= 1
+
+    @property
+    def occupancy(self) -> float:
+        return self.count / self.capacity
+
+    def first_free(self, start: int) -> Optional[int]:
+        for offset in range(self.capacity):
+            value = (start + offset) % self.capacity
+            if value not in self:
+                return value
+        return None
+
+
+class VenueCodes:
+    """Active door codes for one venue: a bitmap per code length plus an expiry heap.
+
+    New codes are drawn at ``length`` digits. Once that bitmap is more than
+    ``grow_threshold`` full, ``length`` grows by one digit. Shorter codes that are
+    still active stay reserved in their own bitmap until they expire.
+    """
+
+    def __init__(self, length: int, max_length: int, grow_threshold: float) -> None:
+        self.length = length
+        self.max_length = max_length
+        self.grow_threshold = grow_threshold
+        self._bitmaps: Dict[int, CodeBitmap] = {}
+        self._active_until: Dict[str, datetime] = {}
+        self._expiries: list[tuple[datetime, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._active_until)
+
+    def _bitmap(self, length: int) -> CodeBitmap:
+        bitmap = self._bitmaps.get(length)
+        if bitmap is None:
+            bitmap = self._bitmaps[length] = CodeBitmap(length)
+        return bitmap
+
+    def reserve(self, code: str, expires_at: datetime) -> None:
+        """Mark an existing code active until ``expires_at`` (used when rebuilding)."""
+
+        if not code.isdigit():
+            return
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        self._bitmap(len(code)).set(int(code))
+        self._active_until[code] = max(expires_at, self._active_until.get(code, expires_at))
+        heapq.heappush(self._expiries, (self._active_until[code], code))
+        while self._bitmap(self.length).occupancy > self.grow_threshold and self.length < self.max_length:
+            self.length += 1
+            metrics.increment("door_code_length_grown_total")
+            logger.info("door_code_length_grown", extra={"length": self.length})
+
+    def release(self, code: str) -> None:
+        if code not in self._active_until:
+            return
+        del self._active_until[code]
+        self._bitmap(len(code)).clear(int(code))
+
+    def release_expired(self, now: datetime) -> int:
+        released = 0
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, code = heapq.heappop(self._expiries)
+            # Lazy deletion: skip entries superseded by a later reserve or an explicit release.
+            if self._active_until.get(code) == expires_at:
+                self.release(code)
+                released += 1
+        return released
+
+    def allocate(self, expires_at: datetime, now: datetime) -> str:
+        """Pick a random free code; O(1) expected while occupancy stays under the threshold."""
+
+        self.release_expired(now)
+        bitmap = self._bitmap(self.length)
+        value: Optional[int] = None
+        for _ in range(MAX_PROBES):
+            candidate = secrets.randbelow(bitmap.capacity)
+            if candidate not in bitmap:
+                value = candidate
+                break
+        if value is None:
+            value = bitmap.first_free(secrets.randbelow(bitmap.capacity))
+            if value is None:
+                raise RuntimeError(f"No free {self.length}-digit door codes")
+        code = str(value).zfill(self.length)
+        self.reserve(code, expires_at)
+        return code
+
+
+class DoorCodeAllocator:
+    """Per-venue allocator that keeps active door codes from colliding.
+
+    Each venue's state is rebuilt from ``door_access_events`` (codes not yet
+    ``released_at``) the first time that venue is used in this process. After that,
+    allocation and release happen entirely in memory. Other processes allocate too,
+    so the partial unique index ``ACTIVE_CODE_INDEX`` is the final word: on a conflict
+    the caller calls :meth:`forget` and tries again with the venue reloaded. An
+    expired code is only reused ``reuse_delay`` after it expires, by which time the
+    sweeper has released its row.
+    """
+
+    def __init__(
+        self,
+        length: int = 4,
+        max_length: int = 8,
+        grow_threshold: float = 0.5,
+        reuse_delay: timedelta = timedelta(minutes=1),
+    ) -> None:
+        self.length = length
+        self.max_length = max_length
+        self.grow_threshold = grow_threshold
+        self.reuse_delay = reuse_delay
+        self._venues: Dict[str, VenueCodes] = {}
+
+    def is_loaded(self, venue_id: str) -> bool:
+        return venue_id in self._venues
+
+    async def load(self, session: AsyncSession, venue_id: str) -> VenueCodes:
+        if venue_id in self._venues:
+            return self._venues[venue_id]
+        rows = (
+            await session.execute(
+                select(DoorAccessEvent.door_code, func.max(DoorAccessEvent.expires_at))
+                .where(DoorAccessEvent.venue_id == venue_id, DoorAccessEvent.released_at.is_(None))
+                .group_by(DoorAccessEvent.door_code)
+            )
+        ).all()
+        # A concurrent load may have finished while this one awaited the query.
+        if venue_id in self._venues:
+            return self._venues[venue_id]
+        codes = VenueCodes(self.length, self.max_length, self.grow_threshold)
+        for code, expires_at in rows:
+            if expires_at is not None:
+                codes.reserve(code, expires_at)
+        self._venues[venue_id] = codes
+        metrics.set_gauge("door_codes_active", len(codes), labels={"venue": venue_id})
+        return codes
+
+    def allocate(self, venue_id: str, expires_at: datetime) -> Optional[str]:
+        """A free code for ``venue_id``, or ``None`` if the venue has not been loaded yet."""
+
+        codes = self._venues.get(venue_id)
+        if codes is None:
+            return None
+        code = codes.allocate(expires_at, datetime.now(timezone.utc) - self.reuse_delay)
+        metrics.set_gauge("door_codes_active", len(codes), labels={"venue": venue_id})
+        return code
+
+    def release(self, venue_id: str, code: str) -> None:
+        codes = self._venues.get(venue_id)
+        if codes is not None:
+            codes.release(code)
+
+    def forget(self, venue_id: str) -> None:
+        """Drop a venue's state so the next use reloads it from the database."""
+
+        self._venues.pop(venue_id, None)
+
+    def clear(self) -> None:
+        self._venues.clear()
+
+
+_door_code_allocator: DoorCodeAllocator | None = None
+
+
+def get_door_code_allocator() -> DoorCodeAllocator:
+    global _door_code_allocator
+    if _door_code_allocator is None:
+        settings = get_settings()
+        _door_code_allocator = DoorCodeAllocator(
+            length=settings.door_code_length,
+            max_length=settings.door_code_max_length,
+            grow_threshold=settings.door_code_grow_threshold,
+            reuse_delay=timedelta(seconds=settings.door_code_reuse_delay_seconds),
+        )
+    return _door_code_allocator
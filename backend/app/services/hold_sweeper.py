@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import Update, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.database import POOL_REPORTING, resolve_session_factory
+from app.models import Booking, BookingStatus
+from app.services.door_code_allocator import release_expired_codes_stmt
+from app.services.idempotency_service import purge_idempotency_keys_stmt
+from app.stores.event_bus import event_bus
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def expire_holds_stmt(batch_size: int) -> Update:
+    """Cancel up to ``batch_size`` expired holds, oldest first.
+
+    The inner select is answered from the partial ``ix_bookings_hold_expiry`` index and
+    ``SKIP LOCKED`` lets a confirm that is converting a hold proceed without waiting.
+    """
+
+    expired = (
+        select(Booking.id)
+        .where(Booking.status == BookingStatus.PENDING, Booking.hold_expires_at <= func.now())
+        .order_by(Booking.hold_expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(Booking)
+        .where(Booking.id.in_(expired.scalar_subquery()))
+        .values(status=BookingStatus.CANCELLED)
+        .returning(Booking.id, Booking.session_id, Booking.room_id)
+    )
+
+
+class HoldSweeper:
+    """Background task that reclaims expired booking holds in small batches.
+
+    Each pass also releases expired door codes, so the active-code unique index lets
+    them be reused, and deletes idempotency keys older than ``idempotency_retention``.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        interval: float = 15.0,
+        batch_size: int = 500,
+        idempotency_retention: timedelta = timedelta(hours=24),
+    ) -> None:
+        self._session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.idempotency_retention = idempotency_retention
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory, POOL_REPORTING)
+
+    async def sweep(self) -> int:
+        """Expire every overdue hold, one short transaction per batch. Returns the count."""
+
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                rows = (await session.execute(expire_holds_stmt(self.batch_size))).all()
+                await session.commit()
+            for row in rows:
+                if row.session_id:
+                    await event_bus.publish(
+                        row.session_id,
+                        {"type": "hold.expired", "hold_id": row.id, "room_id": row.room_id},
+                    )
+            total += len(rows)
+            if len(rows) < self.batch_size:
+                break
+        if total:
+            metrics.increment("booking_holds_expired_total", total)
+            logger.info("booking_holds_expired", extra={"count": total})
+        return total
+
+    async def release_door_codes(self) -> int:
+        """Mark expired door codes released, one short transaction per batch. Returns the count."""
+
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                released = (await session.execute(release_expired_codes_stmt(self.batch_size))).rowcount
+                await session.commit()
+            total += released
+            if released < self.batch_size:
+                break
+        if total:
+            metrics.increment("door_codes_released_total", total)
+        return total
+
+    async def purge_idempotency_keys(self) -> int:
+        """Delete expired idempotency keys, one short transaction per batch. Returns the count."""
+
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                deleted = (
+                    await session.execute(purge_idempotency_keys_stmt(self.idempotency_retention, self.batch_size))
+                ).rowcount
+                await session.commit()
+            total += deleted
+            if deleted < self.batch_size:
+                break
+        if total:
+            metrics.increment("idempotency_keys_purged_total", total)
+        return total
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="hold-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as exc:
+                logger.warning("booking_hold_sweep_failed", extra={"error": str(exc)})
+            try:
+                await self.release_door_codes()
+            except Exception as exc:
+                logger.warning("door_code_release_failed", extra={"error": str(exc)})
+            try:
+                await self.purge_idempotency_keys()
+            except Exception as exc:
+                logger.warning("idempotency_key_purge_failed", extra={"error": str(exc)})
+            await asyncio.sleep(self.interval)
+
+
+_hold_sweeper: HoldSweeper | None = None
+
+
+def get_hold_sweeper() -> HoldSweeper:
+    global _hold_sweeper
+    if _hold_sweeper is None:
+        settings = get_settings()
+        _hold_sweeper = HoldSweeper(
+            interval=settings.booking_hold_sweep_interval_seconds,
+            batch_size=settings.booking_hold_sweep_batch_size,
+            idempotency_retention=timedelta(hours=settings.idempotency_key_retention_hours),
+        )
+    return _hold_sweeper
+
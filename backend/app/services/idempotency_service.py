@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Delete, delete, false, func, literal, null, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import IdempotencyKey
+from app.utils.config import get_settings
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """Raised when a key is replayed with a request body that differs from the original."""
+
+
+class IdempotencyInProgressError(ValueError):
+    """Raised when the original request for a key has not finished yet."""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Stable SHA-256 of a JSON-compatible payload (key order does not matter)."""
+
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def purge_idempotency_keys_stmt(retention: timedelta, batch_size: int) -> Delete:
+    """Delete up to ``batch_size`` keys created more than ``retention`` ago, finished or not."""
+
+    expired = (
+        select(IdempotencyKey.id)
+        .where(IdempotencyKey.created_at < func.now() - retention)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired.scalar_subquery()))
+
+
+# Claim statements to try when a concurrent claim keeps appearing and vanishing.
+CLAIM_ATTEMPTS = 3
+
+
+class IdempotencyService:
+    """Stores the first response for each ``(scope, key)`` and replays it on retries.
+
+    A claim that is still unfinished ``claim_timeout`` after it was made belongs to a
+    request that died without releasing it; the next retry with the same body takes
+    it over instead of getting ``409`` forever.
+    """
+
+    def __init__(self, claim_timeout: timedelta = timedelta(minutes=2)) -> None:
+        self.claim_timeout = claim_timeout
+
+    async def claim(self, session: AsyncSession, scope: str, key: str, request_hash: str) -> Optional[Dict[str, Any]]:
+        """Reserve ``key`` for this request, or return the response already recorded for it.
+
+        Returns ``None`` when the caller now owns the key and must run the operation, then
+        call :meth:`complete` or :meth:`release`. Claiming, taking over an abandoned claim
+        and replaying are a single statement against the ``(scope, key)`` unique index.
+        If the key is neither claimable nor readable ``CLAIM_ATTEMPTS`` times in a row
+        (a concurrent claim keeps being released), raises :class:`IdempotencyInProgressError`.
+        """
+
+        claim = insert(IdempotencyKey).values(scope=scope, key=key, request_hash=request_hash)
+        claimed = (
+            claim.on_conflict_do_update(
+                index_elements=["scope", "key"],
+                set_={"created_at": func.now()},
+                where=(
+                    IdempotencyKey.response.is_(None)
+                    & (IdempotencyKey.request_hash == claim.excluded.request_hash)
+                    & (IdempotencyKey.created_at < func.now() - self.claim_timeout)
+                ),
+            )
+            .returning(IdempotencyKey.id)
+            .cte("claimed")
+        )
+        stmt = select(true().label("claimed"), literal(request_hash).label("request_hash"), null().label("response")).select_from(
+            claimed
+        ).union_all(
+            select(false(), IdempotencyKey.request_hash, IdempotencyKey.response).where(
+                IdempotencyKey.scope == scope, IdempotencyKey.key == key
+            )
+        )
+        existing = select(false(), IdempotencyKey.request_hash, IdempotencyKey.response).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key
+        )
+        row = None
+        for _ in range(CLAIM_ATTEMPTS):
+            row = (await session.execute(stmt)).first()
+            if row is None:
+                # Lost a race with a concurrent claim that committed after our snapshot.
+                row = (await session.execute(existing)).first()
+            await session.commit()
+            if row is not None:
+                break
+            # The winner released its claim in between: try to claim it again.
+
+        if row is None:
+            raise IdempotencyInProgressError("A request with this Idempotency-Key is still in progress")
+        if row[0]:
+            return None
+        if row[1] != request_hash:
+            raise IdempotencyKeyReusedError("Idempotency-Key was already used with a different request")
+        if row[2] is None:
+            raise IdempotencyInProgressError("A request with this Idempotency-Key is still in progress")
+        return row[2]
+
+    async def complete(self, session: AsyncSession, scope: str, key: str, response: Dict[str, Any]) -> None:
+        stmt = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(response=response, completed_at=func.now())
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+    async def release(self, session: AsyncSession, scope: str, key: str) -> None:
+        """Drop an unfinished claim so the client can retry after a failure."""
+
+        await session.rollback()
+        await session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope, IdempotencyKey.key == key, IdempotencyKey.response.is_(None)
+            )
+        )
+        await session.commit()
+
+
+def get_idempotency_service() -> IdempotencyService:
+    return IdempotencyService(claim_timeout=timedelta(seconds=get_settings().idempotency_claim_timeout_seconds))
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import asyncpg
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.db.database import POOL_REPORTING, resolve_session_factory
+from app.models import Booking, BookingStatus, DoorAccessEvent, DoorEntryEvent
+from app.stores.keypad_index import KeypadDecision, KeypadIndex
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+KEYPAD_CHANNEL = "keypad_codes"
+_CHANGES_KEY = "keypad_changes"
+# Lets the listener skip this process's own notifications; its index was updated at commit.
+_ORIGIN = uuid.uuid4().hex
+# pg_notify payloads are capped at 8000 bytes.
+_MAX_PAYLOAD = 7000
+
+
+def _payloads(changes: List[Dict[str, Any]]) -> List[str]:
+    payloads: List[str] = []
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    for change in changes:
+        change_size = len(json.dumps(change))
+        if batch and size + change_size > _MAX_PAYLOAD:
+            payloads.append(json.dumps({"origin": _ORIGIN, "changes": batch}))
+            batch, size = [], 0
+        batch.append(change)
+        size += change_size
+    if batch:
+        payloads.append(json.dumps({"origin": _ORIGIN, "changes": batch}))
+    return payloads
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_keypad_changes(session: Session) -> None:
+    staged: List[Tuple["KeypadService", Dict[str, Any]]] = session.info.get(_CHANGES_KEY, [])
+    if not staged:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    for payload in _payloads([change for _service, change in staged]):
+        connection.execute(select(func.pg_notify(KEYPAD_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_keypad_changes(session: Session) -> None:
+    for service, change in session.info.pop(_CHANGES_KEY, ()):
+        service.apply(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_keypad_changes(session: Session) -> None:
+    session.info.pop(_CHANGES_KEY, None)
+
+
+class KeypadService:
+    """Answers keypad code checks from memory and records the attempts in batches.
+
+    The index is rebuilt from ``door_access_events`` whenever the listener (re)connects
+    and kept current by :class:`~app.services.door_access_service.DoorAccessService`
+    as codes are issued or pushed to the lock: changes are staged on the writing
+    session with :meth:`stage`, applied here once it commits and broadcast to every
+    other process on ``KEYPAD_CHANNEL``. Verification never touches the database: entry
+    events are buffered and written with one multi-row insert per ``batch_size``
+    every ``flush_interval`` seconds (sooner once a full batch is waiting). If the
+    database is down the buffer keeps the newest ``buffer_limit`` events.
+    """
+
+    def __init__(
+        self,
+        index: KeypadIndex | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        early_entry: timedelta = timedelta(minutes=15),
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+        buffer_limit: int = 50000,
+        retry_interval: float = 5.0,
+    ) -> None:
+        self.index = index or KeypadIndex()
+        self._session_factory = session_factory
+        self.early_entry = early_entry
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.loaded = False
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=buffer_limit)
+        # Changes heard while a load is reading the database, replayed on top of its rows.
+        self._replay: List[Dict[str, Any]] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._wake: asyncio.Event | None = None
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory, POOL_REPORTING)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def activate(
+        self,
+        venue_id: str,
+        code: str,
+        booking_id: Optional[int],
+        room_id: Optional[str],
+        start_time: Optional[datetime],
+        expires_at: datetime,
+    ) -> None:
+        """Open ``code`` from ``early_entry`` before ``start_time`` until ``expires_at``."""
+
+        valid_from = (start_time or datetime.now(timezone.utc)) - self.early_entry
+        self.index.add(venue_id, code, booking_id, room_id, valid_from, expires_at)
+
+    def deactivate(self, venue_id: str, code: str, booking_id: Optional[int] = None) -> None:
+        self.index.remove(venue_id, code, booking_id)
+
+    def stage(
+        self,
+        session: AsyncSession,
+        action: str,
+        venue_id: str,
+        code: str,
+        booking_id: Optional[int],
+        room_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        expires_at: Optional[datetime] = None,
+    ) -> None:
+        """``activate`` or ``deactivate`` a code in every process once ``session`` commits.
+
+        Nothing changes if it rolls back, so a code is never live before its row is.
+        """
+
+        change = {
+            "action": action,
+            "venue_id": venue_id,
+            "code": code,
+            "booking_id": booking_id,
+            "room_id": room_id,
+            "start_time": start_time.isoformat() if start_time else None,
+            "expires_at": expires_at.isoformat() if expires_at else None,
+        }
+        session.sync_session.info.setdefault(_CHANGES_KEY, []).append((self, change))
+
+    async def publish(self, changes: List[Dict[str, Any]]) -> None:
+        """Apply and broadcast changes that have no write of their own to ride on."""
+
+        async with self.session_factory() as session:
+            for change in changes:
+                session.sync_session.info.setdefault(_CHANGES_KEY, []).append((self, change))
+            await session.commit()
+
+    def apply(self, change: Dict[str, Any]) -> None:
+        if self._replay is not None:
+            self._replay.append(change)
+        self._apply(change)
+
+    def _apply(self, change: Dict[str, Any]) -> None:
+        if change["action"] == "deactivate":
+            self.deactivate(change["venue_id"], change["code"], change.get("booking_id"))
+        elif change.get("expires_at"):
+            start_time = change.get("start_time")
+            self.activate(
+                change["venue_id"],
+                change["code"],
+                change.get("booking_id"),
+                change.get("room_id"),
+                datetime.fromisoformat(start_time) if start_time else None,
+                datetime.fromisoformat(change["expires_at"]),
+            )
+        metrics.set_gauge("keypad_codes_indexed", len(self.index))
+
+    def _on_notification(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("keypad_notification_invalid", extra={"payload": payload[:200]})
+            return
+        if message.get("origin") == _ORIGIN:
+            return
+        for change in message.get("changes", ()):
+            self.apply(change)
+        metrics.increment("keypad_notifications_total")
+
+    async def load(self) -> int:
+        """Rebuild the index from every unexpired code of a live booking. Returns the number indexed.
+
+        Changes heard while the query runs are applied to the old index as usual and
+        replayed onto the new one, so a code revoked meanwhile does not come back.
+        """
+
+        self._replay = []
+        try:
+            async with self.session_factory() as session:
+                rows = (
+                    await session.execute(
+                        select(
+                            Booking.venue_id,
+                            Booking.room_id,
+                            Booking.id,
+                            Booking.start_time,
+                            DoorAccessEvent.door_code,
+                            DoorAccessEvent.expires_at,
+                        )
+                        .join(DoorAccessEvent, DoorAccessEvent.booking_id == Booking.id)
+                        .where(Booking.status != BookingStatus.CANCELLED, DoorAccessEvent.expires_at > func.now())
+                    )
+                ).all()
+                await session.rollback()
+            self.index.clear()
+            for row in rows:
+                self.activate(row.venue_id, row.door_code, row.id, row.room_id, row.start_time, row.expires_at)
+            for change in self._replay:
+                self._apply(change)
+        finally:
+            self._replay = None
+        self.loaded = True
+        metrics.set_gauge("keypad_codes_indexed", len(self.index))
+        return len(rows)
+
+    def verify(
+        self,
+        venue_id: str,
+        code: str,
+        room_id: Optional[str] = None,
+        keypad_id: Optional[str] = None,
+    ) -> KeypadDecision:
+        decision = self.index.verify(venue_id, code, room_id)
+        if len(self._pending) == self._pending.maxlen:
+            metrics.increment("keypad_entry_events_dropped_total")
+        self._pending.append(
+            {
+                "venue_id": venue_id,
+                "door_code": code,
+                "keypad_id": keypad_id,
+                "booking_id": decision.entry.booking_id if decision.entry else None,
+                "granted": decision.granted,
+                "reason": decision.reason,
+                "occurred_at": datetime.now(timezone.utc),
+            }
+        )
+        metrics.increment("keypad_verifications_total", labels={"result": decision.reason})
+        if len(self._pending) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+        return decision
+
+    async def flush(self) -> int:
+        """Write every buffered entry event. Returns the number written."""
+
+        if not self._pending:
+            return 0
+        rows = list(self._pending)
+        self._pending.clear()
+        try:
+            async with self.session_factory() as session:
+                for offset in range(0, len(rows), self.batch_size):
+                    await session.execute(insert(DoorEntryEvent).values(rows[offset : offset + self.batch_size]))
+                await session.commit()
+        except BaseException:
+            # Put the batch back ahead of anything recorded meanwhile; the deque bound drops the oldest.
+            self._pending = deque([*rows, *self._pending], maxlen=self._pending.maxlen)
+            raise
+        metrics.increment("keypad_entry_events_written_total", len(rows))
+        return len(rows)
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._run(), name="keypad-service")
+        self._listener = loop.create_task(self._listen(), name="keypad-listener")
+
+    async def stop(self) -> None:
+        """Stop the loops and write whatever is still buffered."""
+
+        if self._task is None:
+            return
+        for task in (self._task, self._listener):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(task for task in (self._task, self._listener) if task is not None), return_exceptions=True)
+        self._task = None
+        self._listener = None
+        self._wake = None
+        try:
+            await self.flush()
+        except Exception as exc:
+            logger.warning("keypad_entry_flush_failed", extra={"error": str(exc), "pending": self.pending})
+
+    async def _load_until_loaded(self) -> None:
+        while True:
+            try:
+                indexed = await self.load()
+                logger.info("keypad_index_loaded", extra={"codes": indexed})
+                return
+            except Exception as exc:
+                logger.warning("keypad_index_load_failed", extra={"error": str(exc)})
+                await asyncio.sleep(self.flush_interval)
+
+    async def _listen(self) -> None:
+        url = make_url(get_settings().database_url)
+        if url.get_backend_name() != "postgresql":
+            await self._load_until_loaded()
+            return
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception as exc:
+                logger.warning("keypad_listen_failed", extra={"error": str(exc)})
+                await asyncio.sleep(self.retry_interval)
+                continue
+            try:
+                connection.add_termination_listener(lambda _connection: closed.set())
+                await connection.add_listener(
+                    KEYPAD_CHANNEL, lambda _connection, _pid, _channel, payload: self._on_notification(payload)
+                )
+                # Changes sent while we were not listening are gone, so reload after every LISTEN.
+                await self._load_until_loaded()
+                await closed.wait()
+                logger.warning("keypad_listener_disconnected")
+            finally:
+                await connection.close()
+            await asyncio.sleep(self.retry_interval)
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        wake = self._wake
+        while True:
+            expired = self.index.expire()
+            if expired:
+                metrics.set_gauge("keypad_codes_indexed", len(self.index))
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("keypad_entry_flush_failed", extra={"error": str(exc), "pending": self.pending})
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+
+
+_keypad_service: KeypadService | None = None
+
+
+def get_keypad_service() -> KeypadService:
+    global _keypad_service
+    if _keypad_service is None:
+        settings = get_settings()
+        _keypad_service = KeypadService(
+            early_entry=timedelta(minutes=settings.keypad_early_entry_minutes),
+            flush_interval=settings.keypad_entry_flush_interval_seconds,
+            batch_size=settings.keypad_entry_batch_size,
+            buffer_limit=settings.keypad_entry_buffer_limit,
+            retry_interval=settings.availability_listen_retry_seconds,
+        )
+    return _keypad_service
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Collection, Dict
+
+from sqlalchemy import ColumnElement, Insert, Update, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.database import POOL_REPORTING, resolve_session_factory
+from app.models import OutboxMessage
+from app.services.door_access_service import get_door_access_service
+from app.services.summary_service import get_summary_service
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TOPIC_BOOKING_CONFIRMED = "booking.confirmed"
+TOPIC_CALL_SUMMARY = "call.summary"
+
+OutboxHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def booking_confirmed_payload(
+    booking_id: int | None,
+    session_id: str | None,
+    room_id: str | None,
+    start_time: datetime | None,
+    door_code: str,
+    expires_at: datetime | None,
+    venue_id: str | None = None,
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "session_id": session_id,
+        "venue_id": venue_id,
+        "room_id": room_id,
+        "start_time": start_time.isoformat() if start_time else None,
+        "door_code": door_code,
+        "expires_at": expires_at.isoformat() if expires_at else None,
+    }
+    if booking_id is not None:
+        payload["booking_id"] = booking_id
+    return payload
+
+
+def outbox_stmt(topic: str, payloads: list[Dict[str, Any]]) -> Insert:
+    """Multi-row insert of messages; execute it in the transaction that makes the change."""
+
+    return insert(OutboxMessage).values([{"topic": topic, "payload": payload} for payload in payloads])
+
+
+def pending_clause() -> ColumnElement[bool]:
+    return OutboxMessage.delivered_at.is_(None) & OutboxMessage.failed_at.is_(None)
+
+
+def claim_stmt(batch_size: int, lease_seconds: float, topics: Collection[str] | None = None) -> Update:
+    """Lease up to ``batch_size`` due messages (optionally only ``topics``), oldest first.
+
+    ``SKIP LOCKED`` lets several dispatchers (or processes) claim disjoint batches. The
+    lease pushes ``available_at`` forward, so a dispatcher that dies mid-delivery only
+    delays its messages by ``lease_seconds`` instead of losing them.
+    """
+
+    due = (
+        select(OutboxMessage.id)
+        .where(pending_clause(), OutboxMessage.available_at <= func.now())
+        .order_by(OutboxMessage.available_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    if topics is not None:
+        due = due.where(OutboxMessage.topic.in_(list(topics)))
+    return (
+        update(OutboxMessage)
+        .where(OutboxMessage.id.in_(due.scalar_subquery()))
+        .values(
+            attempts=OutboxMessage.attempts + 1,
+            available_at=func.now() + timedelta(seconds=lease_seconds),
+        )
+        .returning(OutboxMessage.id, OutboxMessage.topic, OutboxMessage.payload, OutboxMessage.attempts, OutboxMessage.created_at)
+    )
+
+
+class OutboxDispatcher:
+    """Delivers outbox messages to per-topic handlers with retries and exponential backoff.
+
+    Each cycle claims a batch in one short transaction, runs the handlers with no
+    connection checked out, then records the outcomes. A message whose handler keeps
+    failing is retried after ``base_backoff * 2**(attempts-1)`` seconds (capped at
+    ``max_backoff``) and parked with ``failed_at`` after ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        interval: float = 1.0,
+        batch_size: int = 100,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 8,
+        base_backoff: float = 2.0,
+        max_backoff: float = 600.0,
+        topics: Collection[str] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.topics = topics
+        self._handlers: Dict[str, OutboxHandler] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._wake: asyncio.Event | None = None
+        self._stopping = False
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory, POOL_REPORTING)
+
+    def register(self, topic: str, handler: OutboxHandler) -> None:
+        self._handlers[topic] = handler
+
+    def notify(self) -> None:
+        """Wake the dispatcher after a commit so new messages go out without waiting a full interval."""
+
+        if self._wake is not None:
+            self._wake.set()
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.max_backoff, self.base_backoff * 2 ** max(attempts - 1, 0))
+
+    async def _deliver(self, message: Any) -> str | None:
+        handler = self._handlers.get(message.topic)
+        if handler is None:
+            return f"no handler for topic {message.topic}"
+        try:
+            await handler(message.payload or {})
+        except Exception as exc:
+            return f"{type(exc).__name__}: {exc}"
+        return None
+
+    async def dispatch_once(self) -> int:
+        """Claim and deliver one batch. Returns the number of messages claimed."""
+
+        async with self.session_factory() as session:
+            claimed = (await session.execute(claim_stmt(self.batch_size, self.lease_seconds, self.topics))).all()
+            await session.commit()
+        if not claimed:
+            return 0
+
+        errors = await asyncio.gather(*(self._deliver(message) for message in claimed))
+        now = datetime.now(timezone.utc)
+        delivered = [message.id for message, error in zip(claimed, errors) if error is None]
+        async with self.session_factory() as session:
+            if delivered:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(delivered))
+                    .values(delivered_at=func.now(), last_error=None)
+                )
+            for message, error in zip(claimed, errors):
+                if error is None:
+                    metrics.increment("outbox_delivered_total", labels={"topic": message.topic})
+                    metrics.observe("outbox_delivery_lag_seconds", (now - message.created_at).total_seconds())
+                    continue
+                unknown_topic = message.topic not in self._handlers
+                if unknown_topic or message.attempts >= self.max_attempts:
+                    values: Dict[str, Any] = {"failed_at": func.now(), "last_error": error}
+                    metrics.increment("outbox_dead_total", labels={"topic": message.topic})
+                    logger.warning(
+                        "outbox_message_dead",
+                        extra={"message_id": message.id, "topic": message.topic, "attempts": message.attempts, "error": error},
+                    )
+                else:
+                    values = {
+                        "available_at": func.now() + timedelta(seconds=self.backoff(message.attempts)),
+                        "last_error": error,
+                    }
+                    metrics.increment("outbox_retries_total", labels={"topic": message.topic})
+                await session.execute(update(OutboxMessage).where(OutboxMessage.id == message.id).values(**values))
+            await session.commit()
+        return len(claimed)
+
+    async def publish_backlog_metrics(self) -> tuple[int, float]:
+        """Set ``outbox_backlog`` and ``outbox_oldest_age_seconds`` from the pending index."""
+
+        async with self.session_factory() as session:
+            row = (
+                await session.execute(
+                    select(
+                        func.count(),
+                        func.coalesce(func.extract("epoch", func.now() - func.min(OutboxMessage.created_at)), 0),
+                    ).where(pending_clause())
+                )
+            ).one()
+            await session.rollback()
+        backlog, oldest_age = int(row[0]), float(row[1])
+        metrics.set_gauge("outbox_backlog", backlog)
+        metrics.set_gauge("outbox_oldest_age_seconds", oldest_age)
+        return backlog, oldest_age
+
+    async def drain(self) -> int:
+        """Deliver everything that is due right now."""
+
+        total = 0
+        while True:
+            claimed = await self.dispatch_once()
+            total += claimed
+            if claimed < self.batch_size:
+                return total
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="outbox-dispatcher")
+
+    async def stop(self, flush_timeout: float = 0.0) -> None:
+        """Stop the loop, optionally giving due messages ``flush_timeout`` seconds to go out.
+
+        A cycle that is already delivering may finish within ``flush_timeout``. Cancelling
+        it would leave its claimed messages leased, so the flush could not send them.
+        """
+
+        if self._task is None:
+            return
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + flush_timeout
+        self._stopping = True
+        self.notify()
+        _, pending = await asyncio.wait({self._task}, timeout=flush_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._wake = None
+        remaining = deadline - loop.time()
+        if remaining > 0:
+            try:
+                await asyncio.wait_for(self.drain(), timeout=remaining)
+            except Exception as exc:
+                logger.warning("outbox_flush_incomplete", extra={"error": str(exc)})
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        wake = self._wake
+        while not self._stopping:
+            try:
+                await self.drain()
+                await self.publish_backlog_metrics()
+            except Exception as exc:
+                logger.warning("outbox_dispatch_failed", extra={"error": str(exc)})
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+
+
+def _register_default_handlers(dispatcher: OutboxDispatcher) -> None:
+    async def push_door_code(payload: Dict[str, Any]) -> None:
+        await get_door_access_service().push_to_lock(payload)
+
+    async def generate_summary(payload: Dict[str, Any]) -> None:
+        await get_summary_service().generate_summary(payload["session_id"])
+
+    dispatcher.register(TOPIC_BOOKING_CONFIRMED, push_door_code)
+    dispatcher.register(TOPIC_CALL_SUMMARY, generate_summary)
+
+
+_outbox_dispatcher: OutboxDispatcher | None = None
+
+
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    global _outbox_dispatcher
+    if _outbox_dispatcher is None:
+        settings = get_settings()
+        _outbox_dispatcher = OutboxDispatcher(
+            interval=settings.outbox_dispatch_interval_seconds,
+            batch_size=settings.outbox_batch_size,
+            max_attempts=settings.outbox_max_attempts,
+            base_backoff=settings.outbox_base_backoff_seconds,
+            max_backoff=settings.outbox_max_backoff_seconds,
+        )
+        _register_default_handlers(_outbox_dispatcher)
+    return _outbox_dispatcher
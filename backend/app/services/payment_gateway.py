@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Protocol
+
+from app.utils.config import get_settings
+
+
+@dataclass
+class ChargeRequest:
+    payment_id: int
+    amount: Optional[Decimal]
+    currency: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def idempotency_key(self) -> str:
+        """Sent with the charge so a retry of the same payment is never charged twice."""
+
+        return payment_idempotency_key(self.payment_id, "charge")
+
+
+def payment_idempotency_key(payment_id: int, action: str) -> str:
+    return f"payment-{payment_id}-{action}"
+
+
+@dataclass
+class GatewayResult:
+    """What a provider said about a charge or refund. ``reference`` is the provider's id."""
+
+    succeeded: bool
+    reference: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class PaymentGateway(Protocol):
+    """Provider integration used by the payment worker; calls may take seconds.
+
+    Implementations must pass the idempotency key on to the provider: a worker that
+    loses its claim mid-call can leave the same payment to be sent again.
+    """
+
+    name: str
+
+    async def charge(self, request: ChargeRequest) -> GatewayResult:
+        ...
+
+    async def refund(self, reference: str, amount: Optional[Decimal], idempotency_key: str) -> GatewayResult:
+        ...
+
+
+class SandboxGateway:
+    """Local stand-in for a card processor: waits, then approves unless told to decline.
+
+    A non-positive amount or ``metadata["simulate"] == "decline"`` is declined, and
+    ``metadata["processing_delay"]`` overrides the default latency per request. The
+    reference is derived from the idempotency key, so a repeated call returns the
+    same charge rather than a new one.
+    """
+
+    name = "sandbox"
+
+    def __init__(self, delay: float = 1.0) -> None:
+        self.delay = delay
+
+    async def charge(self, request: ChargeRequest) -> GatewayResult:
+        await asyncio.sleep(float(request.metadata.get("processing_delay", self.delay)))
+        if request.metadata.get("simulate") == "decline":
+            return GatewayResult(False, reason="card_declined")
+        if request.amount is not None and request.amount <= 0:
+            return GatewayResult(False, reason="invalid_amount")
+        return GatewayResult(True, reference=f"sbx_ch_{_reference(request.idempotency_key)}")
+
+    async def refund(self, reference: str, amount: Optional[Decimal], idempotency_key: str) -> GatewayResult:
+        await asyncio.sleep(self.delay)
+        return GatewayResult(True, reference=f"sbx_re_{_reference(idempotency_key)}")
+
+
+def _reference(idempotency_key: str) -> str:
+    return uuid.uuid5(uuid.NAMESPACE_OID, idempotency_key).hex[:16]
+
+
+_gateway_factories: Dict[str, Callable[[], PaymentGateway]] = {
+    "sandbox": lambda: SandboxGateway(delay=get_settings().payment_sandbox_delay_seconds),
+}
+
+
+def register_gateway(name: str, factory: Callable[[], PaymentGateway]) -> None:
+    """Make a provider selectable through ``PAYMENT_GATEWAY``."""
+
+    _gateway_factories[name] = factory
+
+
+def get_payment_gateway() -> PaymentGateway:
+    name = get_settings().payment_gateway
+    try:
+        factory = _gateway_factories[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown payment gateway: {name}") from exc
+    return factory()
@@ -3,10 +3,44 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Any, Dict, Optional
 
+from sqlalchemy import Update, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Booking, Payment, PaymentProvider, PaymentStatus
 
+# PENDING -> SUCCEEDED | FAILED, SUCCEEDED -> REFUNDED. FAILED and REFUNDED are final.
+PAYMENT_TRANSITIONS: Dict[PaymentStatus, frozenset[PaymentStatus]] = {
+    PaymentStatus.PENDING: frozenset({PaymentStatus.SUCCEEDED, PaymentStatus.FAILED}),
+    PaymentStatus.SUCCEEDED: frozenset({PaymentStatus.REFUNDED}),
+    PaymentStatus.FAILED: frozenset(),
+    PaymentStatus.REFUNDED: frozenset(),
+}
+
+
+def payment_transition_stmt(payment_id: int, target: PaymentStatus, **values: Any) -> Update:
+    """Move a payment to ``target`` only from a state that allows it.
+
+    The guard lives in the WHERE clause, so a duplicate or late worker update matches
+    no row instead of overwriting a final state.
+    """
+
+    sources = [status for status, targets in PAYMENT_TRANSITIONS.items() if target in targets]
+    return (
+        update(Payment)
+        .where(Payment.id == payment_id, Payment.status.in_(sources))
+        .values(status=target, **values)
+        .returning(
+            Payment.id,
+            Payment.session_id,
+            Payment.booking_id,
+            Payment.status,
+            Payment.amount,
+            Payment.currency,
+            Payment.sandbox_reference,
+            Payment.extras,
+        )
+    )
+
 
 class PaymentService:
     """Records mock payment transactions for demo flows."""
@@ -35,6 +69,33 @@ class PaymentService:
         await session.flush()
         return payment
 
+    async def create_pending(
+        self,
+        session: AsyncSession,
+        session_id: Optional[str],
+        booking_id: Optional[int],
+        amount: Optional[Decimal],
+        currency: str = "USD",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Insert a PENDING payment for the worker to process and return its id (not committed)."""
+
+        return (
+            await session.execute(
+                insert(Payment)
+                .values(
+                    session_id=session_id,
+                    booking_id=booking_id,
+                    provider=self.provider,
+                    status=PaymentStatus.PENDING,
+                    amount=amount,
+                    currency=currency,
+                    extras=metadata or {},
+                )
+                .returning(Payment.id)
+            )
+        ).scalar_one()
+
 
 def get_payment_service() -> PaymentService:
     return PaymentService()
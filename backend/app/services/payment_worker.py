@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Literal
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.database import resolve_session_factory
+from app.models import Payment, PaymentStatus
+from app.services.payment_gateway import (
+    ChargeRequest,
+    PaymentGateway,
+    get_payment_gateway,
+    payment_idempotency_key,
+)
+from app.services.payment_service import payment_transition_stmt
+from app.stores.event_bus import event_bus
+from app.stores.session_store import SessionRecord, session_store
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PaymentAction = Literal["charge", "refund"]
+
+
+class PaymentWorker:
+    """Drives payments through their state machine off the request path.
+
+    Requests insert a PENDING row and :meth:`submit` its id. Workers claim the row in a
+    short transaction (``claimed_until``, taken with ``SKIP LOCKED`` so workers in other
+    processes pass over it), talk to the gateway with no connection checked out and an
+    idempotency key derived from the payment id, then apply the guarded transition,
+    which also releases the claim, and publish ``payment.<status>`` on the event bus.
+
+    A gateway error (timeout, connection reset) is not a decline: the claim is pushed
+    out by ``retry_backoff`` and the payment stays PENDING. Every ``sweep_interval``
+    the worker queues PENDING rows whose claim has lapsed, which covers those retries,
+    calls abandoned by a crash or a cancelled :meth:`stop`, and rows that were never
+    submitted. The retry reuses the payment's idempotency key.
+    """
+
+    def __init__(
+        self,
+        gateway: PaymentGateway | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        concurrency: int = 4,
+        lease: float = 120.0,
+        retry_backoff: float = 15.0,
+        sweep_interval: float = 30.0,
+    ) -> None:
+        self._gateway = gateway
+        self._session_factory = session_factory
+        self.concurrency = concurrency
+        self.lease = lease
+        self.retry_backoff = retry_backoff
+        self.sweep_interval = sweep_interval
+        self._queue: asyncio.Queue[tuple[int, PaymentAction] | None] | None = None
+        # Charges waiting in the queue, so a sweep does not queue them twice.
+        self._queued: set[int] = set()
+        self._stopping = False
+        self._tasks: list[asyncio.Task[None]] = []
+        self._sweeper: asyncio.Task[None] | None = None
+
+    @property
+    def gateway(self) -> PaymentGateway:
+        if self._gateway is None:
+            self._gateway = get_payment_gateway()
+        return self._gateway
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory)
+
+    def submit(self, payment_id: int, action: PaymentAction = "charge") -> None:
+        if self._queue is None or self._stopping:
+            raise RuntimeError("Payment worker is not running")
+        if action == "charge":
+            if payment_id in self._queued:
+                return
+            self._queued.add(payment_id)
+        self._queue.put_nowait((payment_id, action))
+        metrics.set_gauge("payment_queue_depth", self._queue.qsize())
+
+    async def process(self, payment_id: int, action: PaymentAction = "charge") -> Dict[str, Any] | None:
+        """Run one gateway call and apply its outcome. Returns the updated row, if any."""
+
+        expected = PaymentStatus.PENDING if action == "charge" else PaymentStatus.SUCCEEDED
+        payment = await self._claim(payment_id, expected)
+        if payment is None:
+            # Already settled, or another worker holds it.
+            return None
+
+        extras = dict(payment.extras or {})
+        try:
+            if action == "charge":
+                result = await self.gateway.charge(ChargeRequest(payment.id, payment.amount, payment.currency, extras))
+            else:
+                result = await self.gateway.refund(
+                    payment.sandbox_reference or "", payment.amount, payment_idempotency_key(payment.id, "refund")
+                )
+        except Exception as exc:
+            logger.warning("payment_gateway_error", extra={"payment_id": payment_id, "action": action, "error": str(exc)})
+            metrics.increment("payment_gateway_errors_total", labels={"action": action})
+            if action == "refund":
+                # The payment stays SUCCEEDED; the caller can ask again.
+                await self._release(payment_id)
+            else:
+                # Still PENDING: the sweep charges it again, with the same key, once the backoff lapses.
+                await self._release(payment_id, retry_after=self.retry_backoff)
+            return None
+
+        if action == "refund":
+            if not result.succeeded:
+                logger.warning("payment_refund_declined", extra={"payment_id": payment_id, "reason": result.reason})
+                await self._release(payment_id)
+                return None
+            target = PaymentStatus.REFUNDED
+            extras["refund_reference"] = result.reference
+            values: Dict[str, Any] = {"extras": extras}
+        elif result.succeeded:
+            target = PaymentStatus.SUCCEEDED
+            values = {"sandbox_reference": result.reference}
+        else:
+            target = PaymentStatus.FAILED
+            extras["failure_reason"] = result.reason
+            values = {"extras": extras}
+
+        async with self.session_factory() as session:
+            row = (
+                await session.execute(payment_transition_stmt(payment_id, target, claimed_until=None, **values))
+            ).mappings().first()
+            await session.commit()
+        if row is None:
+            return None
+
+        metrics.increment("payments_processed_total", labels={"action": action, "status": target.value.lower()})
+        if row["session_id"]:
+            if target == PaymentStatus.SUCCEEDED:
+                record = session_store.get(row["session_id"]) or SessionRecord(session_id=row["session_id"], call_type="booking")
+                record.booking_status.payment_required = False
+                session_store.upsert(record)
+            await event_bus.publish(
+                row["session_id"],
+                {
+                    "type": f"payment.{target.value.lower()}",
+                    "payment_id": row["id"],
+                    "provider": (row["extras"] or {}).get("provider"),
+                    "amount": float(row["amount"]) if row["amount"] is not None else None,
+                    "currency": row["currency"],
+                    "transaction_id": (row["extras"] or {}).get("transaction_id"),
+                    "booking_id": row["booking_id"],
+                    "reason": result.reason,
+                },
+            )
+        return dict(row)
+
+    async def _claim(self, payment_id: int, expected: PaymentStatus) -> Any:
+        """Lease the row for one gateway call, or return None if it is settled or taken.
+
+        The row lock only spans this short transaction; ``claimed_until`` is what keeps
+        other workers away while the gateway call runs with no connection held.
+        """
+
+        claimable = (
+            select(Payment.id)
+            .where(
+                Payment.id == payment_id,
+                Payment.status == expected,
+                or_(Payment.claimed_until.is_(None), Payment.claimed_until < func.now()),
+            )
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with self.session_factory() as session:
+            payment = (
+                await session.execute(
+                    update(Payment)
+                    .where(Payment.id == claimable)
+                    .values(claimed_until=func.now() + timedelta(seconds=self.lease))
+                    .returning(
+                        Payment.id,
+                        Payment.amount,
+                        Payment.currency,
+                        Payment.sandbox_reference,
+                        Payment.extras,
+                    )
+                )
+            ).first()
+            await session.commit()
+        if payment is None:
+            metrics.increment("payment_claims_skipped_total")
+        return payment
+
+    async def _release(self, payment_id: int, retry_after: float = 0.0) -> None:
+        claimed_until = func.now() + timedelta(seconds=retry_after) if retry_after > 0 else None
+        async with self.session_factory() as session:
+            await session.execute(update(Payment).where(Payment.id == payment_id).values(claimed_until=claimed_until))
+            await session.commit()
+
+    async def requeue_pending(self) -> int:
+        """Queue every PENDING payment that is unclaimed or whose claim has lapsed."""
+
+        async with self.session_factory() as session:
+            pending = (
+                await session.execute(
+                    select(Payment.id)
+                    .where(
+                        Payment.status == PaymentStatus.PENDING,
+                        or_(Payment.claimed_until.is_(None), Payment.claimed_until < func.now()),
+                    )
+                    .order_by(Payment.created_at)
+                )
+            ).scalars().all()
+            await session.rollback()
+        requeued = 0
+        for payment_id in pending:
+            if payment_id not in self._queued:
+                self.submit(payment_id)
+                requeued += 1
+        return requeued
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._run(), name=f"payment-worker-{index}") for index in range(self.concurrency)
+        ]
+        self._sweeper = loop.create_task(self._sweep(), name="payment-worker-sweep")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let in-progress gateway calls finish (up to ``timeout``), then stop the workers.
+
+        Queued payments that were not started stay PENDING and unclaimed, so the next
+        sweep in any process picks them up. A call still running after ``timeout`` is
+        cancelled; its claim keeps it from being retried until the lease runs out.
+        """
+
+        if not self._tasks:
+            return
+        self._stopping = True
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        if self._queue is not None:
+            for _ in range(self.concurrency):
+                self._queue.put_nowait(None)
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._queued.clear()
+
+    async def _sweep(self) -> None:
+        while not self._stopping:
+            try:
+                requeued = await self.requeue_pending()
+            except Exception as exc:
+                logger.warning("payment_sweep_failed", extra={"error": str(exc)})
+            else:
+                if requeued:
+                    metrics.increment("payments_requeued_total", requeued)
+                    logger.info("payments_requeued", extra={"count": requeued})
+            await asyncio.sleep(self.sweep_interval)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            item = await queue.get()
+            if item is None or self._stopping:
+                return
+            payment_id, action = item
+            if action == "charge":
+                self._queued.discard(payment_id)
+            metrics.set_gauge("payment_queue_depth", queue.qsize())
+            try:
+                await self.process(payment_id, action)
+            except Exception as exc:
+                logger.warning("payment_processing_failed", extra={"payment_id": payment_id, "error": str(exc)})
+            finally:
+                queue.task_done()
+
+
+_payment_worker: PaymentWorker | None = None
+
+
+def get_payment_worker() -> PaymentWorker:
+    global _payment_worker
+    if _payment_worker is None:
+        settings = get_settings()
+        _payment_worker = PaymentWorker(
+            concurrency=settings.payment_worker_concurrency,
+            lease=settings.payment_claim_lease_seconds,
+            retry_backoff=settings.payment_retry_backoff_seconds,
+            sweep_interval=settings.payment_sweep_interval_seconds,
+        )
+    return _payment_worker
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+MAX_OCCURRENCES = 366
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """Subset of RFC 5545 RRULE: ``DAILY``/``WEEKLY`` with ``INTERVAL``, ``BYDAY``, ``COUNT``/``UNTIL``.
+
+    Occurrences keep the wall-clock time of the series start. A rule must be bounded by
+    ``count`` or ``until`` and never yields more than :data:`MAX_OCCURRENCES`.
+    """
+
+    freq: str = "WEEKLY"
+    interval: int = 1
+    by_weekday: tuple[int, ...] = field(default_factory=tuple)
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        if self.freq not in {"DAILY", "WEEKLY"}:
+            raise ValueError("freq must be DAILY or WEEKLY")
+        if self.interval < 1:
+            raise ValueError("interval must be positive")
+        if self.count is None and self.until is None:
+            raise ValueError("A recurrence needs count or until")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RecurrenceRule":
+        until = data.get("until")
+        if isinstance(until, str):
+            until = datetime.fromisoformat(until)
+        return cls(
+            freq=data.get("freq", "WEEKLY"),
+            interval=int(data.get("interval", 1)),
+            by_weekday=tuple(sorted(WEEKDAYS.index(day) if isinstance(day, str) else int(day) for day in data.get("by_weekday", ()))),
+            count=data.get("count"),
+            until=until,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "freq": self.freq,
+            "interval": self.interval,
+            "by_weekday": [WEEKDAYS[day] for day in self.by_weekday],
+            "count": self.count,
+            "until": self.until.isoformat() if self.until else None,
+        }
+
+    def occurrences(self, starts_at: datetime) -> list[datetime]:
+        """Every occurrence start of the series, in order."""
+
+        limit = min(self.count or MAX_OCCURRENCES, MAX_OCCURRENCES)
+        until = self.until
+        if until is not None and until.tzinfo is None and starts_at.tzinfo is not None:
+            until = until.replace(tzinfo=starts_at.tzinfo)
+        if self.freq == "DAILY":
+            period, offsets = timedelta(days=self.interval), (timedelta(0),)
+        else:
+            # Anchor each period on the Monday of the start week, then add the chosen days.
+            period = timedelta(weeks=self.interval)
+            days = self.by_weekday or (starts_at.weekday(),)
+            offsets = tuple(timedelta(days=day - starts_at.weekday()) for day in days)
+
+        result: list[datetime] = []
+        period_index = 0
+        while len(result) < limit:
+            base = starts_at + period * period_index
+            for offset in offsets:
+                occurrence = base + offset
+                if occurrence < starts_at:
+                    continue
+                if until is not None and occurrence > until:
+                    return result
+                result.append(occurrence)
+                if len(result) == limit:
+                    break
+            period_index += 1
+        return result
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.database import POOL_REPORTING, resolve_session_factory
+from app.db.queries import conflicting_slots_stmt, requested_slots, room_lock_expr
+from app.models import Booking, BookingSeries, BookingSeriesException, BookingStatus
+from app.services.availability_service import mark_availability_changed
+from app.services.booking_service import (
+    BookingConflictError,
+    BookingPayload,
+    BookingService,
+    CustomerPayload,
+    get_booking_service,
+)
+from app.services.outbox import TOPIC_BOOKING_CONFIRMED, booking_confirmed_payload, get_outbox_dispatcher, outbox_stmt
+from app.services.recurrence import RecurrenceRule
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SeriesConflictError(BookingConflictError):
+    """Raised when occurrences of a series overlap existing bookings and skipping was not allowed."""
+
+    def __init__(self, message: str, occurrences: list[datetime]) -> None:
+        super().__init__(message)
+        self.occurrences = occurrences
+
+
+@dataclass
+class SeriesConfirmation:
+    """Outcome of :meth:`RecurringBookingService.create_series`."""
+
+    id: int
+    session_id: Optional[str]
+    venue: Dict[str, Any]
+    room: Dict[str, Any]
+    customer: Dict[str, Any]
+    rule: Dict[str, Any]
+    starts_at: datetime
+    duration_minutes: int
+    occurrence_count: int
+    conflicts: list[datetime]
+    materialized: list[Dict[str, Any]]
+    materialized_until: datetime
+
+
+class RecurringBookingService:
+    """Books recurring series as one parent row plus exceptions.
+
+    Only occurrences inside the rolling horizon become ``bookings`` rows (with door codes);
+    later ones are materialized by :class:`SeriesMaterializer` as the horizon advances.
+    Every occurrence is conflict-checked when the series is created. Occurrences taken
+    by someone else before they are materialized are recorded as ``conflict`` exceptions
+    at that point.
+    """
+
+    def __init__(self, booking_service: BookingService | None = None, horizon: timedelta | None = None) -> None:
+        self.booking_service = booking_service or get_booking_service()
+        self.horizon = horizon or timedelta(days=get_settings().recurring_horizon_days)
+
+    async def _conflicting(
+        self,
+        session: AsyncSession,
+        room_id: str,
+        starts: list[datetime],
+        duration: timedelta,
+        holder_session_id: Optional[str],
+    ) -> list[datetime]:
+        if not starts:
+            return []
+        slots = requested_slots([(index, room_id, start, start + duration) for index, start in enumerate(starts)])
+        indexes = (await session.execute(conflicting_slots_stmt(slots, holder_session_id))).scalars().all()
+        return sorted(starts[index] for index in indexes)
+
+    async def _book_occurrences(
+        self,
+        session: AsyncSession,
+        series: Dict[str, Any],
+        starts: list[datetime],
+        conflicts: list[datetime],
+    ) -> list[Dict[str, Any]]:
+        """Record ``conflicts`` as exceptions and insert ``starts`` with door codes and outbox messages."""
+
+        if conflicts:
+            await session.execute(
+                pg_insert(BookingSeriesException)
+                .values([{"series_id": series["id"], "occurrence_start": start, "reason": "conflict"} for start in conflicts])
+                .on_conflict_do_nothing(index_elements=["series_id", "occurrence_start"])
+            )
+        if not starts:
+            return []
+
+        duration = timedelta(minutes=series["duration_minutes"])
+        rows = (
+            await session.execute(
+                pg_insert(Booking)
+                .values(
+                    [
+                        {
+                            "series_id": series["id"],
+                            "session_id": series["session_id"],
+                            "customer_id": series["customer_id"],
+                            "venue_id": series["venue_id"],
+                            "room_id": series["room_id"],
+                            "status": BookingStatus.CONFIRMED,
+                            "start_time": start,
+                            "end_time": start + duration,
+                            "duration_minutes": series["duration_minutes"],
+                            "attendee_count": series["attendee_count"],
+                            "notes": series["notes"],
+                            "details": series["details"],
+                        }
+                        for start in starts
+                    ]
+                )
+                .on_conflict_do_nothing(
+                    index_elements=["series_id", "start_time"],
+                    index_where=Booking.series_id.is_not(None),
+                )
+                .returning(Booking.id, Booking.start_time, Booking.end_time)
+            )
+        ).all()
+        if not rows:
+            return []
+
+        for row in rows:
+            mark_availability_changed(session, series["venue_id"], series["room_id"], row.start_time, row.end_time)
+        door_access_service = self.booking_service.door_access_service
+        await door_access_service.prepare(session, series["venue_id"])
+        occurrences = sorted(rows, key=lambda row: row.start_time)
+        door_rows: list[Dict[str, Any]] = []
+        for row in occurrences:
+            door_code, instructions, expires_at = door_access_service.plan_access(
+                row.start_time, row.end_time, venue_id=series["venue_id"]
+            )
+            door_rows.append(
+                {
+                    "booking_id": row.id,
+                    "venue_id": series["venue_id"],
+                    "door_code": door_code,
+                    "instructions": instructions,
+                    "expires_at": expires_at,
+                    "context": {"source": "series", "series_id": series["id"]},
+                }
+            )
+        await door_access_service.insert_access_rows(session, series["venue_id"], door_rows)
+        materialized = [
+            {"booking_id": row.id, "start_time": row.start_time, "end_time": row.end_time, "door_code": door["door_code"]}
+            for row, door in zip(occurrences, door_rows)
+        ]
+        await session.execute(
+            outbox_stmt(
+                TOPIC_BOOKING_CONFIRMED,
+                [
+                    booking_confirmed_payload(
+                        row["booking_id"],
+                        series["session_id"],
+                        series["room_id"],
+                        occurrence["start_time"],
+                        row["door_code"],
+                        row["expires_at"],
+                        venue_id=series["venue_id"],
+                    )
+                    for row, occurrence in zip(door_rows, materialized)
+                ],
+            )
+        )
+        metrics.increment("booking_series_occurrences_materialized_total", len(materialized))
+        return materialized
+
+    async def create_series(
+        self,
+        session: AsyncSession,
+        customer_payload: CustomerPayload,
+        booking_payload: BookingPayload,
+        rule: RecurrenceRule,
+        skip_conflicts: bool = False,
+    ) -> SeriesConfirmation:
+        """Expand ``rule``, check every occurrence in one query, store the series and its horizon.
+
+        Raises :class:`SeriesConflictError` listing the clashing occurrences unless
+        ``skip_conflicts`` is set, in which case they become exceptions of the series.
+        """
+
+        if not booking_payload.room_id:
+            raise ValueError("A recurring booking needs a room")
+        if not booking_payload.start_time or not booking_payload.duration_minutes:
+            raise ValueError("A recurring booking needs start_time and duration_minutes")
+        starts_at = booking_payload.start_time
+        if starts_at.tzinfo is None:
+            starts_at = starts_at.replace(tzinfo=timezone.utc)
+        duration = timedelta(minutes=booking_payload.duration_minutes)
+        starts = rule.occurrences(starts_at)
+        if not starts:
+            raise ValueError("The recurrence rule yields no occurrences")
+
+        try:
+            venue, room = await self.booking_service._lock_room_and_load_context(
+                session, booking_payload.venue_id, booking_payload.room_id
+            )
+            conflicts = await self._conflicting(session, booking_payload.room_id, starts, duration, booking_payload.session_id)
+            if conflicts and not skip_conflicts:
+                raise SeriesConflictError(
+                    f"{len(conflicts)} of {len(starts)} occurrences overlap existing bookings", conflicts
+                )
+
+            customer = (
+                await session.execute(self.booking_service._customer_upsert_stmt(customer_payload))
+            ).mappings().one()
+            horizon_end = max(datetime.now(timezone.utc), starts_at) + self.horizon
+            series = {
+                "session_id": booking_payload.session_id,
+                "customer_id": customer["id"],
+                "venue_id": booking_payload.venue_id,
+                "room_id": booking_payload.room_id,
+                "status": BookingStatus.CONFIRMED,
+                "rule": rule.to_dict(),
+                "starts_at": starts_at,
+                "duration_minutes": booking_payload.duration_minutes,
+                "attendee_count": booking_payload.attendee_count,
+                "notes": booking_payload.notes,
+                "details": booking_payload.details,
+                "materialized_until": horizon_end,
+            }
+            series["id"] = (
+                await session.execute(insert(BookingSeries).values(**series).returning(BookingSeries.id))
+            ).scalar_one()
+
+            skipped = set(conflicts)
+            materialized = await self._book_occurrences(
+                session,
+                series,
+                [start for start in starts if start <= horizon_end and start not in skipped],
+                conflicts,
+            )
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        get_outbox_dispatcher().notify()
+
+        return SeriesConfirmation(
+            id=series["id"],
+            session_id=booking_payload.session_id,
+            venue=venue,
+            room=room,
+            customer=dict(customer),
+            rule=series["rule"],
+            starts_at=starts_at,
+            duration_minutes=booking_payload.duration_minutes,
+            occurrence_count=len(starts),
+            conflicts=conflicts,
+            materialized=materialized,
+            materialized_until=horizon_end,
+        )
+
+    async def materialize(self, session: AsyncSession, series_id: int, horizon_end: datetime | None = None) -> list[Dict[str, Any]]:
+        """Advance one series' horizon: book the next occurrences, recording late conflicts."""
+
+        horizon_end = horizon_end or datetime.now(timezone.utc) + self.horizon
+        try:
+            row = (
+                await session.execute(
+                    select(BookingSeries, room_lock_expr(BookingSeries.room_id).label("room_lock"))
+                    .where(BookingSeries.id == series_id, BookingSeries.status == BookingStatus.CONFIRMED)
+                    .with_for_update(of=BookingSeries)
+                )
+            ).first()
+            if row is None or row.BookingSeries.materialized_until >= horizon_end:
+                await session.rollback()
+                return []
+            series_row: BookingSeries = row.BookingSeries
+            skipped = {exception.occurrence_start for exception in series_row.exceptions}
+            starts = [
+                start
+                for start in RecurrenceRule.from_dict(series_row.rule).occurrences(series_row.starts_at)
+                if series_row.materialized_until < start <= horizon_end and start not in skipped
+            ]
+            series = {
+                "id": series_row.id,
+                "session_id": series_row.session_id,
+                "customer_id": series_row.customer_id,
+                "venue_id": series_row.venue_id,
+                "room_id": series_row.room_id,
+                "duration_minutes": series_row.duration_minutes,
+                "attendee_count": series_row.attendee_count,
+                "notes": series_row.notes,
+                "details": series_row.details,
+            }
+            conflicts = await self._conflicting(
+                session, series_row.room_id, starts, timedelta(minutes=series_row.duration_minutes), series_row.session_id
+            )
+            late = set(conflicts)
+            materialized = await self._book_occurrences(
+                session, series, [start for start in starts if start not in late], conflicts
+            )
+            await session.execute(
+                update(BookingSeries).where(BookingSeries.id == series_id).values(materialized_until=horizon_end)
+            )
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        get_outbox_dispatcher().notify()
+
+        if conflicts:
+            logger.warning("booking_series_late_conflicts", extra={"series_id": series_id, "count": len(conflicts)})
+        return materialized
+
+
+class SeriesMaterializer:
+    """Background task that keeps every active series materialized up to the horizon."""
+
+    def __init__(
+        self,
+        service: RecurringBookingService | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        interval: float = 3600.0,
+        batch_size: int = 100,
+    ) -> None:
+        self._service = service
+        self._session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def service(self) -> RecurringBookingService:
+        if self._service is None:
+            self._service = RecurringBookingService()
+        return self._service
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory, POOL_REPORTING)
+
+    async def run_once(self) -> int:
+        horizon_end = datetime.now(timezone.utc) + self.service.horizon
+        async with self.session_factory() as session:
+            due = (
+                await session.execute(
+                    select(BookingSeries.id)
+                    .where(BookingSeries.status == BookingStatus.CONFIRMED, BookingSeries.materialized_until < horizon_end)
+                    .order_by(BookingSeries.materialized_until)
+                    .limit(self.batch_size)
+                )
+            ).scalars().all()
+            await session.rollback()
+        total = 0
+        for series_id in due:
+            async with self.session_factory() as session:
+                total += len(await self.service.materialize(session, series_id, horizon_end))
+        return total
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="series-materializer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                logger.warning("booking_series_materialize_failed", extra={"error": str(exc)})
+            await asyncio.sleep(self.interval)
+
+
+def get_recurring_booking_service() -> RecurringBookingService:
+    return RecurringBookingService()
+
+
+_series_materializer: SeriesMaterializer | None = None
+
+
+def get_series_materializer() -> SeriesMaterializer:
+    global _series_materializer
+    if _series_materializer is None:
+        _series_materializer = SeriesMaterializer(interval=get_settings().recurring_materialize_interval_seconds)
+    return _series_materializer
@@ -4,26 +4,79 @@ import asyncio
 import logging
 from typing import Dict
 
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.database import resolve_session_factory
+from app.models import CallLog
 from app.stores.session_store import session_store
 
 logger = logging.getLogger(__name__)
 
 
 class SummaryService:
-    """Generates summaries for completed calls (stub implementation)."""
+    """Generates summaries for completed calls (stub implementation); driven by the outbox.
+
+    The summary is written to the session's ``call_logs`` row, so it survives a restart
+    and is visible to every process; the in-memory session store only mirrors it.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
+        self._session_factory = session_factory
 
-    def schedule_summary(self, session_id: str) -> None:
-        asyncio.create_task(self._generate_summary(session_id))
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory)
 
-    async def _generate_summary(self, session_id: str) -> None:
+    async def generate_summary(self, session_id: str) -> None:
         await asyncio.sleep(0)  # placeholder async work
         summary: Dict[str, str] = {
             "headline": "Summary generation stub",
             "notes": "Hook up OpenAI responses here.",
         }
+        await self.store_summary(session_id, summary)
         session_store.update_summary(session_id, summary)
         logger.info("Summary generated", extra={"session_id": session_id})
 
+    async def store_summary(self, session_id: str, summary: Dict[str, str]) -> None:
+        """Record ``summary`` on the session's call log; a redelivery overwrites it."""
+
+        record = session_store.get(session_id)
+        async with self.session_factory() as session:
+            log_id = (
+                await session.execute(
+                    select(CallLog.id)
+                    .where(CallLog.session_id == session_id, CallLog.payload.has_key("summary"))
+                    .order_by(CallLog.id)
+                    .limit(1)
+                    .with_for_update()
+                )
+            ).scalar()
+            if log_id is None:
+                await session.execute(
+                    insert(CallLog).values(
+                        session_id=session_id,
+                        call_type=record.call_type if record else None,
+                        payload={"summary": summary},
+                    )
+                )
+            else:
+                await session.execute(update(CallLog).where(CallLog.id == log_id).values(payload={"summary": summary}))
+            await session.commit()
+
+    async def get_summary(self, session_id: str) -> Dict[str, str] | None:
+        async with self.session_factory() as session:
+            payload = (
+                await session.execute(
+                    select(CallLog.payload)
+                    .where(CallLog.session_id == session_id, CallLog.payload.has_key("summary"))
+                    .order_by(CallLog.id.desc())
+                    .limit(1)
+                )
+            ).scalar()
+            await session.rollback()
+        return payload["summary"] if payload else None
+
 
 _summary_service: SummaryService | None = None
 
@@ -22,7 +22,18 @@ class VapiService:
 
     def __init__(self) -> None:
         self.settings = get_settings()
-        self._client = httpx.AsyncClient(timeout=20.0)
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=20.0)
+        return self._client
+
+    async def aclose(self) -> None:
+        client = getattr(self, "_client", None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
 
     def is_configured(self) -> bool:
         return bool(self.settings.vapi_private_key)
@@ -32,7 +43,7 @@ class VapiService:
         headers = self._headers()
 
         try:
-            response = await self._client.post(
+            response = await self.client.post(
                 f"{self.BASE_URL}/calls",
                 headers=headers,
                 json=payload,
@@ -63,7 +74,7 @@ class VapiService:
         headers = self._headers()
         payload = {"toolCallId": tool_call_id, "result": result}
         try:
-            response = await self._client.post(
+            response = await self.client.post(
                 f"{self.BASE_URL}/calls/{call_id}/tool-results",
                 headers=headers,
                 json=payload,
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.db.database import POOL_REPORTING, read_pool_name, resolve_session_factory
+from app.models import Room, Venue
+from app.serializers import venue_catalog_stmt, venue_shapes
+from app.stores.venue_catalog import CatalogEntry, CatalogSnapshot, VenueCatalog
+from app.utils.config import get_settings
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "venue_catalog"
+_DIRTY_KEY = "venue_catalog_dirty"
+
+
+def _touches_catalog(session: Session) -> bool:
+    return any(isinstance(obj, (Venue, Room)) for obj in (*session.new, *session.dirty, *session.deleted))
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_on_catalog_flush(session: Session, _flush_context: Any) -> None:
+    # NOTIFY is transactional: other processes hear it on commit and never on rollback.
+    if session.info.get(_DIRTY_KEY) or not _touches_catalog(session):
+        return
+    session.info[_DIRTY_KEY] = True
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_notify(CATALOG_CHANNEL, "")))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_catalog_commit(session: Session) -> None:
+    # This process does not wait for its own notification to come back round.
+    if session.info.pop(_DIRTY_KEY, False):
+        get_venue_catalog_service().invalidate("write")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_catalog_flush(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+async def notify_catalog_changed(session: AsyncSession) -> None:
+    """Invalidate every API process's catalog when ``session`` commits.
+
+    ORM writes to ``Venue``/``Room`` do this on their own; call it after writing the
+    tables with Core statements or raw SQL.
+    """
+
+    session.sync_session.info[_DIRTY_KEY] = True
+    await session.execute(select(func.pg_notify(CATALOG_CHANNEL, "")))
+
+
+class VenueCatalogService:
+    """Serves ``/metadata/venues`` from pre-encoded bytes instead of Postgres.
+
+    The whole catalog is read and encoded once per version. Writes through the ORM,
+    :func:`notify_catalog_changed` and the seed script invalidate it in this process at
+    commit and in the others through ``LISTEN venue_catalog``. A listener reconnect
+    invalidates too, since notifications sent while it was down are lost, and the
+    snapshot's ``max_age`` bounds staleness for writes that bypass both.
+
+    A replica still counts as healthy while it trails by up to
+    ``DATABASE_REPLICA_MAX_LAG_SECONDS``, so the reload after an invalidation reads the
+    primary's reporting pool; only ``max_age`` refreshes go to the replica.
+    """
+
+    def __init__(
+        self,
+        catalog: VenueCatalog | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        retry_interval: float = 5.0,
+    ) -> None:
+        self.catalog = catalog or VenueCatalog()
+        self._session_factory = session_factory
+        self.retry_interval = retry_interval
+        self._flight: SingleFlight[CatalogSnapshot] = SingleFlight("venue_catalog")
+        self._task: asyncio.Task[None] | None = None
+        self._listening = asyncio.Event()
+        self._subscribers: List[Callable[[], None]] = []
+        # Set by every invalidation; cleared once a primary read has been installed.
+        self._replica_behind = True
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        return resolve_session_factory(self._session_factory, self.read_pool())
+
+    def read_pool(self) -> str:
+        return POOL_REPORTING if self._replica_behind else read_pool_name()
+
+    def on_invalidate(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` whenever the catalog is invalidated, for caches derived from rooms."""
+
+        self._subscribers.append(callback)
+
+    def invalidate(self, reason: str) -> None:
+        self._replica_behind = True
+        version = self.catalog.invalidate()
+        metrics.increment("venue_catalog_invalidations_total", labels={"reason": reason})
+        metrics.set_gauge("venue_catalog_version", version)
+        for callback in self._subscribers:
+            callback()
+
+    async def listing(self) -> CatalogEntry:
+        return (await self._current()).listing
+
+    async def venue(self, venue_id: str) -> Optional[CatalogEntry]:
+        return (await self._current()).venues.get(venue_id)
+
+    async def load(self) -> CatalogSnapshot:
+        version = self.catalog.version
+        async with self.session_factory() as session:
+            rows = (await session.execute(venue_catalog_stmt())).all()
+        snapshot = self.catalog.build(version, venue_shapes(rows))
+        if self.catalog.install(snapshot):
+            # Later max_age refreshes may use the replica again: it trails by seconds, not minutes.
+            self._replica_behind = False
+        else:
+            # Invalidated mid-read: serve it to the callers already waiting, but do not keep it.
+            metrics.increment("venue_catalog_loads_discarded_total")
+        metrics.increment("venue_catalog_loads_total")
+        return snapshot
+
+    async def _current(self) -> CatalogSnapshot:
+        snapshot = self.catalog.snapshot()
+        if snapshot is not None:
+            metrics.increment("venue_catalog_cache_total", labels={"result": "hit"})
+            return snapshot
+        metrics.increment("venue_catalog_cache_total", labels={"result": "miss"})
+        return await self._flight.do("catalog", self.load)
+
+    async def start(self, timeout: float = 5.0) -> None:
+        """Start the listener and wait up to ``timeout`` for its first ``LISTEN``.
+
+        Connecting clears the cache, so serving before that would throw away the first
+        loads; if the database is not reachable in time the app starts anyway.
+        """
+
+        if self._task is not None and not self._task.done():
+            return
+        self._flight.clear()
+        self._listening = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="venue-catalog-listener")
+        listening = asyncio.ensure_future(self._listening.wait())
+        try:
+            await asyncio.wait({self._task, listening}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            listening.cancel()
+        if not self._listening.is_set() and not self._task.done():
+            logger.warning("venue_catalog_listen_pending", extra={"timeout": timeout})
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        url = make_url(get_settings().database_url)
+        if url.get_backend_name() != "postgresql":
+            return
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception as exc:
+                logger.warning("venue_catalog_listen_failed", extra={"error": str(exc)})
+                await asyncio.sleep(self.retry_interval)
+                continue
+            try:
+                connection.add_termination_listener(lambda _connection: closed.set())
+                await connection.add_listener(CATALOG_CHANNEL, lambda *_args: self.invalidate("notify"))
+                self.invalidate("listen")
+                self._listening.set()
+                await closed.wait()
+                logger.warning("venue_catalog_listener_disconnected")
+            finally:
+                await connection.close()
+            await asyncio.sleep(self.retry_interval)
+
+
+_venue_catalog_service: VenueCatalogService | None = None
+
+
+def get_venue_catalog_service() -> VenueCatalogService:
+    global _venue_catalog_service
+    if _venue_catalog_service is None:
+        settings = get_settings()
+        _venue_catalog_service = VenueCatalogService(
+            VenueCatalog(max_age_seconds=settings.venue_catalog_max_age_seconds),
+            retry_interval=settings.venue_catalog_listen_retry_seconds,
+        )
+    return _venue_catalog_service
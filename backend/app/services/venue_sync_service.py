@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Room, Venue
+from app.services.venue_catalog_service import notify_catalog_changed
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_VENUE_FIELDS = ("name", "address", "contact", "policies")
+_ROOM_FIELDS = ("venue_id", "label", "capacity", "amenities", "availability")
+
+
+@dataclass
+class VenueDelta:
+    venue_inserts: List[Dict[str, Any]] = field(default_factory=list)
+    venue_updates: List[Dict[str, Any]] = field(default_factory=list)
+    venue_deletes: List[str] = field(default_factory=list)
+    room_inserts: List[Dict[str, Any]] = field(default_factory=list)
+    room_updates: List[Dict[str, Any]] = field(default_factory=list)
+    room_deletes: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not any(
+            (self.venue_inserts, self.venue_updates, self.venue_deletes, self.room_inserts, self.room_updates, self.room_deletes)
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(getattr(self, name)) for name in self.__dataclass_fields__}
+
+
+def venue_rows(payload: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Column values for the ``venues`` and ``rooms`` tables, keyed by id, from venue file entries."""
+
+    venues: Dict[str, Dict[str, Any]] = {}
+    rooms: Dict[str, Dict[str, Any]] = {}
+    for venue_payload in payload:
+        venue_id = str(venue_payload["id"])
+        venues[venue_id] = {
+            "id": venue_id,
+            "name": venue_payload.get("name", venue_id.title()),
+            "address": venue_payload.get("address"),
+            "contact": venue_payload.get("contact"),
+            "policies": venue_payload.get("policies", {}),
+        }
+        for room_payload in venue_payload.get("rooms", []):
+            room_id = str(room_payload["id"])
+            rooms[room_id] = {
+                "id": room_id,
+                "venue_id": venue_id,
+                "label": room_payload.get("label", room_payload["id"]),
+                "capacity": int(room_payload.get("capacity", 0)),
+                "amenities": room_payload.get("amenities", []),
+                "availability": room_payload.get("availability", {}),
+            }
+    return venues, rooms
+
+
+def _diff(
+    wanted: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    fields: Tuple[str, ...],
+    prune: bool,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+    inserts = [row for key, row in wanted.items() if key not in current]
+    updates = [
+        row
+        for key, row in wanted.items()
+        if key in current and any(row[name] != current[key][name] for name in fields)
+    ]
+    deletes = [key for key in current if key not in wanted] if prune else []
+    return inserts, updates, deletes
+
+
+async def diff_venues(session: AsyncSession, payload: Iterable[Dict[str, Any]], prune: bool = False) -> VenueDelta:
+    """Compare venue file entries with the tables in two reads, one per table.
+
+    With ``prune`` venues and rooms missing from the file are scheduled for deletion;
+    otherwise the file only ever adds and updates.
+    """
+
+    wanted_venues, wanted_rooms = venue_rows(payload)
+    current_venues = {
+        row[0]: dict(zip(("id", *_VENUE_FIELDS), row))
+        for row in await session.execute(select(Venue.id, *(getattr(Venue, name) for name in _VENUE_FIELDS)))
+    }
+    current_rooms = {
+        row[0]: dict(zip(("id", *_ROOM_FIELDS), row))
+        for row in await session.execute(select(Room.id, *(getattr(Room, name) for name in _ROOM_FIELDS)))
+    }
+    delta = VenueDelta()
+    delta.venue_inserts, delta.venue_updates, delta.venue_deletes = _diff(wanted_venues, current_venues, _VENUE_FIELDS, prune)
+    delta.room_inserts, delta.room_updates, delta.room_deletes = _diff(wanted_rooms, current_rooms, _ROOM_FIELDS, prune)
+    return delta
+
+
+async def apply_venue_delta(session: AsyncSession, delta: VenueDelta) -> None:
+    """Write ``delta`` with set-based statements; the caller commits.
+
+    These bypass the ORM flush, so the catalog notification is sent explicitly.
+    """
+
+    if delta.empty:
+        return
+    if delta.room_deletes:
+        await session.execute(delete(Room).where(Room.id.in_(delta.room_deletes)))
+    if delta.venue_deletes:
+        await session.execute(delete(Venue).where(Venue.id.in_(delta.venue_deletes)))
+    if delta.venue_inserts:
+        await session.execute(insert(Venue), delta.venue_inserts)
+    if delta.venue_updates:
+        await session.execute(update(Venue), delta.venue_updates)
+    if delta.room_inserts:
+        await session.execute(insert(Room), delta.room_inserts)
+    if delta.room_updates:
+        await session.execute(update(Room), delta.room_updates)
+    await notify_catalog_changed(session)
+    for name, count in delta.counts().items():
+        if count:
+            metrics.increment("venue_sync_rows_total", count, labels={"change": name})
+    logger.info("venue_sync_applied", extra=delta.counts())
+
+
+async def sync_venues(session: AsyncSession, payload: Iterable[Dict[str, Any]], prune: bool = False) -> VenueDelta:
+    delta = await diff_venues(session, payload, prune=prune)
+    await apply_venue_delta(session, delta)
+    return delta
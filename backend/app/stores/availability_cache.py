@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from threading import RLock
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+DayKey = Tuple[str, date]
+
+_NEVER = math.inf
+
+
+def utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def days_spanned(start: datetime, end: datetime) -> List[date]:
+    """UTC days that ``[start, end)`` overlaps (at least the day ``start`` falls on)."""
+
+    first = utc(start).astimezone(timezone.utc).date()
+    last = (utc(end).astimezone(timezone.utc) - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=offset) for offset in range(max(0, (last - first).days) + 1)]
+
+
+@dataclass(frozen=True)
+class RoomOccupancy:
+    """Blocking intervals of one room on one day as parallel arrays of epoch seconds.
+
+    ``blocks_until`` is ``inf`` for bookings and the hold expiry for PENDING holds, so an
+    expired hold stops blocking without the entry being reloaded.
+    """
+
+    room_id: str
+    label: str
+    capacity: int
+    starts: array = field(default_factory=lambda: array("d"))
+    ends: array = field(default_factory=lambda: array("d"))
+    blocks_until: array = field(default_factory=lambda: array("d"))
+    holders: Tuple[Optional[str], ...] = ()
+
+    def blockers(self, start: float, end: float, session_id: Optional[str], now: float) -> Tuple[bool, bool]:
+        """``(booked, held)`` for ``[start, end)``; the caller's own holds never block it."""
+
+        booked = held = False
+        for index in range(len(self.starts)):
+            if self.starts[index] >= end:
+                break  # sorted by start
+            if self.ends[index] <= start:
+                continue
+            until = self.blocks_until[index]
+            if until == _NEVER:
+                booked = True
+            elif until > now and self.holders[index] != session_id:
+                held = True
+        return booked, held
+
+
+def build_occupancy(
+    room_id: str,
+    label: str,
+    capacity: int,
+    intervals: Iterable[Tuple[datetime, datetime, Optional[datetime], Optional[str]]],
+) -> RoomOccupancy:
+    """``intervals`` are ``(start, end, hold_expires_at, session_id)`` ordered by start."""
+
+    occupancy = RoomOccupancy(room_id=room_id, label=label, capacity=capacity)
+    holders: List[Optional[str]] = []
+    for start, end, hold_expires_at, session_id in intervals:
+        occupancy.starts.append(utc(start).timestamp())
+        occupancy.ends.append(utc(end).timestamp())
+        occupancy.blocks_until.append(_NEVER if hold_expires_at is None else utc(hold_expires_at).timestamp())
+        holders.append(session_id if hold_expires_at is not None else None)
+    return replace(occupancy, holders=tuple(holders))
+
+
+@dataclass(frozen=True)
+class DaySnapshot:
+    """Occupancy of every room of a venue on one UTC day.
+
+    ``stale`` lists rooms invalidated since the snapshot was loaded; only those are
+    re-read on the next lookup.
+    """
+
+    venue_id: str
+    day: date
+    rooms: Tuple[RoomOccupancy, ...]
+    loaded_at: float = field(default_factory=time.monotonic)
+    stale: FrozenSet[str] = frozenset()
+
+    @property
+    def key(self) -> DayKey:
+        return (self.venue_id, self.day)
+
+    def with_rooms(self, fresh: Sequence[RoomOccupancy]) -> "DaySnapshot":
+        by_id = {room.room_id: room for room in fresh}
+        return replace(
+            self,
+            rooms=tuple(by_id.get(room.room_id, room) for room in self.rooms),
+            stale=self.stale - by_id.keys(),
+        )
+
+
+class AvailabilityCache:
+    """Thread-safe LRU + TTL map of ``(venue_id, day)`` to :class:`DaySnapshot`.
+
+    Loads are bracketed by :meth:`begin_load` and :meth:`install`; an invalidation of the
+    key in between makes :meth:`install` refuse the result, so a slow read can never put
+    back occupancy older than a committed write.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[DayKey, DaySnapshot]" = OrderedDict()
+        self._loads: Dict[DayKey, int] = {}
+        self._lock = RLock()
+
+    def get(self, key: DayKey) -> Optional[DaySnapshot]:
+        """The cached snapshot, possibly with ``stale`` rooms; counts a hit only when it has none."""
+
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None and time.monotonic() - snapshot.loaded_at > self.ttl_seconds:
+                del self._entries[key]
+                snapshot = None
+            if snapshot is None or snapshot.stale:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if snapshot is not None:
+                self._entries.move_to_end(key)
+            return snapshot
+
+    def peek(self, key: DayKey) -> Optional[DaySnapshot]:
+        """The entry as it is, even if stale or past its TTL; not counted as a hit or miss."""
+
+        with self._lock:
+            return self._entries.get(key)
+
+    def begin_load(self, key: DayKey) -> Tuple[int, Optional[DaySnapshot]]:
+        """A load token plus the live entry to refresh (``None`` means load the day in full)."""
+
+        with self._lock:
+            token = self._loads.get(key, 0) + 1
+            self._loads[key] = token
+            snapshot = self._entries.get(key)
+            if snapshot is not None and time.monotonic() - snapshot.loaded_at > self.ttl_seconds:
+                snapshot = None
+            return token, snapshot
+
+    def install(self, snapshot: DaySnapshot, token: int) -> bool:
+        with self._lock:
+            if self._loads.get(snapshot.key) != token:
+                return False
+            del self._loads[snapshot.key]
+            self._entries[snapshot.key] = snapshot
+            self._entries.move_to_end(snapshot.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def abandon(self, key: DayKey, token: int) -> None:
+        with self._lock:
+            if self._loads.get(key) == token:
+                del self._loads[key]
+
+    def invalidate(self, venue_id: str, room_id: str, days: Iterable[date]) -> int:
+        """Mark ``room_id`` stale on ``days``; returns how many cached days it touched."""
+
+        touched = 0
+        with self._lock:
+            for day in days:
+                key = (venue_id, day)
+                if key in self._loads:
+                    self._loads[key] += 1
+                snapshot = self._entries.get(key)
+                if snapshot is not None and any(room.room_id == room_id for room in snapshot.rooms):
+                    self._entries[key] = replace(snapshot, stale=snapshot.stale | {room_id})
+                    touched += 1
+        return touched
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for key in self._loads:
+                self._loads[key] += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        with self._lock:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
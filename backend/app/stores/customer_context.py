@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class CustomerContext:
+    """What we already know about a caller, keyed by E.164 phone number."""
+
+    phone_number: str
+    customer: Optional[Dict[str, Any]] = None
+    recent_bookings: List[Dict[str, Any]] = field(default_factory=list)
+    preferred_rooms: List[str] = field(default_factory=list)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def known(self) -> bool:
+        return self.customer is not None
+
+
+class CustomerContextCache:
+    """Thread-safe LRU + TTL cache of caller context, plus the session -> phone binding."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 900.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CustomerContext]" = OrderedDict()
+        self._sessions: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = RLock()
+
+    def put(self, context: CustomerContext) -> None:
+        with self._lock:
+            self._entries[context.phone_number] = context
+            self._entries.move_to_end(context.phone_number)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, phone_number: str) -> Optional[CustomerContext]:
+        with self._lock:
+            context = self._entries.get(phone_number)
+            if context is None:
+                return None
+            if time.monotonic() - context.loaded_at > self.ttl_seconds:
+                del self._entries[phone_number]
+                return None
+            self._entries.move_to_end(phone_number)
+            return context
+
+    def invalidate(self, phone_number: str) -> None:
+        with self._lock:
+            self._entries.pop(phone_number, None)
+
+    def bind_session(self, session_id: str, phone_number: str) -> None:
+        with self._lock:
+            self._sessions[session_id] = phone_number
+            self._sessions.move_to_end(session_id)
+            # Sessions outlive their cache entry only briefly; bound the map the same way.
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+
+    def phone_for_session(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def for_session(self, session_id: str) -> Optional[CustomerContext]:
+        phone_number = self.phone_for_session(session_id)
+        return self.get(phone_number) if phone_number else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
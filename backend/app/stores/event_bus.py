@@ -9,6 +9,8 @@ from typing import Any, AsyncIterator, DefaultDict
 
 logger = logging.getLogger(__name__)
 
+_CLOSED: dict[str, Any] = {"type": "closed"}
+
 
 class EventBus:
     """Simple in-memory event bus for streaming session updates."""
@@ -31,7 +33,21 @@ class EventBus:
         queue = self._queues[session_id]
         while True:
             event = await queue.get()
+            if event is _CLOSED:
+                # Pass it on so other streams for the same session end too.
+                queue.put_nowait(_CLOSED)
+                return
             yield event
 
+    async def close(self) -> None:
+        """End every open stream so their SSE responses finish and stop counting as in flight.
+
+        Streams opened afterwards get fresh queues.
+        """
+
+        queues, self._queues = self._queues, defaultdict(asyncio.Queue)
+        for queue in queues.values():
+            queue.put_nowait(_CLOSED)
+
 
 event_bus = EventBus()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import RLock
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """Hashed timing wheel: O(1) schedule, O(bucket) per tick.
+
+    A deadline lands in slot ``tick % slots``; entries more than one rotation away stay
+    in their bucket and are skipped until their tick comes round. Cancellation is left
+    to the caller (compare the fired deadline with the live one).
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 3600, now: Optional[float] = None) -> None:
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self._buckets: List[List[Tuple[int, K]]] = [[] for _ in range(slots)]
+        self._current = int((time.time() if now is None else now) // tick_seconds)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, key: K, deadline: float) -> None:
+        tick = max(math.ceil(deadline / self.tick_seconds), self._current + 1)
+        self._buckets[tick % self.slots].append((tick, key))
+        self._size += 1
+
+    def advance(self, now: float) -> List[Tuple[K, int]]:
+        """Move the wheel to ``now`` and return ``(key, tick)`` for every deadline passed."""
+
+        target = int(now // self.tick_seconds)
+        if target <= self._current:
+            return []
+        fired: List[Tuple[K, int]] = []
+        # After a full rotation every bucket has been visited once, so a long pause costs
+        # at most ``slots`` bucket scans.
+        for tick in range(self._current + 1, min(target, self._current + self.slots) + 1):
+            index = tick % self.slots
+            bucket = self._buckets[index]
+            if not bucket:
+                continue
+            keep: List[Tuple[int, K]] = []
+            for due, key in bucket:
+                if due <= target:
+                    fired.append((key, due))
+                else:
+                    keep.append((due, key))
+            self._buckets[index] = keep
+        self._current = target
+        self._size -= len(fired)
+        return fired
+
+
+@dataclass(frozen=True)
+class KeypadEntry:
+    """The booking window a door code opens; times are epoch seconds for cheap comparisons."""
+
+    booking_id: Optional[int]
+    room_id: Optional[str]
+    valid_from: float
+    valid_until: float
+
+
+@dataclass(frozen=True)
+class KeypadDecision:
+    granted: bool
+    reason: str
+    entry: Optional[KeypadEntry] = None
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class KeypadIndex:
+    """Thread-safe map of ``(venue_id, code)`` to the window the code is valid for.
+
+    Expired entries are dropped by a :class:`TimerWheel`; :meth:`verify` also checks
+    the window itself, so correctness never depends on how often :meth:`expire` runs.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 3600) -> None:
+        self._entries: Dict[Tuple[str, str], KeypadEntry] = {}
+        self._wheel: TimerWheel[Tuple[str, str]] = TimerWheel(tick_seconds, slots)
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        venue_id: str,
+        code: str,
+        booking_id: Optional[int],
+        room_id: Optional[str],
+        valid_from: datetime,
+        valid_until: datetime,
+    ) -> None:
+        entry = KeypadEntry(booking_id, room_id, _epoch(valid_from), _epoch(valid_until))
+        with self._lock:
+            self._entries[(venue_id, code)] = entry
+            self._wheel.schedule((venue_id, code), entry.valid_until)
+
+    def remove(self, venue_id: str, code: str, booking_id: Optional[int] = None) -> None:
+        """Drop a code, or only its entry for ``booking_id`` if the code has since been reused."""
+
+        with self._lock:
+            entry = self._entries.get((venue_id, code))
+            if entry is not None and (booking_id is None or entry.booking_id == booking_id):
+                del self._entries[(venue_id, code)]
+
+    def verify(self, venue_id: str, code: str, room_id: Optional[str] = None, now: Optional[float] = None) -> KeypadDecision:
+        # A plain dict read is atomic under the GIL; the lock only guards compound updates.
+        entry = self._entries.get((venue_id, code))
+        if entry is None:
+            return KeypadDecision(False, "unknown_code")
+        now = time.time() if now is None else now
+        if now < entry.valid_from:
+            return KeypadDecision(False, "too_early", entry)
+        if now >= entry.valid_until:
+            return KeypadDecision(False, "expired", entry)
+        if room_id is not None and entry.room_id is not None and room_id != entry.room_id:
+            return KeypadDecision(False, "wrong_room", entry)
+        return KeypadDecision(True, "granted", entry)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            for key, tick in self._wheel.advance(now):
+                entry = self._entries.get(key)
+                # Skip wheel slots left behind by a code that was re-added with a later window.
+                if entry is not None and math.ceil(entry.valid_until / self._wheel.tick_seconds) <= tick:
+                    del self._entries[key]
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._wheel = TimerWheel(self._wheel.tick_seconds, self._wheel.slots)
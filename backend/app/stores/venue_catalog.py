@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Dict, List, Optional
+
+from app.serializers import dumps
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One encoded response body and its strong ETag."""
+
+    body: bytes
+    etag: str
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    listing: CatalogEntry
+    venues: Dict[str, CatalogEntry]
+    loaded_at: float
+
+
+def make_etag(body: bytes) -> str:
+    # Derived from the bytes, so a reload that yields the same catalog keeps clients' 304s.
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _entry(content: Any) -> CatalogEntry:
+    body = dumps(content)
+    return CatalogEntry(body=body, etag=make_etag(body))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` uses the weak comparison, so a ``W/`` prefix still matches."""
+
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class VenueCatalog:
+    """Thread-safe, versioned snapshot of the encoded venue catalog.
+
+    Every :meth:`invalidate` bumps the version and drops the snapshot. A load records
+    the version it started at and :meth:`install` refuses it if the catalog was
+    invalidated meanwhile, so a slow read can never resurrect data older than a write.
+    """
+
+    def __init__(self, max_age_seconds: float = 300.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = RLock()
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return None
+            if time.monotonic() - snapshot.loaded_at > self.max_age_seconds:
+                self._snapshot = None
+                return None
+            return snapshot
+
+    def build(self, version: int, venues: List[Dict[str, Any]]) -> CatalogSnapshot:
+        return CatalogSnapshot(
+            version=version,
+            listing=_entry(venues),
+            venues={venue["id"]: _entry(venue) for venue in venues},
+            loaded_at=time.monotonic(),
+        )
+
+    def install(self, snapshot: CatalogSnapshot) -> bool:
+        with self._lock:
+            if snapshot.version != self._version:
+                return False
+            self._snapshot = snapshot
+            return True
+
+    def invalidate(self) -> int:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+            return self._version
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import Histogram, metrics
+
+PRIORITY_CRITICAL = 0
+PRIORITY_HIGH = 1
+PRIORITY_LOW = 2
+
+# Tool and webhook bodies are small; anything bigger is not worth parsing for a session id.
+_MAX_SESSION_BODY = 64 * 1024
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    """Requests that share a concurrency limit and a shedding priority (0 is shed last).
+
+    A path matches a pattern ending in ``/`` by prefix and any other pattern exactly.
+    """
+
+    name: str
+    priority: int
+    methods: FrozenSet[str]
+    paths: Tuple[str, ...]
+    session_from_body: bool = False
+    limit_source: bool = False
+
+    def matches(self, method: str, path: str) -> bool:
+        if method not in self.methods:
+            return False
+        return any(path.startswith(pattern) if pattern.endswith("/") else path == pattern for pattern in self.paths)
+
+
+# First match wins, so the narrow low-priority routes come before the tool prefix.
+DEFAULT_ROUTE_CLASSES: Tuple[RouteClass, ...] = (
+    RouteClass(
+        "survey", PRIORITY_LOW, frozenset({"POST"}), ("/api/vapi/tools/survey",), session_from_body=True, limit_source=True
+    ),
+    RouteClass(
+        "dashboard",
+        PRIORITY_LOW,
+        frozenset({"GET"}),
+        ("/api/vapi/tools/bookings", "/api/vapi/tools/payments", "/api/booking/recent", "/api/metadata/"),
+        limit_source=True,
+    ),
+    RouteClass("tool", PRIORITY_CRITICAL, frozenset({"GET", "POST"}), ("/api/vapi/tools/",), session_from_body=True),
+    RouteClass("keypad", PRIORITY_CRITICAL, frozenset({"POST"}), ("/api/access/verify",)),
+    RouteClass("webhook", PRIORITY_HIGH, frozenset({"POST"}), ("/api/calls/webhooks/",), session_from_body=True),
+)
+
+
+class TokenBuckets:
+    """One token bucket per key: ``rate`` tokens a second, holding at most ``burst``.
+
+    Idle keys are evicted least recently used first once there are ``max_keys``; an
+    evicted key simply starts again with a full bucket. A ``rate`` of 0 disables it.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, now: Optional[float] = None) -> float:
+        """Take a token; returns 0 on success, else the seconds until one is available."""
+
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class LoadShedder:
+    """Sheds whole priorities, lowest first, while critical requests miss their latency SLO.
+
+    Every ``window`` seconds the p90 latency of the window's critical requests is compared
+    with ``slo``: above it, one more priority is shed (critical traffic never is); at or
+    below ``recover_ratio * slo``, or with no critical traffic at all, one is let back in.
+    """
+
+    def __init__(
+        self,
+        slo: float,
+        window: float = 2.0,
+        lowest_priority: int = PRIORITY_LOW,
+        recover_ratio: float = 0.8,
+    ) -> None:
+        self.slo = slo
+        self.window = window
+        self.lowest_priority = lowest_priority
+        self.recover_ratio = recover_ratio
+        # Priorities at or above this are rejected; one past the lowest means none are.
+        self.shed_from = lowest_priority + 1
+        self._samples = Histogram()
+        self._window_started = time.monotonic()
+
+    def sheds(self, priority: int) -> bool:
+        return priority >= self.shed_from
+
+    def record(self, latency: float) -> None:
+        self._samples.observe(latency)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if now - self._window_started < self.window:
+            return
+        window = self._samples.snapshot()
+        self._samples = Histogram()
+        self._window_started = now
+        if window["count"] and window["p90"] > self.slo:
+            self.shed_from = max(PRIORITY_CRITICAL + 1, self.shed_from - 1)
+        elif not window["count"] or window["p90"] <= self.slo * self.recover_ratio:
+            self.shed_from = min(self.lowest_priority + 1, self.shed_from + 1)
+        metrics.set_gauge("admission_shed_from_priority", self.shed_from)
+        if window["count"]:
+            metrics.set_gauge("admission_critical_latency_p90_ms", window["p90"] * 1000)
+
+
+def _session_id(body: bytes) -> Optional[str]:
+    if not body or len(body) > _MAX_SESSION_BODY:
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    session_id = payload.get("session_id") or payload.get("sessionId")
+    return str(session_id) if session_id else None
+
+
+class AdmissionMiddleware:
+    """Turns excess work away at the door, without queueing, so it never reaches the DB pool.
+
+    Each request is matched to a :class:`RouteClass` (unmatched ones pass straight
+    through) and checked, cheapest first, against:
+
+    * the :class:`LoadShedder`, fed by critical-request latency (``503``);
+    * the class's concurrency limit (``503``);
+    * a per-source token bucket keyed on the client address, for classes with
+      ``limit_source`` only: tool calls and webhooks all arrive from Vapi's few
+      addresses, so a per-source limit would throttle every call at once (``429``);
+    * a per-session token bucket keyed on the body's ``session_id`` (``429``).
+
+    Rejections carry ``Retry-After`` and count in ``admission_rejected_total``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        shedder: LoadShedder,
+        concurrency: Dict[str, int] | None = None,
+        session_buckets: TokenBuckets | None = None,
+        source_buckets: TokenBuckets | None = None,
+        route_classes: Iterable[RouteClass] = DEFAULT_ROUTE_CLASSES,
+        retry_after: float = 1.0,
+    ) -> None:
+        self.app = app
+        self.shedder = shedder
+        self.concurrency = concurrency or {}
+        self.session_buckets = session_buckets
+        self.source_buckets = source_buckets
+        self.route_classes = tuple(route_classes)
+        self.retry_after = retry_after
+        self._inflight: Dict[str, int] = {}
+
+    def classify(self, scope: Scope) -> Optional[RouteClass]:
+        return next((route for route in self.route_classes if route.matches(scope["method"], scope["path"])), None)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = self.classify(scope) if scope["type"] == "http" else None
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        now = time.monotonic()
+        self.shedder.tick(now)
+        if self.shedder.sheds(route.priority):
+            await self._reject(send, route, "shed", 503, self.retry_after)
+            return
+        limit = self.concurrency.get(route.name)
+        if limit is not None and self._inflight.get(route.name, 0) >= limit:
+            await self._reject(send, route, "concurrency", 503, self.retry_after)
+            return
+        if self.source_buckets is not None and route.limit_source:
+            client = scope.get("client")
+            wait = self.source_buckets.take(client[0] if client else "unknown", now)
+            if wait:
+                await self._reject(send, route, "source_rate", 429, wait)
+                return
+        if self.session_buckets is not None and route.session_from_body:
+            body, receive = await _buffer_body(receive)
+            session_id = _session_id(body)
+            wait = self.session_buckets.take(session_id, now) if session_id else 0.0
+            if wait:
+                await self._reject(send, route, "session_rate", 429, wait)
+                return
+
+        labels = {"route_class": route.name}
+        self._inflight[route.name] = self._inflight.get(route.name, 0) + 1
+        metrics.set_gauge("admission_inflight", self._inflight[route.name], labels=labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._inflight[route.name] -= 1
+            metrics.set_gauge("admission_inflight", self._inflight[route.name], labels=labels)
+            if route.priority == PRIORITY_CRITICAL:
+                self.shedder.record(time.perf_counter() - started)
+
+    @staticmethod
+    async def _reject(send: Send, route: RouteClass, reason: str, status: int, retry_after: float) -> None:
+        metrics.increment("admission_rejected_total", labels={"route_class": route.name, "reason": reason})
+        body = json.dumps({"detail": "Server busy, retry later", "reason": reason}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+async def _buffer_body(receive: Receive) -> Tuple[bytes, Receive]:
+    """Read the whole request body and return it with a ``receive`` that replays it."""
+
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client went away; hand the disconnect on to the app as it is.
+            pending: Optional[Message] = message
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            pending = None
+            break
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return pending or {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Coroutine, Set
+
+from app.utils.deadline import detached_context
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSupervisor:
+    """Tracks fire-and-forget tasks so shutdown can drain them instead of dropping them."""
+
+    def __init__(self) -> None:
+        self._tasks: Set[asyncio.Task[Any]] = set()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def spawn(self, coro: Coroutine[Any, Any, Any], name: str | None = None) -> asyncio.Task[Any]:
+        # Fire-and-forget work outlives the request that spawned it, so it must not inherit its deadline.
+        task = asyncio.get_running_loop().create_task(coro, name=name, context=detached_context())
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+        return task
+
+    def _on_done(self, task: asyncio.Task[Any]) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error("background_task_failed", exc_info=error, extra={"task": task.get_name()})
+
+    async def drain(self, timeout: float) -> int:
+        """Wait up to ``timeout`` seconds for pending tasks, then cancel the rest.
+
+        Returns the number of tasks that had to be cancelled.
+        """
+
+        pending = set(self._tasks)
+        if not pending:
+            return 0
+        _, still_pending = await asyncio.wait(pending, timeout=timeout)
+        for task in still_pending:
+            task.cancel()
+        if still_pending:
+            await asyncio.gather(*still_pending, return_exceptions=True)
+            logger.warning("background_tasks_cancelled", extra={"count": len(still_pending)})
+        return len(still_pending)
+
+
+task_supervisor = TaskSupervisor()
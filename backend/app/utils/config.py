@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -27,7 +27,73 @@ class Settings(BaseSettings):
         alias="DATABASE_URL",
     )
     database_echo: bool = Field(False, alias="DATABASE_ECHO")
+    database_read_url: Optional[str] = Field(None, alias="DATABASE_READ_URL")
+    database_replica_max_lag_seconds: float = Field(5.0, alias="DATABASE_REPLICA_MAX_LAG_SECONDS")
+    database_replica_lag_check_interval: float = Field(2.0, alias="DATABASE_REPLICA_LAG_CHECK_INTERVAL")
+    database_pool_size: int = Field(10, alias="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(10, alias="DATABASE_MAX_OVERFLOW")
+    database_pool_timeout: float = Field(5.0, alias="DATABASE_POOL_TIMEOUT")
+    database_statement_timeout_ms: int = Field(5000, alias="DATABASE_STATEMENT_TIMEOUT_MS")
+    database_reporting_pool_size: int = Field(5, alias="DATABASE_REPORTING_POOL_SIZE")
+    database_reporting_max_overflow: int = Field(0, alias="DATABASE_REPORTING_MAX_OVERFLOW")
+    database_reporting_pool_timeout: float = Field(10.0, alias="DATABASE_REPORTING_POOL_TIMEOUT")
+    database_reporting_statement_timeout_ms: int = Field(30000, alias="DATABASE_REPORTING_STATEMENT_TIMEOUT_MS")
+    database_pool_recycle: int = Field(1800, alias="DATABASE_POOL_RECYCLE")
+    database_pool_pre_ping: bool = Field(False, alias="DATABASE_POOL_PRE_PING")
+    database_pool_min_size: int = Field(2, alias="DATABASE_POOL_MIN_SIZE")
+    database_pool_warmup: bool = Field(True, alias="DATABASE_POOL_WARMUP")
+    database_statement_cache_size: int = Field(500, alias="DATABASE_STATEMENT_CACHE_SIZE")
+    booking_hold_ttl_seconds: int = Field(300, alias="BOOKING_HOLD_TTL_SECONDS")
+    booking_hold_sweep_interval_seconds: float = Field(15.0, alias="BOOKING_HOLD_SWEEP_INTERVAL_SECONDS")
+    booking_hold_sweep_batch_size: int = Field(500, alias="BOOKING_HOLD_SWEEP_BATCH_SIZE")
+    recurring_horizon_days: int = Field(28, alias="RECURRING_HORIZON_DAYS")
+    recurring_materialize_interval_seconds: float = Field(3600.0, alias="RECURRING_MATERIALIZE_INTERVAL_SECONDS")
+    idempotency_claim_timeout_seconds: float = Field(120.0, alias="IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS")
+    idempotency_key_retention_hours: float = Field(24.0, alias="IDEMPOTENCY_KEY_RETENTION_HOURS")
+    payment_gateway: str = Field("sandbox", alias="PAYMENT_GATEWAY")
+    payment_sandbox_delay_seconds: float = Field(1.0, alias="PAYMENT_SANDBOX_DELAY_SECONDS")
+    payment_worker_concurrency: int = Field(4, alias="PAYMENT_WORKER_CONCURRENCY")
+    payment_claim_lease_seconds: float = Field(120.0, alias="PAYMENT_CLAIM_LEASE_SECONDS")
+    payment_retry_backoff_seconds: float = Field(15.0, alias="PAYMENT_RETRY_BACKOFF_SECONDS")
+    payment_sweep_interval_seconds: float = Field(30.0, alias="PAYMENT_SWEEP_INTERVAL_SECONDS")
+    outbox_dispatch_interval_seconds: float = Field(1.0, alias="OUTBOX_DISPATCH_INTERVAL_SECONDS")
+    outbox_batch_size: int = Field(100, alias="OUTBOX_BATCH_SIZE")
+    outbox_max_attempts: int = Field(8, alias="OUTBOX_MAX_ATTEMPTS")
+    outbox_base_backoff_seconds: float = Field(2.0, alias="OUTBOX_BASE_BACKOFF_SECONDS")
+    outbox_max_backoff_seconds: float = Field(600.0, alias="OUTBOX_MAX_BACKOFF_SECONDS")
+    door_code_length: int = Field(4, alias="DOOR_CODE_LENGTH")
+    door_code_max_length: int = Field(8, alias="DOOR_CODE_MAX_LENGTH")
+    door_code_grow_threshold: float = Field(0.5, alias="DOOR_CODE_GROW_THRESHOLD")
+    door_code_reuse_delay_seconds: float = Field(60.0, alias="DOOR_CODE_REUSE_DELAY_SECONDS")
+    keypad_early_entry_minutes: int = Field(15, alias="KEYPAD_EARLY_ENTRY_MINUTES")
+    keypad_entry_flush_interval_seconds: float = Field(1.0, alias="KEYPAD_ENTRY_FLUSH_INTERVAL_SECONDS")
+    keypad_entry_batch_size: int = Field(500, alias="KEYPAD_ENTRY_BATCH_SIZE")
+    keypad_entry_buffer_limit: int = Field(50000, alias="KEYPAD_ENTRY_BUFFER_LIMIT")
+    venue_catalog_max_age_seconds: float = Field(300.0, alias="VENUE_CATALOG_MAX_AGE_SECONDS")
+    venue_catalog_listen_retry_seconds: float = Field(5.0, alias="VENUE_CATALOG_LISTEN_RETRY_SECONDS")
+    availability_cache_size: int = Field(2048, alias="AVAILABILITY_CACHE_SIZE")
+    availability_cache_ttl_seconds: float = Field(300.0, alias="AVAILABILITY_CACHE_TTL_SECONDS")
+    availability_listen_retry_seconds: float = Field(5.0, alias="AVAILABILITY_LISTEN_RETRY_SECONDS")
+    customer_context_cache_size: int = Field(1024, alias="CUSTOMER_CONTEXT_CACHE_SIZE")
+    customer_context_ttl_seconds: float = Field(900.0, alias="CUSTOMER_CONTEXT_TTL_SECONDS")
+    tool_deadline_header: str = Field("X-Tool-Deadline-Ms", alias="TOOL_DEADLINE_HEADER")
+    tool_deadline_seconds: float = Field(15.0, alias="TOOL_DEADLINE_SECONDS")
+    tool_deadlines: str = Field("availability=4,holds=4,customer=3", alias="TOOL_DEADLINES")
+    tool_deadline_reserve_ms: float = Field(250.0, alias="TOOL_DEADLINE_RESERVE_MS")
+    admission_enabled: bool = Field(True, alias="ADMISSION_ENABLED")
+    admission_concurrency: str = Field("tool=48,keypad=32,webhook=24,dashboard=4,survey=4", alias="ADMISSION_CONCURRENCY")
+    admission_session_rate: float = Field(5.0, alias="ADMISSION_SESSION_RATE")
+    admission_session_burst: float = Field(20.0, alias="ADMISSION_SESSION_BURST")
+    admission_source_rate: float = Field(20.0, alias="ADMISSION_SOURCE_RATE")
+    admission_source_burst: float = Field(60.0, alias="ADMISSION_SOURCE_BURST")
+    admission_latency_slo_ms: float = Field(1000.0, alias="ADMISSION_LATENCY_SLO_MS")
+    admission_window_seconds: float = Field(2.0, alias="ADMISSION_WINDOW_SECONDS")
+    admission_retry_after_seconds: float = Field(2.0, alias="ADMISSION_RETRY_AFTER_SECONDS")
     public_backend_url: str = Field("http://localhost:8000", alias="PUBLIC_BACKEND_URL")
+    shutdown_grace_seconds: float = Field(20.0, alias="SHUTDOWN_GRACE_SECONDS")
+    loop_monitor_enabled: bool = Field(True, alias="LOOP_MONITOR_ENABLED")
+    loop_monitor_interval_ms: float = Field(50.0, alias="LOOP_MONITOR_INTERVAL_MS")
+    loop_lag_threshold_ms: float = Field(250.0, alias="LOOP_LAG_THRESHOLD_MS")
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).resolve().parents[3] / ".env"),
         env_file_encoding="utf-8",
@@ -38,6 +104,27 @@ class Settings(BaseSettings):
     def frontend_origins(self) -> List[str]:
         return [origin.strip() for origin in self.frontend_origin.split(",") if origin.strip()]
 
+    @property
+    def tool_deadline_budgets(self) -> Dict[str, float]:
+        """``TOOL_DEADLINES`` (``tool=seconds,...``) keyed by the tool's path segment."""
+
+        return _pairs(self.tool_deadlines)
+
+    @property
+    def admission_concurrency_limits(self) -> Dict[str, int]:
+        """``ADMISSION_CONCURRENCY`` (``route_class=limit,...``)."""
+
+        return {name: int(limit) for name, limit in _pairs(self.admission_concurrency).items()}
+
+
+def _pairs(value: str) -> Dict[str, float]:
+    pairs: Dict[str, float] = {}
+    for entry in value.split(","):
+        name, _, number = entry.partition("=")
+        if name.strip() and number.strip():
+            pairs[name.strip()] = float(number)
+    return pairs
+
 
 @lru_cache
 def get_settings() -> Settings:
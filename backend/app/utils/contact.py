@@ -0,0 +1,45 @@
+"""Canonical forms for customer contact details.
+
+Customers are matched on these values (and the unique indexes on ``customers`` are built
+over them), so every writer and lookup must normalise through here first.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+DEFAULT_COUNTRY_CODE = "1"
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    value = value.strip().lower()
+    return value or None
+
+
+def normalize_phone(value: Optional[str], default_country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """Best-effort E.164 (``+<country><number>``); ``None`` when the input is not a phone number.
+
+    National numbers without a country code are assumed to be in ``default_country_code``
+    (NANP by default, so ``(415) 555-1212`` becomes ``+14155551212``).
+    """
+
+    if value is None:
+        return None
+    value = value.strip()
+    digits = _NON_DIGITS.sub("", value)
+    if value.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif default_country_code == "1" and len(digits) == 11 and digits.startswith("1"):
+        pass
+    elif len(digits) == 10:
+        digits = default_country_code + digits
+    if not 8 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
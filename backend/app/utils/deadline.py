@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import metrics
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before the work could start."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Point on the monotonic clock after which nobody is waiting for the answer."""
+
+    expires_at: float
+    budget: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds, seconds)
+
+    def remaining(self, margin: float = 0.0) -> float:
+        """Seconds left, minus ``margin`` kept back to finish up; never negative."""
+
+        return max(0.0, self.expires_at - time.monotonic() - margin)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"deadline of {self.budget:.3f}s exceeded")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the request this code runs for, if it has one.
+
+    Tasks copy it from whoever created them, so work shared through a single-flight
+    is bounded by the deadline of the caller that started it.
+    """
+
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def detached_context() -> Context:
+    """A copy of the current context without a deadline, for tasks that outlive the request."""
+
+    context = copy_context()
+    context.run(_current.set, None)
+    return context
+
+
+class DeadlineMiddleware:
+    """Bounds tool calls under ``prefix`` by the time the caller is still listening.
+
+    The budget is the ``header`` value in milliseconds when the caller sends one, else
+    the per-tool entry of ``budgets`` (keyed by the path segment after ``prefix``), else
+    ``default``, less ``reserve`` for the response to travel back. It is published as
+    :func:`current_deadline` for services and the database session (which turns it into
+    a per-transaction ``statement_timeout``). Work still running when it expires is
+    cancelled and answered with ``504``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: str,
+        header: str,
+        default: float,
+        budgets: Dict[str, float] | None = None,
+        reserve: float = 0.0,
+    ) -> None:
+        self.app = app
+        self.prefix = prefix.rstrip("/") + "/"
+        self.header = header.lower().encode("latin-1")
+        self.default = default
+        self.budgets = budgets or {}
+        self.reserve = reserve
+
+    def budget_for(self, scope: Scope) -> tuple[str, float]:
+        tool = scope["path"][len(self.prefix):].split("/", 1)[0]
+        for name, value in scope.get("headers", ()):
+            if name == self.header:
+                try:
+                    return tool, float(value) / 1000 - self.reserve
+                except ValueError:
+                    break
+        return tool, self.budgets.get(tool, self.default) - self.reserve
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        tool, budget = self.budget_for(scope)
+        deadline = Deadline.after(max(budget, 0.0))
+        started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        metrics.observe("tool_deadline_budget_ms", deadline.budget * 1000, labels={"tool": tool})
+        try:
+            with deadline_scope(deadline):
+                async with asyncio.timeout(deadline.remaining()):
+                    await self.app(scope, receive, send_tracking)
+        except Exception as exc:
+            # Past the deadline, a statement_timeout or DeadlineExceeded is the budget running out.
+            if not deadline.expired and not isinstance(exc, DeadlineExceeded):
+                raise
+            metrics.increment("tool_deadline_exceeded_total", labels={"tool": tool})
+            if started:
+                raise
+            await send({"type": "http.response.start", "status": 504, "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": b'{"detail":"Deadline exceeded"}'})
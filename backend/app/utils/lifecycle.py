@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.metrics import metrics
+
+
+class RequestTracker:
+    """Counts in-flight HTTP requests so shutdown can wait for webhooks to finish."""
+
+    def __init__(self, started_at: float | None = None) -> None:
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.first_request_ms: Optional[float] = None
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def enter(self) -> None:
+        self._active += 1
+        self._idle.clear()
+
+    def exit(self) -> None:
+        self._active -= 1
+        if self.first_request_ms is None:
+            self.first_request_ms = (time.perf_counter() - self.started_at) * 1000
+            metrics.set_gauge("startup_first_request_ms", self.first_request_ms)
+        if self._active <= 0:
+            self._active = 0
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class InFlightMiddleware:
+    def __init__(self, app: ASGIApp, tracker: RequestTracker) -> None:
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.tracker.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.exit()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from app.utils.config import get_settings
+from app.utils.metrics import MetricsRegistry, metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StallReport:
+    detected_at: float
+    blocked_ms: float
+    task: Optional[str]
+    stack: List[str]
+
+
+class LoopLagMonitor:
+    """Samples event-loop scheduling delay and reports callbacks that block the loop.
+
+    A sampler coroutine sleeps for ``interval`` and records how late it woke up
+    (``event_loop_lag_ms``). A watchdog thread checks the sampler's heartbeat; when
+    the loop has not ticked for ``threshold`` it captures the loop thread's current
+    stack, which points straight at the offending callback or coroutine.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.25,
+        registry: MetricsRegistry | None = None,
+        max_reports: int = 20,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.registry = registry or metrics
+        self.reports: Deque[StallReport] = deque(maxlen=max_reports)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._sampler: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._last_tick = time.perf_counter()
+        self._stall_reported = False
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None and not self._sampler.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stopped.clear()
+        self._sampler = self._loop.create_task(self._sample(), name="loop-lag-sampler")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.cancel()
+            try:
+                await self._sampler
+            except asyncio.CancelledError:
+                pass
+            self._sampler = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 4)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_tick = now
+            self._stall_reported = False
+            lag_ms = max(0.0, (now - expected) * 1000)
+            self.registry.observe("event_loop_lag_ms", lag_ms)
+            if lag_ms >= self.threshold * 1000:
+                self.registry.increment("event_loop_overruns_total")
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            blocked = time.perf_counter() - self._last_tick
+            if blocked < self.threshold or self._stall_reported:
+                continue
+            self._stall_reported = True
+            self._record_stall(blocked)
+
+    def _record_stall(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id else None
+        stack = traceback.format_stack(frame) if frame is not None else []
+        task_name: Optional[str] = None
+        if self._loop is not None:
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:  # pragma: no cover - loop torn down mid-check
+                task = None
+            if task is not None:
+                task_name = f"{task.get_name()} {task.get_coro()!r}"
+
+        report = StallReport(
+            detected_at=time.time(),
+            blocked_ms=round(blocked * 1000, 2),
+            task=task_name,
+            stack=stack,
+        )
+        self.reports.append(report)
+        self.registry.increment("event_loop_stalls_total")
+        self.registry.set_info("event_loop_recent_stalls", [self._summarize(item) for item in self.reports])
+        logger.warning(
+            "event_loop_blocked",
+            extra={
+                "blocked_ms": report.blocked_ms,
+                "task": task_name,
+                "stack": "".join(stack[-8:]),
+            },
+        )
+
+    @staticmethod
+    def _summarize(report: StallReport) -> Dict[str, Any]:
+        data = asdict(report)
+        data["stack"] = [line.strip() for line in report.stack[-8:]]
+        return data
+
+
+_loop_monitor: LoopLagMonitor | None = None
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    global _loop_monitor
+    if not _loop_monitor:
+        settings = get_settings()
+        _loop_monitor = LoopLagMonitor(
+            interval=settings.loop_monitor_interval_ms / 1000,
+            threshold=settings.loop_lag_threshold_ms / 1000,
+        )
+    return _loop_monitor
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, Iterable, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str] | None) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+
+def _format_name(name: str, labels: LabelKey) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f"{key}={value}" for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+class Histogram:
+    """Sliding-window sample reservoir that reports percentiles."""
+
+    def __init__(self, window: int = 2048) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._samples.append(value)
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+
+    @staticmethod
+    def _percentile(ordered: list[float], quantile: float) -> float:
+        if not ordered:
+            return 0.0
+        index = max(0, math.ceil(quantile * len(ordered)) - 1)
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, float]:
+        ordered = sorted(self._samples)
+        return {
+            "count": self._count,
+            "mean": self._total / self._count if self._count else 0.0,
+            "p50": self._percentile(ordered, 0.50),
+            "p90": self._percentile(ordered, 0.90),
+            "p99": self._percentile(ordered, 0.99),
+            "max": self._max,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe in-process metrics exposed through ``GET /metrics``."""
+
+    def __init__(self, histogram_window: int = 2048) -> None:
+        self._lock = Lock()
+        self._histogram_window = histogram_window
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._info: Dict[str, Any] = {}
+
+    def increment(self, name: str, value: float = 1.0, labels: Dict[str, str] | None = None) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Dict[str, str] | None = None) -> None:
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, value: float, labels: Dict[str, str] | None = None) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._histogram_window)
+            histogram.observe(value)
+
+    def set_info(self, name: str, value: Any) -> None:
+        """Attach structured, non-numeric diagnostics (e.g. recent stall reports)."""
+
+        with self._lock:
+            self._info[name] = value
+
+    def counter_value(self, name: str, labels: Dict[str, str] | None = None) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0.0)
+
+    def histogram(self, name: str, labels: Dict[str, str] | None = None) -> Dict[str, float]:
+        with self._lock:
+            histogram = self._histograms.get((name, _label_key(labels)))
+            return histogram.snapshot() if histogram else Histogram().snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": {_format_name(name, labels): value for (name, labels), value in self._counters.items()},
+                "gauges": {_format_name(name, labels): value for (name, labels), value in self._gauges.items()},
+                "histograms": {
+                    _format_name(name, labels): histogram.snapshot()
+                    for (name, labels), histogram in self._histograms.items()
+                },
+                "info": dict(self._info),
+            }
+
+    def reset(self, names: Iterable[str] | None = None) -> None:
+        with self._lock:
+            if names is None:
+                self._counters.clear()
+                self._gauges.clear()
+                self._histograms.clear()
+                self._info.clear()
+                return
+            wanted = set(names)
+            for store in (self._counters, self._gauges, self._histograms):
+                for key in [key for key in store if key[0] in wanted]:
+                    del store[key]
+            for name in wanted:
+                self._info.pop(name, None)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.utils.metrics import metrics
+
+V = TypeVar("V")
+
+Spawn = Callable[[Coroutine[Any, Any, Any], Optional[str]], "asyncio.Task[Any]"]
+
+
+def _create_task(coro: Coroutine[Any, Any, Any], name: Optional[str] = None) -> "asyncio.Task[Any]":
+    return asyncio.get_running_loop().create_task(coro, name=name)
+
+
+class SingleFlight(Generic[V]):
+    """Merges concurrent calls with the same key into one in-flight computation.
+
+    The first caller for a key (the leader) starts the work as a task; callers that
+    arrive before it finishes (followers) await that same task and share its result or
+    exception. Waiters are shielded from each other: a cancelled caller stops waiting
+    but the work carries on for the rest. The key is released when the task finishes,
+    so nothing is cached here; pair it with a cache for that.
+
+    ``singleflight_calls_total{name,role}`` counts leaders and followers and
+    ``singleflight_coalescing_ratio{name}`` is the share of calls that were followers.
+    """
+
+    def __init__(self, name: str, spawn: Spawn | None = None) -> None:
+        self.name = name
+        self._spawn = spawn or _create_task
+        self._calls: Dict[Hashable, "asyncio.Task[V]"] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    @property
+    def coalescing_ratio(self) -> float:
+        total = self.leaders + self.followers
+        return self.followers / total if total else 0.0
+
+    def start(self, key: Hashable, work: Callable[[], Awaitable[V]]) -> Tuple["asyncio.Task[V]", bool]:
+        """The task computing ``key``, started from ``work()`` unless one is already running.
+
+        Returns ``(task, leader)``. Use this directly to start work without waiting for it.
+        """
+
+        task = self._calls.get(key)
+        leader = task is None
+        if leader:
+            task = self._spawn(self._run(work), f"singleflight:{self.name}:{key}")
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._release, key))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        metrics.increment("singleflight_calls_total", labels={"name": self.name, "role": "leader" if leader else "follower"})
+        metrics.set_gauge("singleflight_coalescing_ratio", self.coalescing_ratio, labels={"name": self.name})
+        return task, leader
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[V]]) -> V:
+        task, _ = self.start(key, work)
+        return await asyncio.shield(task)
+
+    def wrap(self, fn: Callable[..., Awaitable[V]], key: Callable[..., Hashable]) -> Callable[..., Awaitable[V]]:
+        """``fn`` with concurrent calls coalesced on ``key(*args, **kwargs)``."""
+
+        @functools.wraps(fn)
+        async def coalesced(*args: Any, **kwargs: Any) -> V:
+            return await self.do(key(*args, **kwargs), lambda: fn(*args, **kwargs))
+
+        return coalesced
+
+    def forget(self, key: Hashable) -> None:
+        """Let the next call for ``key`` start fresh work instead of joining the running one."""
+
+        self._calls.pop(key, None)
+
+    def clear(self) -> None:
+        self._calls.clear()
+
+    @staticmethod
+    async def _run(work: Callable[[], Awaitable[V]]) -> V:
+        return await work()
+
+    def _release(self, key: Hashable, task: "asyncio.Task[V]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
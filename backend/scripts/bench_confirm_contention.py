@@ -0,0 +1,99 @@
+"""Contention benchmark: N concurrent confirms racing for the same room and interval.
+
+Exactly one confirm must win; the rest must fail cleanly with a conflict. Requires a
+migrated and seeded database (see README).
+
+    PYTHONPATH=. python scripts/bench_confirm_contention.py --concurrency 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete
+
+from app.db.database import get_database, get_session_factory
+from app.models import Booking
+from app.services.booking_service import BookingConflictError, BookingPayload, BookingService, CustomerPayload
+
+
+async def attempt(service: BookingService, index: int, run_id: str, start_time: datetime, args: argparse.Namespace) -> tuple[str, float, int | None]:
+    started = time.perf_counter()
+    async with get_session_factory()() as session:
+        try:
+            confirmation = await service.confirm_booking(
+                session=session,
+                customer_payload=CustomerPayload(
+                    name=f"Contender {index}",
+                    email=f"contender-{index}@{run_id}.bench",
+                    phone_number=None,
+                    attributes={"bench": run_id},
+                ),
+                booking_payload=BookingPayload(
+                    session_id=f"bench-{run_id}-{index}",
+                    venue_id=args.venue_id,
+                    room_id=args.room_id,
+                    start_time=start_time,
+                    duration_minutes=60,
+                    attendee_count=10,
+                    notes="contention benchmark",
+                    details={"bench": run_id},
+                    payment_amount=Decimal("100.00"),
+                    payment_currency="USD",
+                ),
+            )
+            outcome, booking_id = "confirmed", confirmation.id
+        except BookingConflictError:
+            outcome, booking_id = "conflict", None
+        except Exception as exc:  # surfaced in the summary rather than aborting the run
+            outcome, booking_id = f"error:{type(exc).__name__}", None
+    return outcome, (time.perf_counter() - started) * 1000, booking_id
+
+
+async def run(args: argparse.Namespace) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    # A far-future slot unique to this run so repeated runs never collide with each other.
+    start_time = datetime(2100, 1, 1, tzinfo=timezone.utc) + timedelta(hours=int(run_id, 16) % 500_000)
+    service = BookingService()
+
+    wall_started = time.perf_counter()
+    results = await asyncio.gather(*(attempt(service, i, run_id, start_time, args) for i in range(args.concurrency)))
+    wall_ms = (time.perf_counter() - wall_started) * 1000
+
+    outcomes: dict[str, int] = {}
+    for outcome, _, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    latencies = sorted(latency for _, latency, _ in results)
+    winners = [booking_id for outcome, _, booking_id in results if outcome == "confirmed"]
+
+    print(f"concurrency      : {args.concurrency}")
+    print(f"outcomes         : {outcomes}")
+    print(f"wall time        : {wall_ms:.1f} ms")
+    print(f"latency p50/p99  : {statistics.median(latencies):.1f} / {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms")
+    print(f"double bookings  : {max(0, len(winners) - 1)}")
+
+    if not args.keep and winners:
+        async with get_session_factory()() as session:
+            await session.execute(delete(Booking).where(Booking.id.in_(winners)))
+            await session.commit()
+
+    await get_database().dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--venue-id", default="aurora-hall")
+    parser.add_argument("--room-id", default="aurora-main")
+    parser.add_argument("--keep", action="store_true", help="Keep the winning booking instead of deleting it.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Compare the legacy select-then-insert customer upsert with the single ON CONFLICT statement.
+
+Runs ``--iterations`` sequential upserts (alternating new and returning customers) for
+each strategy, then ``--concurrency`` simultaneous upserts of one brand-new customer to
+show how each copes with the race. Requires a migrated database.
+
+    PYTHONPATH=. python scripts/bench_customer_upsert.py --iterations 500 --concurrency 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_database, get_session_factory
+from app.models import Customer
+from app.services.booking_service import BookingService, CustomerPayload
+
+Strategy = Callable[[AsyncSession, CustomerPayload], Awaitable[int]]
+
+
+async def legacy_upsert(session: AsyncSession, payload: CustomerPayload) -> int:
+    """The pre-index path: look up by raw email, then update in place or insert."""
+
+    if payload.email:
+        existing = (await session.execute(select(Customer).where(Customer.email == payload.email))).scalar_one_or_none()
+        if existing:
+            existing.name = payload.name or existing.name
+            existing.phone_number = payload.phone_number or existing.phone_number
+            existing.attributes = {**(existing.attributes or {}), **payload.attributes}
+            await session.flush()
+            return existing.id
+    customer = Customer(
+        name=payload.name,
+        email=payload.email,
+        phone_number=payload.phone_number,
+        attributes=payload.attributes,
+    )
+    session.add(customer)
+    await session.flush()
+    return customer.id
+
+
+async def on_conflict_upsert(session: AsyncSession, payload: CustomerPayload) -> int:
+    return (await session.execute(BookingService()._customer_upsert_stmt(payload))).scalar_one()
+
+
+def payload_for(run_id: str, index: int) -> CustomerPayload:
+    return CustomerPayload(
+        name=f"Bench {index}",
+        email=f"bench-{index}@{run_id}.bench",
+        phone_number=None,
+        attributes={"visit": index},
+    )
+
+
+async def sequential(strategy: Strategy, run_id: str, iterations: int) -> list[float]:
+    latencies: list[float] = []
+    for index in range(iterations):
+        # Every other call re-upserts an existing customer (with fresh attributes, so the
+        # legacy path cannot skip its UPDATE) and both branches are exercised.
+        payload = payload_for(run_id, index // 2)
+        payload.attributes = {"visit": index}
+        started = time.perf_counter()
+        async with get_session_factory()() as session:
+            await strategy(session, payload)
+            await session.commit()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def race(strategy: Strategy, run_id: str, concurrency: int) -> tuple[int, int]:
+    payload = payload_for(run_id, -1)
+    ready = 0
+    go = asyncio.Event()
+
+    async def attempt() -> bool:
+        nonlocal ready
+        try:
+            async with get_session_factory()() as session:
+                # Hold a connection before starting so all contenders really overlap.
+                await session.execute(select(1))
+                ready += 1
+                if ready == concurrency:
+                    go.set()
+                await go.wait()
+                await strategy(session, payload)
+                await session.commit()
+            return True
+        except Exception:
+            return False
+
+    outcomes = await asyncio.gather(*(attempt() for _ in range(concurrency)))
+    async with get_session_factory()() as session:
+        rows = (
+            await session.execute(select(func.count()).select_from(Customer).where(Customer.email == payload.email))
+        ).scalar_one()
+    return rows, outcomes.count(False)
+
+
+async def run(args: argparse.Namespace) -> None:
+    strategies: dict[str, Strategy] = {"legacy": legacy_upsert, "on_conflict": on_conflict_upsert}
+    run_ids: list[str] = []
+    try:
+        for name, strategy in strategies.items():
+            run_id = f"{name}-{uuid.uuid4().hex[:8]}"
+            run_ids.append(run_id)
+            latencies = sorted(await sequential(strategy, run_id, args.iterations))
+            rows, errors = await race(strategy, run_id, args.concurrency)
+            print(
+                f"{name:>12}: p50 {statistics.median(latencies):6.2f} ms  "
+                f"p99 {latencies[int(len(latencies) * 0.99) - 1]:6.2f} ms  "
+                f"total {sum(latencies):8.1f} ms  race rows {rows} errors {errors}"
+            )
+    finally:
+        async with get_session_factory()() as session:
+            for run_id in run_ids:
+                await session.execute(delete(Customer).where(Customer.email.like(f"%@{run_id}.bench")))
+            await session.commit()
+        await get_database().dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=15,
+        help="Simultaneous upserts in the race; keep it within the realtime pool size plus overflow.",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure keypad verifications per second on one core.
+
+Fills an in-memory keypad index with ``--codes`` active codes spread over ``--venues``
+venues, then times a single-threaded loop for ``--seconds`` at three levels: the bare
+index lookup, the service call (which also buffers the entry event), and the full
+``POST /api/access/verify`` request through the ASGI app in-process. Nothing is written
+to the database, so no migrated database is needed.
+
+    PYTHONPATH=. python scripts/bench_keypad_verify.py --codes 100000 --seconds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import httpx
+
+from app.main import app
+from app.services.keypad_service import KeypadService, get_keypad_service
+
+
+def build_service(codes: int, venues: int) -> tuple[KeypadService, list[tuple[str, str]]]:
+    service = KeypadService(buffer_limit=100_000)
+    now = datetime.now(timezone.utc)
+    keys: list[tuple[str, str]] = []
+    for index in range(codes):
+        venue_id = f"venue-{index % venues}"
+        code = str(index // venues).zfill(6)
+        service.activate(venue_id, code, index, f"room-{index % 7}", now, now + timedelta(hours=2))
+        keys.append((venue_id, code))
+    service.loaded = True
+    return service, keys
+
+
+def probes(keys: list[tuple[str, str]], miss_rate: float, count: int = 65_536) -> list[tuple[str, str]]:
+    rng = random.Random(7)
+    return [("venue-0", "x") if rng.random() < miss_rate else rng.choice(keys) for _ in range(count)]
+
+
+def per_second(call: Callable[[str, str], object], sample: list[tuple[str, str]], seconds: float) -> float:
+    done = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for venue_id, code in sample[:4096]:
+            call(venue_id, code)
+        done += 4096
+        sample = sample[4096:] + sample[:4096]
+    return done / (time.perf_counter() - started)
+
+
+async def http_per_second(sample: list[tuple[str, str]], seconds: float) -> float:
+    done = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            venue_id, code = sample[done % len(sample)]
+            response = await client.post("/api/access/verify", json={"venue_id": venue_id, "code": code})
+            response.raise_for_status()
+            done += 1
+    return done / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--codes", type=int, default=100_000)
+    parser.add_argument("--venues", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--miss-rate", type=float, default=0.1, help="Share of probes with an unknown code.")
+    args = parser.parse_args()
+    # httpx logs every request at INFO, which would dominate the HTTP measurement.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    service, keys = build_service(args.codes, args.venues)
+    sample = probes(keys, args.miss_rate)
+    app.dependency_overrides[get_keypad_service] = lambda: service
+
+    index_rate = per_second(service.index.verify, sample, args.seconds)
+    service_rate = per_second(service.verify, sample, args.seconds)
+    http_rate = asyncio.run(http_per_second(sample, args.seconds))
+    print(f"{'index':>8}: {index_rate:12,.0f} verifications/s/core")
+    print(f"{'service':>8}: {service_rate:12,.0f} verifications/s/core  (buffered events {service.pending:,})")
+    print(f"{'http':>8}: {http_rate:12,.0f} verifications/s/core")
+
+
+if __name__ == "__main__":
+    main()
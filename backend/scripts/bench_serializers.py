@@ -0,0 +1,296 @@
+"""Compare the legacy ORM-object serializers with the column-tuple shapes in ``app.serializers``.
+
+Micro-benchmarks build ``--rows`` synthetic records per shape, both as transient ORM
+objects and as row tuples. Each path is checked to produce the same JSON, then timed
+from object to response bytes. The legacy path is ``dict`` builder, ``jsonable_encoder``
+and stdlib ``json``; the new path is shape function plus ``dumps``. The end-to-end run
+times ``GET /api/booking/recent?limit=500`` in-process against the configured database.
+That needs a migrated database with enough bookings; pass ``--skip-e2e`` without one.
+
+    PYTHONPATH=. python scripts/bench_serializers.py --rows 500 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from app.main import app
+from app.models import (
+    Booking,
+    BookingStatus,
+    Customer,
+    DoorAccessEvent,
+    Payment,
+    PaymentProvider,
+    PaymentStatus,
+    Room,
+    Venue,
+)
+from app.serializers import booking_detail, booking_summary, dumps, payment_shape, venue_shapes
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def legacy_booking_detail(booking: Booking) -> Dict[str, Any]:
+    door_event = booking.door_access_events[0] if booking.door_access_events else None
+    payment = booking.payments[0] if booking.payments else None
+    return {
+        "id": booking.id,
+        "session_id": booking.session_id,
+        "status": booking.status.value.lower(),
+        "customer": {
+            "id": booking.customer.id if booking.customer else None,
+            "name": booking.customer.name if booking.customer else None,
+            "email": booking.customer.email if booking.customer else None,
+            "phone_number": booking.customer.phone_number if booking.customer else None,
+        },
+        "venue": {"id": booking.venue.id, "name": booking.venue.name},
+        "room": {"id": booking.room.id, "label": booking.room.label} if booking.room else None,
+        "start_time": booking.start_time.isoformat() if booking.start_time else None,
+        "end_time": booking.end_time.isoformat() if booking.end_time else None,
+        "duration_minutes": booking.duration_minutes,
+        "attendee_count": booking.attendee_count,
+        "notes": booking.notes,
+        "details": booking.details,
+        "payment": {
+            "status": payment.status.value.lower(),
+            "amount": str(payment.amount) if payment.amount is not None else None,
+            "currency": payment.currency,
+            "provider": payment.provider.value.lower(),
+        } if payment else None,
+        "door_access": {
+            "code": door_event.door_code,
+            "instructions": door_event.instructions,
+            "expires_at": door_event.expires_at.isoformat() if door_event.expires_at else None,
+        } if door_event else None,
+    }
+
+
+def legacy_booking_summary(booking: Booking) -> Dict[str, Any]:
+    payment = booking.payments[0] if booking.payments else None
+    customer = booking.customer
+    return {
+        "id": booking.id,
+        "session_id": booking.session_id,
+        "venue_id": booking.venue_id,
+        "room_id": booking.room_id,
+        "status": booking.status.value,
+        "start_time": booking.start_time.isoformat() if booking.start_time else None,
+        "end_time": booking.end_time.isoformat() if booking.end_time else None,
+        "attendee_count": booking.attendee_count,
+        "notes": booking.notes,
+        "created_at": booking.created_at.isoformat(),
+        "customer": {
+            "name": customer.name if customer else None,
+            "email": customer.email if customer else None,
+            "phone_number": customer.phone_number if customer else None,
+        },
+        "payment": {
+            "amount": float(payment.amount) if payment.amount is not None else None,
+            "currency": payment.currency,
+            "provider": payment.provider.value,
+            "status": payment.status.value,
+        } if payment else None,
+    }
+
+
+def legacy_payment(payment: Payment) -> Dict[str, Any]:
+    extras = payment.extras if isinstance(payment.extras, dict) else {}
+    return {
+        "id": payment.id,
+        "session_id": payment.session_id,
+        "booking_id": payment.booking_id,
+        "provider": payment.provider.value,
+        "status": payment.status.value,
+        "amount": float(payment.amount) if payment.amount is not None else None,
+        "currency": payment.currency,
+        "transaction_id": extras.get("transaction_id"),
+        "provider_hint": extras.get("provider"),
+        "reference": payment.sandbox_reference,
+        "failure_reason": extras.get("failure_reason"),
+        "created_at": payment.created_at.isoformat() if payment.created_at else None,
+    }
+
+
+def legacy_venue(venue: Venue) -> Dict[str, Any]:
+    return {
+        "id": venue.id,
+        "name": venue.name,
+        "address": venue.address,
+        "contact": venue.contact,
+        "policies": venue.policies or {},
+        "rooms": [
+            {
+                "id": room.id,
+                "venue_id": room.venue_id,
+                "label": room.label,
+                "capacity": room.capacity,
+                "amenities": room.amenities or [],
+                "availability": room.availability or {},
+            }
+            for room in venue.rooms
+        ],
+    }
+
+
+def synthetic(rows: int) -> Dict[str, tuple[list[Any], list[Any]]]:
+    """``shape -> (orm_objects, row_tuples)`` describing the same records."""
+
+    venue = Venue(id="bench-venue", name="Bench Hall", address="1 Main St", contact="ops@bench", policies={"deposit": 20})
+    venue.rooms = [
+        Room(id=f"bench-room-{n}", venue_id=venue.id, label=f"Room {n}", capacity=8 + n, amenities=["tv", "whiteboard"], availability={})
+        for n in range(8)
+    ]
+    bookings, detail_rows, summary_rows, payments, payment_rows = [], [], [], [], []
+    for n in range(rows):
+        room = venue.rooms[n % len(venue.rooms)]
+        start = NOW + timedelta(hours=n)
+        customer = Customer(id=n, name=f"Caller {n}", email=f"caller{n}@bench.test", phone_number=f"+1555{n:07d}")
+        payment = Payment(
+            id=n,
+            booking_id=n,
+            session_id=f"s-{n}",
+            provider=PaymentProvider.MCP_SANDBOX,
+            status=PaymentStatus.SUCCEEDED,
+            amount=Decimal("50.00"),
+            currency="USD",
+            extras={"transaction_id": f"tx-{n}", "provider": "apple_pay"},
+            sandbox_reference=f"ref-{n}",
+            created_at=start.replace(tzinfo=None),
+        )
+        door = DoorAccessEvent(door_code=f"{n % 10000:04d}", instructions="Use the keypad.", expires_at=start + timedelta(hours=3))
+        booking = Booking(
+            id=n,
+            session_id=f"s-{n}",
+            venue_id=venue.id,
+            room_id=room.id,
+            status=BookingStatus.CONFIRMED,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            duration_minutes=60,
+            attendee_count=4,
+            notes="Bench booking",
+            details={"source": "bench"},
+            created_at=start.replace(tzinfo=None),
+        )
+        booking.customer, booking.venue, booking.room = customer, venue, room
+        booking.payments, booking.door_access_events = [payment], [door]
+        bookings.append(booking)
+        payments.append(payment)
+        detail_rows.append(
+            (
+                n, booking.session_id, booking.status, customer.id, customer.name, customer.email, customer.phone_number,
+                venue.id, venue.name, room.id, room.label, booking.start_time, booking.end_time, 60, 4, booking.notes,
+                booking.details, payment.status, payment.amount, payment.currency, payment.provider,
+                door.door_code, door.instructions, door.expires_at,
+            )
+        )
+        summary_rows.append(
+            (
+                n, booking.session_id, venue.id, room.id, booking.status, booking.start_time, booking.end_time, 4,
+                booking.notes, booking.created_at, customer.name, customer.email, customer.phone_number,
+                payment.amount, payment.currency, payment.provider, payment.status,
+            )
+        )
+        payment_rows.append(
+            (
+                payment.id, payment.session_id, payment.booking_id, payment.provider, payment.status, payment.amount,
+                payment.currency, payment.extras, payment.sandbox_reference, payment.created_at,
+            )
+        )
+    venue_rows = [
+        (venue.id, venue.name, venue.address, venue.contact, venue.policies, room.id, room.label, room.capacity, room.amenities, room.availability)
+        for room in venue.rooms
+    ]
+    return {
+        "booking_detail": (bookings, detail_rows),
+        "booking_summary": (bookings, summary_rows),
+        "payment": (payments, payment_rows),
+        "venue_catalog": ([venue], venue_rows),
+    }
+
+
+def legacy_bytes(build: Callable[[Any], Dict[str, Any]], objects: list[Any]) -> bytes:
+    # What FastAPI does with a returned dict: jsonable_encoder, then JSONResponse.render.
+    content = jsonable_encoder([build(obj) for obj in objects])
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def timed(func: Callable[[], bytes], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def micro(rows: int, repeat: int) -> None:
+    legacy: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+        "booking_detail": legacy_booking_detail,
+        "booking_summary": legacy_booking_summary,
+        "payment": legacy_payment,
+        "venue_catalog": legacy_venue,
+    }
+    shapes: Dict[str, Callable[[list[Any]], bytes]] = {
+        "booking_detail": lambda rs: dumps([booking_detail(r) for r in rs]),
+        "booking_summary": lambda rs: dumps([booking_summary(r) for r in rs]),
+        "payment": lambda rs: dumps([payment_shape(r) for r in rs]),
+        "venue_catalog": lambda rs: dumps(venue_shapes(rs)),
+    }
+    for name, (objects, tuples) in synthetic(rows).items():
+        old = legacy_bytes(legacy[name], objects)
+        new = shapes[name](tuples)
+        assert json.loads(old) == json.loads(new), f"{name}: shapes differ"
+        old_ms = timed(lambda: legacy_bytes(legacy[name], objects), repeat)
+        new_ms = timed(lambda: shapes[name](tuples), repeat)
+        print(f"{name:>16}: legacy {old_ms:8.2f} ms  shapes {new_ms:8.2f} ms  x{old_ms / new_ms:5.1f}  ({len(objects)} records)")
+
+
+async def end_to_end(requests: int, limit: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        warm = await client.get("/api/booking/recent", params={"limit": limit})
+        warm.raise_for_status()
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/api/booking/recent", params={"limit": limit})
+            samples.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+    samples.sort()
+    count = len(warm.json()["bookings"])
+    print(
+        f"{'recent e2e':>16}: p50 {statistics.median(samples):8.2f} ms  "
+        f"p99 {samples[max(int(len(samples) * 0.99) - 1, 0)]:8.2f} ms  ({count} bookings, {len(warm.content):,} bytes)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--skip-e2e", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    micro(args.rows, args.repeat)
+    if not args.skip_e2e:
+        asyncio.run(end_to_end(args.requests, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure cold-start cost of the API: module import, lifespan startup and first request.
+
+Each run happens in a fresh interpreter so import caches do not hide regressions.
+
+    PYTHONPATH=. python scripts/bench_startup.py --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    client.get("/health")
+    answered = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (answered - started) * 1000,
+}))
+"""
+
+
+def run_once(env: dict[str, str]) -> dict[str, float]:
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Skip the DB pool warm-up so the numbers exclude database connection setup.",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    if args.no_warmup:
+        env["DATABASE_POOL_WARMUP"] = "false"
+
+    samples = [run_once(env) for _ in range(args.runs)]
+    for key in ("import_ms", "startup_ms", "first_request_ms"):
+        values = [sample[key] for sample in samples]
+        print(
+            f"{key:>18}: median {statistics.median(values):8.1f}  "
+            f"min {min(values):8.1f}  max {max(values):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""Load production-sized synthetic data for local performance work.
+
+Generates ``--venues`` venues with a few rooms each, ``--customers`` customers and about
+``--bookings`` bookings spread over ``--past-days`` before and ``--future-days`` after
+``--anchor``, following a weekday peak, a late-morning/afternoon diurnal curve and a
+skewed per-room popularity. Confirmed and cancelled bookings get payments, confirmed
+ones get door codes (unique per venue), and past confirmed ones get keypad entries and
+sometimes a survey.
+
+Everything is written in one transaction with binary COPY in ``--batch-size`` batches.
+Secondary indexes on the loaded tables are dropped first and rebuilt once at the end,
+then the tables are analyzed. The target tables are locked for the duration, so run it
+against an idle database. Output is a function of ``--seed`` and ``--anchor`` only;
+on an empty database the rows, ids included, are identical run to run. Synthetic rows
+are tagged (``syn-`` venue ids, ``@synthetic.invalid`` emails) and ``--reset`` deletes
+the previous load first. Requires a migrated database.
+
+    PYTHONPATH=. python scripts/generate_scale_data.py --venues 2000 --bookings 2000000 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.services.venue_catalog_service import CATALOG_CHANNEL
+from app.utils.config import get_settings
+
+VENUE_PREFIX = "syn-"
+EMAIL_DOMAIN = "synthetic.invalid"
+
+# Parents before children: a batch is only copied after the rows it references.
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "venues": ("id", "name", "address", "contact", "policies"),
+    "rooms": ("id", "venue_id", "label", "capacity", "amenities", "availability"),
+    "customers": ("id", "name", "email", "phone_number", "attributes", "created_at", "updated_at"),
+    "bookings": (
+        "id",
+        "session_id",
+        "customer_id",
+        "venue_id",
+        "room_id",
+        "status",
+        "start_time",
+        "end_time",
+        "duration_minutes",
+        "attendee_count",
+        "details",
+        "created_at",
+        "updated_at",
+    ),
+    "payments": (
+        "booking_id",
+        "session_id",
+        "provider",
+        "status",
+        "amount",
+        "currency",
+        "sandbox_reference",
+        "extras",
+        "created_at",
+        "updated_at",
+    ),
+    "door_access_events": ("booking_id", "door_code", "instructions", "issued_at", "expires_at", "context"),
+    "survey_responses": ("booking_id", "rating", "comments", "action_items", "context", "created_at"),
+    "door_entry_events": ("venue_id", "door_code", "keypad_id", "booking_id", "granted", "reason", "occurred_at"),
+}
+TABLES = tuple(COLUMNS)
+
+# Relative demand by start hour (UTC stands in for venue-local time) and by weekday, Monday first.
+HOURLY_WEIGHTS = (0, 0, 0, 0, 0, 0, 0, 1, 4, 8, 10, 9, 6, 7, 9, 8, 6, 4, 3, 3, 2, 1, 0, 0)
+WEEKDAY_WEIGHTS = (1.0, 1.1, 1.15, 1.1, 1.0, 0.7, 0.45)
+DURATIONS = (60, 90, 120, 180, 240, 480)
+DURATION_WEIGHTS = (20, 15, 30, 18, 12, 5)
+TURNOVER_MINUTES = 15
+DOOR_CODE_DIGITS = 6
+AMENITIES = ("projector", "whiteboard", "video_conferencing", "catering", "stage", "sound_system", "wifi", "parking")
+PURPOSES = ("Team offsite", "Board meeting", "Product launch", "Workshop", "Client pitch", "Training", "Networking mixer")
+SURVEY_COMMENTS = ("Great space.", "Check-in was smooth.", "Room ran a little warm.", "Would book again.", "AV took a while to set up.")
+
+_HOURS = range(24)
+_HOUR_CUMULATIVE = list(itertools.accumulate(HOURLY_WEIGHTS))
+_DURATION_CUMULATIVE = list(itertools.accumulate(DURATION_WEIGHTS))
+
+
+@dataclass(frozen=True)
+class SyntheticRoom:
+    id: str
+    venue_id: str
+    venue_index: int
+    capacity: int
+    hourly_rate: int
+    popularity: float
+
+
+class ScaleDataGenerator:
+    """Deterministic row streams; every random draw comes from one seeded ``Random``."""
+
+    def __init__(self, args: argparse.Namespace, first_customer_id: int, first_booking_id: int) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.anchor = datetime.combine(args.anchor, datetime.min.time(), tzinfo=timezone.utc)
+        self.first_customer_id = first_customer_id
+        self.next_booking_id = first_booking_id
+        self.rooms: List[SyntheticRoom] = []
+        self._door_counters: List[int] = []
+
+    def venues(self) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+        rng = self.rng
+        for index in range(self.args.venues):
+            venue_id = f"{VENUE_PREFIX}{index:06d}"
+            yield "venues", (
+                venue_id,
+                f"Synthetic Venue {index}",
+                f"{rng.randint(1, 9999)} Market St, Suite {rng.randint(100, 999)}",
+                f"+1555{index:07d}",
+                json.dumps({"cancellation_hours": rng.choice((24, 48, 72)), "synthetic": True}),
+            )
+            self._door_counters.append(rng.randrange(10**DOOR_CODE_DIGITS))
+            for room_index in range(max(1, round(rng.gauss(self.args.rooms_per_venue, 1.5)))):
+                capacity = rng.choice((6, 10, 16, 24, 40, 80, 150, 300))
+                room = SyntheticRoom(
+                    id=f"{venue_id}-r{room_index}",
+                    venue_id=venue_id,
+                    venue_index=index,
+                    capacity=capacity,
+                    hourly_rate=int(capacity * rng.uniform(4, 9)) + 40,
+                    # Lognormal: most rooms are quiet, a few are booked nearly every day.
+                    popularity=rng.lognormvariate(0, 0.6),
+                )
+                self.rooms.append(room)
+                yield "rooms", (
+                    room.id,
+                    venue_id,
+                    f"Room {room_index}",
+                    capacity,
+                    json.dumps(rng.sample(AMENITIES, rng.randint(1, 4))),
+                    json.dumps({}),
+                )
+
+    def customers(self) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+        rng = self.rng
+        for index in range(self.args.customers):
+            created_at = self.anchor - timedelta(days=self.args.past_days + rng.randint(0, 365), seconds=rng.randint(0, 86399))
+            yield "customers", (
+                self.first_customer_id + index,
+                f"Synthetic Customer {index}",
+                f"customer-{index}@{EMAIL_DOMAIN}",
+                f"+1556{index:07d}",
+                json.dumps({"organization": f"Org {index % 5000}", "synthetic": True}),
+                created_at,
+                created_at,
+            )
+
+    def bookings(self) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+        args, rng = self.args, self.rng
+        days = args.past_days + args.future_days
+        mean_popularity = sum(room.popularity for room in self.rooms) / len(self.rooms)
+        mean_weekday = sum(WEEKDAY_WEIGHTS) / len(WEEKDAY_WEIGHTS)
+        # Expected bookings per room-day before overlap packing drops a few.
+        rate = args.bookings / (len(self.rooms) * days * mean_weekday * mean_popularity)
+        for day in range(-args.past_days, args.future_days):
+            midnight = self.anchor + timedelta(days=day)
+            weekday_weight = WEEKDAY_WEIGHTS[midnight.weekday()]
+            for room in self.rooms:
+                expected = rate * weekday_weight * room.popularity
+                count = int(expected) + (rng.random() < expected - int(expected))
+                if count:
+                    for start_minute, duration in self._day_slots(count):
+                        yield from self._booking(room, midnight + timedelta(minutes=start_minute), duration)
+
+    def _day_slots(self, count: int) -> Iterator[Tuple[int, int]]:
+        rng = self.rng
+        free_from = 0
+        for hour in sorted(rng.choices(_HOURS, cum_weights=_HOUR_CUMULATIVE, k=count)):
+            start = hour * 60 + rng.choice((0, 15, 30, 45))
+            if start < free_from:
+                continue
+            duration = min(rng.choices(DURATIONS, cum_weights=_DURATION_CUMULATIVE)[0], 24 * 60 - start)
+            free_from = start + duration + TURNOVER_MINUTES
+            yield start, duration
+
+    def _booking(self, room: SyntheticRoom, start: datetime, duration: int) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+        rng = self.rng
+        booking_id = self.next_booking_id
+        self.next_booking_id += 1
+        end = start + timedelta(minutes=duration)
+        past = end <= self.anchor
+        cancelled = rng.random() < (0.12 if past else 0.08)
+        status = "CANCELLED" if cancelled else "CONFIRMED"
+        # Lead time is roughly exponential (mean two weeks); nothing is created after the anchor.
+        created_at = min(start - timedelta(hours=1 + rng.expovariate(1 / 336)), self.anchor - timedelta(minutes=rng.randint(1, 600)))
+        updated_at = created_at + timedelta(minutes=rng.randint(0, 30))
+        # Squaring skews bookings towards low-numbered, i.e. frequent, customers.
+        customer_id = self.first_customer_id + int(self.args.customers * rng.random() ** 2)
+        session_id = f"syn-session-{booking_id}"
+        yield "bookings", (
+            booking_id,
+            session_id,
+            customer_id,
+            room.venue_id,
+            room.id,
+            status,
+            start,
+            end,
+            duration,
+            rng.randint(max(1, room.capacity // 4), room.capacity),
+            json.dumps({"purpose": rng.choice(PURPOSES), "synthetic": True}),
+            created_at,
+            updated_at,
+        )
+
+        amount = (Decimal(room.hourly_rate) * duration / 60).quantize(Decimal("0.01"))
+        payment_status = "SUCCEEDED" if not cancelled else ("REFUNDED" if rng.random() < 0.6 else "FAILED")
+        yield "payments", (
+            booking_id,
+            session_id,
+            "MANUAL" if rng.random() < 0.1 else "MCP_SANDBOX",
+            payment_status,
+            amount,
+            "USD",
+            f"syn-{booking_id}",
+            json.dumps({"synthetic": True}),
+            created_at,
+            updated_at,
+        )
+        if cancelled:
+            return
+
+        door_code = self._door_code(room.venue_index)
+        yield "door_access_events", (
+            booking_id,
+            door_code,
+            "Use the main entrance keypad.",
+            created_at,
+            end + timedelta(hours=2),
+            json.dumps({"synthetic": True}),
+        )
+        if not past:
+            return
+        for _ in range(rng.choice((0, 1, 1, 1, 2, 2, 3))):
+            yield "door_entry_events", (
+                room.venue_id,
+                door_code,
+                "main",
+                booking_id,
+                True,
+                "granted",
+                start + timedelta(minutes=rng.randint(-15, 30), seconds=rng.randint(0, 59)),
+            )
+        if rng.random() < 0.03:
+            yield "door_entry_events", (room.venue_id, f"{rng.randrange(10**DOOR_CODE_DIGITS):0{DOOR_CODE_DIGITS}d}", "main", None, False, "unknown_code", start)
+        if rng.random() < 0.25:
+            yield "survey_responses", (
+                booking_id,
+                rng.choices((1, 2, 3, 4, 5), weights=(2, 3, 10, 35, 50))[0],
+                rng.choice(SURVEY_COMMENTS),
+                json.dumps([]),
+                json.dumps({"synthetic": True}),
+                end + timedelta(hours=rng.randint(1, 48)),
+            )
+
+    def _door_code(self, venue_index: int) -> str:
+        # 7919 is coprime to 10**6, so a venue repeats a code only after a million bookings.
+        counter = self._door_counters[venue_index]
+        self._door_counters[venue_index] = counter + 1
+        return f"{(counter * 7919) % 10**DOOR_CODE_DIGITS:0{DOOR_CODE_DIGITS}d}"
+
+
+class CopyLoader:
+    """Per-table row buffers copied with binary COPY once any of them reaches ``batch_size``."""
+
+    def __init__(self, connection: asyncpg.Connection, batch_size: int) -> None:
+        self.connection = connection
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[Tuple[Any, ...]]] = {table: [] for table in TABLES}
+        self.counts: Dict[str, int] = {table: 0 for table in TABLES}
+
+    async def load(self, rows: Iterator[Tuple[str, Tuple[Any, ...]]]) -> None:
+        for table, row in rows:
+            buffer = self.buffers[table]
+            buffer.append(row)
+            if len(buffer) >= self.batch_size:
+                await self.flush()
+
+    async def flush(self) -> None:
+        for table in TABLES:
+            rows = self.buffers[table]
+            if not rows:
+                continue
+            await self.connection.copy_records_to_table(table, records=rows, columns=COLUMNS[table])
+            self.counts[table] += len(rows)
+            self.buffers[table] = []
+        print(f"  {self.counts['bookings']:>10,} bookings", flush=True)
+
+
+async def drop_secondary_indexes(connection: asyncpg.Connection) -> List[str]:
+    """Drop indexes that back no constraint and return their definitions for rebuilding."""
+
+    rows = await connection.fetch(
+        """
+        SELECT quote_ident(index_class.relname) AS name, pg_get_indexdef(i.indexrelid) AS definition
+        FROM pg_index i
+        JOIN pg_class index_class ON index_class.oid = i.indexrelid
+        WHERE i.indrelid = ANY($1::text[]::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+        """,
+        list(TABLES),
+    )
+    for row in rows:
+        await connection.execute(f"DROP INDEX {row['name']}")
+    return [row["definition"] for row in rows]
+
+
+async def next_id(connection: asyncpg.Connection, table: str) -> int:
+    return await connection.fetchval(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    dsn = make_url(get_settings().database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+    connection = await asyncpg.connect(dsn)
+    try:
+        if args.reset:
+            started = time.perf_counter()
+            # Venue deletes cascade to rooms, bookings and everything hanging off a booking.
+            await connection.execute("DELETE FROM door_entry_events WHERE venue_id LIKE $1", f"{VENUE_PREFIX}%")
+            await connection.execute("DELETE FROM venues WHERE id LIKE $1", f"{VENUE_PREFIX}%")
+            await connection.execute("DELETE FROM customers WHERE email LIKE $1", f"%@{EMAIL_DOMAIN}")
+            print(f"reset previous synthetic data in {time.perf_counter() - started:.1f}s")
+        elif await connection.fetchval("SELECT exists(SELECT 1 FROM venues WHERE id LIKE $1)", f"{VENUE_PREFIX}%"):
+            raise SystemExit("Synthetic data already loaded; pass --reset to replace it.")
+
+        started = time.perf_counter()
+        async with connection.transaction():
+            await connection.execute("SET LOCAL synchronous_commit = off")
+            await connection.execute(f"SET LOCAL maintenance_work_mem = '{args.maintenance_work_mem}'")
+            await connection.execute(f"LOCK TABLE {', '.join(TABLES)} IN SHARE ROW EXCLUSIVE MODE")
+            generator = ScaleDataGenerator(args, await next_id(connection, "customers"), await next_id(connection, "bookings"))
+            indexes = await drop_secondary_indexes(connection)
+
+            loader = CopyLoader(connection, args.batch_size)
+            await loader.load(itertools.chain(generator.venues(), generator.customers(), generator.bookings()))
+            await loader.flush()
+            loaded = time.perf_counter()
+
+            for definition in indexes:
+                await connection.execute(definition)
+            for table in ("customers", "bookings"):
+                await connection.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), max(id)) FROM {table} HAVING max(id) IS NOT NULL"
+                )
+            # COPY bypasses the ORM hooks that normally invalidate running API processes' catalogs.
+            await connection.execute("SELECT pg_notify($1, '')", CATALOG_CHANNEL)
+            indexed = time.perf_counter()
+
+        await connection.execute(f"ANALYZE {', '.join(TABLES)}")
+        finished = time.perf_counter()
+    finally:
+        await connection.close()
+
+    for table in TABLES:
+        print(f"{table:<20} {loader.counts[table]:>12,}")
+    print(
+        f"load {loaded - started:.1f}s  rebuild {len(indexes)} indexes {indexed - loaded:.1f}s  "
+        f"analyze {finished - indexed:.1f}s  total {finished - started:.1f}s"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=datetime.now(timezone.utc).date(), help="'Today' for the data, YYYY-MM-DD.")
+    parser.add_argument("--venues", type=int, default=2000)
+    parser.add_argument("--rooms-per-venue", type=float, default=4.0, help="Mean; the actual count varies per venue.")
+    parser.add_argument("--customers", type=int, default=200_000)
+    parser.add_argument("--bookings", type=int, default=1_000_000, help="Approximate; overlapping draws are dropped.")
+    parser.add_argument("--past-days", type=int, default=365)
+    parser.add_argument("--future-days", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--maintenance-work-mem", default="512MB", help="For the index rebuild.")
+    parser.add_argument("--reset", action="store_true", help="Delete the previous synthetic load first.")
+    args = parser.parse_args(argv)
+    if args.venues < 1 or args.customers < 1 or args.past_days + args.future_days < 1:
+        parser.error("--venues, --customers and the day range must be positive")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
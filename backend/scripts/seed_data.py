@@ -1,14 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from pathlib import Path
 
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
 
-from app.db.database import async_session_factory
+from app.data.venue_loader import iter_venues, resolve_venue_path
+from app.db.database import get_database, get_session_factory
 from app.models import (
     Booking,
     BookingStatus,
@@ -19,49 +18,18 @@ from app.models import (
     PaymentStatus,
     Room,
     SurveyResponse,
-    Venue,
 )
-from app.utils.config import get_settings
+from app.services.venue_sync_service import sync_venues
 
 
 async def seed() -> None:
-    settings = get_settings()
-    venue_path = Path(settings.venue_data_path)
-    if not venue_path.is_absolute():
-        venue_path = Path(__file__).resolve().parents[2] / venue_path
+    venue_path = resolve_venue_path()
     if not venue_path.exists():
         raise FileNotFoundError(f"Seed data file not found: {venue_path}")
 
-    payload = json.loads(venue_path.read_text(encoding="utf-8"))
-
-    async with async_session_factory() as session:
-        # Seed venues and rooms
-        for venue_payload in payload:
-            venue_id = str(venue_payload["id"])
-            existing = await session.get(Venue, venue_id)
-            if existing:
-                continue
-
-            venue = Venue(
-                id=venue_id,
-                name=venue_payload.get("name", venue_id.title()),
-                address=venue_payload.get("address"),
-                contact=venue_payload.get("contact"),
-                policies=venue_payload.get("policies", {}),
-            )
-
-            for room_payload in venue_payload.get("rooms", []):
-                room = Room(
-                    id=str(room_payload["id"]),
-                    label=room_payload.get("label", room_payload["id"]),
-                    capacity=int(room_payload.get("capacity", 0)),
-                    amenities=room_payload.get("amenities", []),
-                    availability=room_payload.get("availability", {}),
-                )
-                venue.rooms.append(room)
-
-            session.add(venue)
-
+    async with get_session_factory()() as session:
+        # Seed venues and rooms: one read per table, then only the rows that differ.
+        await sync_venues(session, iter_venues(venue_path))
         await session.commit()
 
         # Fetch seeded data for relationships
@@ -185,5 +153,12 @@ async def seed() -> None:
         await session.commit()
 
 
+async def main() -> None:
+    try:
+        await seed()
+    finally:
+        await get_database().dispose()
+
+
 if __name__ == "__main__":
-    asyncio.run(seed())
+    asyncio.run(main())
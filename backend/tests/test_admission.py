@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from app.utils.admission import (
+    PRIORITY_CRITICAL,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    AdmissionMiddleware,
+    LoadShedder,
+    TokenBuckets,
+)
+
+
+def test_token_bucket_refills_at_its_rate():
+    buckets = TokenBuckets(rate=2, burst=2)
+    assert buckets.take("a", now=0) == 0
+    assert buckets.take("a", now=0) == 0
+    assert buckets.take("a", now=0) == 0.5
+    assert buckets.take("b", now=0) == 0
+    assert buckets.take("a", now=0.5) == 0
+
+
+def test_shedder_drops_low_priorities_first_and_never_critical():
+    shedder = LoadShedder(slo=0.5, window=1)
+    shedder._window_started = 0.0
+    for now in (1, 2, 3):
+        shedder.record(2.0)
+        shedder.tick(now)
+    assert shedder.sheds(PRIORITY_LOW) and shedder.sheds(PRIORITY_HIGH)
+    assert not shedder.sheds(PRIORITY_CRITICAL)
+
+    shedder.record(0.1)
+    shedder.tick(4)
+    assert shedder.sheds(PRIORITY_LOW) and not shedder.sheds(PRIORITY_HIGH)
+    shedder.tick(5)
+    assert not shedder.sheds(PRIORITY_LOW)
+
+
+async def _call(middleware: AdmissionMiddleware, method: str, path: str, body: dict | None = None) -> dict:
+    sent: list[dict] = []
+    payload = json.dumps(body or {}).encode()
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": ("10.0.0.1", 5000)}
+    await middleware(scope, receive, send)
+    return sent[0]
+
+
+async def _echo(scope, receive, send) -> None:
+    message = await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": message["body"]})
+
+
+def test_middleware_sheds_surveys_but_admits_tool_calls():
+    shedder = LoadShedder(slo=0.5)
+    shedder.shed_from = PRIORITY_LOW
+    middleware = AdmissionMiddleware(_echo, shedder, session_buckets=TokenBuckets(rate=1, burst=1))
+
+    async def scenario() -> None:
+        survey = await _call(middleware, "POST", "/api/vapi/tools/survey", {"session_id": "s1"})
+        assert survey["status"] == 503
+        assert (b"retry-after", b"1") in survey["headers"]
+
+        tool = await _call(middleware, "POST", "/api/vapi/tools/availability", {"session_id": "s1"})
+        assert tool["status"] == 200
+        repeat = await _call(middleware, "POST", "/api/vapi/tools/availability", {"session_id": "s1"})
+        assert repeat["status"] == 429
+        other = await _call(middleware, "POST", "/api/vapi/tools/availability", {"session_id": "s2"})
+        assert other["status"] == 200
+
+        health = await _call(middleware, "GET", "/health")
+        assert health["status"] == 200
+
+    asyncio.run(scenario())
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.db.database import get_database, get_session_factory
+from app.main import app
+from app.models import Booking
+from app.stores.availability_cache import AvailabilityCache, DaySnapshot, build_occupancy, days_spanned
+from app.utils.metrics import metrics
+
+
+def _at(hour: float) -> datetime:
+    return datetime(2150, 3, 1, tzinfo=timezone.utc) + timedelta(hours=hour)
+
+
+def test_occupancy_separates_bookings_from_live_and_own_holds():
+    room = build_occupancy(
+        "r1",
+        "Main",
+        40,
+        [
+            (_at(9), _at(10), None, "someone"),
+            (_at(11), _at(12), datetime.now(timezone.utc) + timedelta(minutes=5), "holder"),
+            (_at(13), _at(14), datetime.now(timezone.utc) - timedelta(minutes=5), "lapsed"),
+        ],
+    )
+    now = time.time()
+    assert room.blockers(_at(9.5).timestamp(), _at(10.5).timestamp(), None, now) == (True, False)
+    assert room.blockers(_at(10).timestamp(), _at(11).timestamp(), None, now) == (False, False)
+    assert room.blockers(_at(11).timestamp(), _at(11.5).timestamp(), "rival", now) == (False, True)
+    assert room.blockers(_at(11).timestamp(), _at(11.5).timestamp(), "holder", now) == (False, False)
+    assert room.blockers(_at(13).timestamp(), _at(14).timestamp(), "rival", now) == (False, False)
+
+    assert days_spanned(_at(23), _at(24)) == [date(2150, 3, 1)]
+    assert days_spanned(_at(23), _at(25)) == [date(2150, 3, 1), date(2150, 3, 2)]
+
+
+def test_invalidation_marks_one_room_stale_and_refuses_racing_loads():
+    cache = AvailabilityCache()
+    key = ("venue", date(2150, 3, 1))
+    rooms = (build_occupancy("r1", "One", 4, []), build_occupancy("r2", "Two", 8, []))
+
+    token, previous = cache.begin_load(key)
+    assert previous is None
+    cache.invalidate("venue", "r1", [key[1]])
+    assert not cache.install(DaySnapshot("venue", key[1], rooms), token)
+    assert cache.get(key) is None
+
+    token, _ = cache.begin_load(key)
+    assert cache.install(DaySnapshot("venue", key[1], rooms), token)
+    assert cache.get(key).stale == frozenset()
+
+    assert cache.invalidate("venue", "r2", [key[1], date(2150, 3, 2)]) == 1
+    stale = cache.get(key)
+    assert stale.stale == {"r2"}
+    refreshed = stale.with_rooms([build_occupancy("r2", "Two", 8, [(_at(9), _at(10), None, None)])])
+    assert refreshed.stale == frozenset() and len(refreshed.rooms[1].starts) == 1
+    assert refreshed.rooms[0] is rooms[0]
+    assert 0 < cache.hit_ratio < 1
+
+
+async def _cleanup(booking_id: int) -> None:
+    try:
+        async with get_session_factory()() as session:
+            await session.execute(delete(Booking).where(Booking.id == booking_id))
+            await session.commit()
+    finally:
+        await get_database().dispose()
+
+
+def _counter(result: str) -> float:
+    return metrics.snapshot()["counters"].get(f"availability_cache_total{{result={result}}}", 0.0)
+
+
+def test_confirm_invalidates_the_cached_day():
+    start = datetime(2150, 6, 1, tzinfo=timezone.utc) + timedelta(days=uuid.uuid4().int % 20_000, hours=10)
+    session_id = f"availability-{uuid.uuid4().hex[:8]}"
+    request = {"session_id": session_id, "start_time": start.isoformat(), "duration_minutes": 60}
+
+    with TestClient(app) as client:
+        first = client.post("/api/vapi/tools/availability", json=request)
+        if first.status_code >= 500:
+            pytest.skip("Database not available for availability cache test")
+        assert all(room["available"] for room in first.json()["rooms"] if room["room_id"] == "aurora-main")
+
+        hits = _counter("hit")
+        client.post("/api/vapi/tools/availability", json=request)
+        assert _counter("hit") > hits
+
+        confirmed = client.post(
+            "/api/vapi/tools/booking",
+            json={
+                "session_id": session_id,
+                "room_id": "aurora-main",
+                "startTime": start.isoformat(),
+                "durationMinutes": 60,
+                "customer": {"name": "Availability Tester"},
+            },
+        )
+        assert confirmed.status_code == 200
+
+        after = client.post("/api/vapi/tools/availability", json={**request, "session_id": f"{session_id}-rival"}).json()
+        main_room = next(room for room in after["rooms"] if room["room_id"] == "aurora-main")
+        assert main_room["available"] is False
+        assert "Existing booking" in main_room["reasons"][0]
+
+    asyncio.run(_cleanup(confirmed.json()["booking_id"]))
@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+from app.db.database import get_database, get_session_factory
+from app.main import app
+from app.models import Booking
+from app.services.hold_sweeper import HoldSweeper
+
+
+def _slot() -> datetime:
+    # A far-future slot unique to this run so reruns never collide.
+    return datetime(2150, 1, 1, tzinfo=timezone.utc) + timedelta(hours=uuid.uuid4().int % 500_000)
+
+
+async def _expire_and_sweep(hold_id: int) -> int:
+    factory = get_session_factory()
+    try:
+        async with factory() as session:
+            await session.execute(
+                update(Booking).where(Booking.id == hold_id).values(hold_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+            await session.commit()
+        return await HoldSweeper(session_factory=factory, batch_size=1).sweep()
+    finally:
+        await get_database().dispose()
+
+
+async def _cleanup(booking_ids: list[int]) -> None:
+    try:
+        async with get_session_factory()() as session:
+            await session.execute(delete(Booking).where(Booking.id.in_(booking_ids)))
+            await session.commit()
+    finally:
+        await get_database().dispose()
+
+
+def test_hold_blocks_other_callers_and_converts_on_confirm():
+    start = _slot()
+    run = uuid.uuid4().hex[:8]
+    created: list[int] = []
+
+    with TestClient(app) as client:
+        availability = client.post(
+            "/api/vapi/tools/availability",
+            json={
+                "session_id": f"holder-{run}",
+                "start_time": start.isoformat(),
+                "duration_minutes": 60,
+                "hold_room_id": "aurora-main",
+            },
+        )
+        if availability.status_code >= 500:
+            pytest.skip("Database not available for hold test")
+        hold = availability.json()["hold"]
+        assert hold is not None and hold["room_id"] == "aurora-main"
+        created.append(hold["hold_id"])
+
+        rival = client.post(
+            "/api/vapi/tools/availability",
+            json={"session_id": f"rival-{run}", "start_time": start.isoformat(), "duration_minutes": 30},
+        ).json()
+        main_room = next(room for room in rival["rooms"] if room["room_id"] == "aurora-main")
+        assert main_room["available"] is False
+        assert "held" in main_room["reasons"][0]
+
+        conflict = client.post(
+            "/api/vapi/tools/holds",
+            json={"session_id": f"rival-{run}", "room_id": "aurora-main", "startTime": start.isoformat(), "durationMinutes": 30},
+        )
+        assert conflict.status_code == 409
+
+        confirmed = client.post(
+            "/api/vapi/tools/booking",
+            json={
+                "session_id": f"holder-{run}",
+                "room_id": "aurora-main",
+                "startTime": start.isoformat(),
+                "durationMinutes": 60,
+                "customer": {"name": "Hold Tester"},
+            },
+        )
+        assert confirmed.status_code == 200
+        assert confirmed.json()["booking_id"] == hold["hold_id"]
+        assert confirmed.json()["status"] == "CONFIRMED"
+
+        expiring = client.post(
+            "/api/vapi/tools/holds",
+            json={
+                "session_id": f"rival-{run}",
+                "room_id": "aurora-main",
+                "startTime": (start + timedelta(hours=2)).isoformat(),
+                "durationMinutes": 30,
+            },
+        )
+        assert expiring.status_code == 200
+        created.append(expiring.json()["hold_id"])
+
+    assert asyncio.run(_expire_and_sweep(created[-1])) >= 1
+    asyncio.run(_cleanup(created))
@@ -0,0 +1,15 @@
+from app.utils.contact import normalize_email, normalize_phone
+
+
+def test_normalize_email():
+    assert normalize_email("  Jordan@Example.COM ") == "jordan@example.com"
+    assert normalize_email("   ") is None
+    assert normalize_email(None) is None
+
+
+def test_normalize_phone_to_e164():
+    assert normalize_phone("(415) 555-1212") == "+14155551212"
+    assert normalize_phone("1-415-555-1212") == "+14155551212"
+    assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+    assert normalize_phone("0044 20 7946 0958") == "+442079460958"
+    assert normalize_phone("555-12") is None
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.database import get_database
+from app.main import app
+from app.services.customer_context_service import get_customer_context_service
+from app.stores.customer_context import CustomerContext, CustomerContextCache
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries():
+    cache = CustomerContextCache(max_entries=2, ttl_seconds=60)
+    cache.put(CustomerContext(phone_number="+1"))
+    cache.put(CustomerContext(phone_number="+2"))
+    assert cache.get("+1") is not None  # refresh +1 so +2 is the eviction candidate
+    cache.put(CustomerContext(phone_number="+3"))
+    assert cache.get("+2") is None
+    assert cache.get("+1") is not None
+
+    cache.put(CustomerContext(phone_number="+4", loaded_at=time.monotonic() - 120))
+    assert cache.get("+4") is None
+
+
+def test_ringing_prefetches_returning_caller():
+    session_id = "session-caller-id"
+    service = get_customer_context_service()
+    service.cache.clear()
+    # Earlier module-level TestClients leave pooled connections bound to their own loops.
+    asyncio.run(get_database().dispose())
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/calls/webhooks/vapi",
+            json={"event": "call.ringing", "session_id": session_id, "call": {"customer": {"number": "(401) 555-1212"}}},
+        )
+        assert response.status_code == 200
+
+        deadline = time.monotonic() + 5
+        context = None
+        while context is None and time.monotonic() < deadline:
+            context = client.get("/api/vapi/tools/customer/context", params={"session_id": session_id}).json()
+            if not context["returning_customer"]:
+                context = None
+                time.sleep(0.05)
+        if context is None:
+            pytest.skip("Database not available or not seeded for caller-ID prefetch test")
+
+        assert context["customer"]["email"] == "jordan@example.com"
+
+        stored = client.post("/api/vapi/tools/customer", json={"session_id": session_id, "name": "Jordan"}).json()
+        assert stored["returning_customer"] is True
+        assert stored["customer"]["email"] == "jordan@example.com"
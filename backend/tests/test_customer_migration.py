@@ -0,0 +1,85 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.utils.config import get_settings
+
+_MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "20261019_04_customer_contact_indexes.py"
+
+
+def _migration():
+    spec = importlib.util.spec_from_file_location("customer_contact_indexes", _MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def _merge(rows):
+    migration = _migration()
+    engine = create_async_engine(get_settings().database_url)
+    try:
+        async with engine.connect() as connection:
+            # Temp tables shadow the real ones for unqualified names on this connection.
+            await connection.execute(
+                text(
+                    "CREATE TEMP TABLE customers (id int PRIMARY KEY, name text, email text, "
+                    "phone_number text, attributes jsonb NOT NULL DEFAULT '{}'::jsonb)"
+                )
+            )
+            await connection.execute(text("CREATE TEMP TABLE bookings (id int PRIMARY KEY, customer_id int)"))
+            for row in rows:
+                await connection.execute(
+                    text(
+                        "INSERT INTO customers (id, name, email, phone_number, attributes) "
+                        "VALUES (:id, :name, :email, :phone, CAST(:attributes AS jsonb))"
+                    ),
+                    {"attributes": "{}", **row},
+                )
+                await connection.execute(text("INSERT INTO bookings VALUES (:id, :id)"), {"id": row["id"]})
+            await connection.execute(text("UPDATE customers SET email = nullif(lower(btrim(email)), '')"))
+            await connection.execute(text(migration.NORMALIZE_PHONE_SQL))
+            await connection.execute(text(migration.MERGE_DUPLICATES_SQL.format(key="email")))
+            await connection.execute(text(migration.DETACH_CONFLICTING_PHONES_SQL))
+            await connection.execute(text(migration.MERGE_DUPLICATES_SQL.format(key="phone_number")))
+            customers = {
+                row.id: row
+                for row in await connection.execute(
+                    text("SELECT id, name, email, phone_number, attributes FROM customers ORDER BY id")
+                )
+            }
+            bookings = dict((await connection.execute(text("SELECT id, customer_id FROM bookings"))).all())
+            await connection.rollback()
+            return customers, bookings
+    finally:
+        await engine.dispose()
+
+
+def test_merging_duplicates_keeps_every_contact_field():
+    rows = [
+        # Phone duplicates: the keeper has no email, the duplicate does.
+        {"id": 1, "name": None, "email": None, "phone": "(415) 555-1212"},
+        {"id": 2, "name": "Dana", "email": "d@x.com", "phone": "+1 415 555 1212"},
+        # Email duplicates: the keeper has no phone, the duplicate does.
+        {"id": 3, "name": "Eli", "email": "E@x.com", "phone": None, "attributes": '{"vip": true}'},
+        {"id": 4, "name": None, "email": "e@x.com ", "phone": "212-555-0100", "attributes": '{"vip": false}'},
+        # Same phone, different emails: never merged.
+        {"id": 5, "name": "Fay", "email": "f@x.com", "phone": "646-555-0199"},
+        {"id": 6, "name": "Gus", "email": "g@x.com", "phone": "646-555-0199"},
+    ]
+    try:
+        customers, bookings = asyncio.run(_merge(rows))
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Database not available for migration test: {exc}")
+
+    assert sorted(customers) == [1, 3, 5, 6]
+    assert (customers[1].name, customers[1].email, customers[1].phone_number) == ("Dana", "d@x.com", "+14155551212")
+    assert (customers[3].name, customers[3].email, customers[3].phone_number) == ("Eli", "e@x.com", "+12125550100")
+    assert customers[3].attributes == {"vip": False}
+    assert customers[5].phone_number == "+16465550199" and customers[5].email == "f@x.com"
+    assert customers[6].phone_number is None and customers[6].email == "g@x.com"
+    assert customers[6].attributes == {"unmerged_phone_number": "+16465550199"}
+    assert bookings == {1: 1, 2: 1, 3: 3, 4: 3, 5: 5, 6: 6}
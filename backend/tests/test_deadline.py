@@ -0,0 +1,74 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from app.services.availability_service import AvailabilityService
+from app.stores.availability_cache import AvailabilityCache, DaySnapshot, build_occupancy
+from app.utils.deadline import Deadline, DeadlineMiddleware, current_deadline, deadline_scope
+
+
+def _scope(path: str, headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    return {"type": "http", "method": "POST", "path": path, "headers": headers or []}
+
+
+async def _call(middleware: DeadlineMiddleware, scope: dict) -> list[dict]:
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent
+
+
+def test_tool_calls_past_their_budget_get_504_and_others_are_untouched():
+    seen: list[Deadline | None] = []
+
+    async def slow_app(scope, receive, send) -> None:
+        seen.append(current_deadline())
+        await asyncio.sleep(0.2)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    middleware = DeadlineMiddleware(slow_app, "/api/vapi/tools", "X-Tool-Deadline-Ms", default=5, budgets={"availability": 0.05})
+
+    sent = asyncio.run(_call(middleware, _scope("/api/vapi/tools/availability")))
+    assert sent[0]["status"] == 504
+    assert seen[-1] is not None and seen[-1].budget == 0.05
+
+    sent = asyncio.run(_call(middleware, _scope("/api/vapi/tools/booking", [(b"x-tool-deadline-ms", b"20")])))
+    assert sent[0]["status"] == 504
+    assert seen[-1].budget == 0.02
+
+    sent = asyncio.run(_call(middleware, _scope("/api/metadata/venues")))
+    assert sent[0]["status"] == 200
+    assert seen[-1] is None
+
+
+class _SlowAvailability(AvailabilityService):
+    async def _load(self, key):
+        await asyncio.sleep(1)
+        raise AssertionError("the deadline should have stopped waiting for this load")
+
+
+def test_availability_falls_back_to_stale_rooms_when_the_deadline_runs_out():
+    day = date(2150, 3, 1)
+    start = datetime(2150, 3, 1, 9, tzinfo=timezone.utc)
+    cache = AvailabilityCache()
+    token, _ = cache.begin_load(("venue", day))
+    booked = build_occupancy("r1", "One", 4, [(start, start + timedelta(hours=1), None, None)])
+    cache.install(DaySnapshot("venue", day, (booked, build_occupancy("r2", "Two", 8, []))), token)
+    cache.invalidate("venue", "r2", [day])
+    service = _SlowAvailability(cache)
+
+    async def scenario():
+        with deadline_scope(Deadline.after(0.15)):
+            return await service.check("venue", start, start + timedelta(hours=1))
+
+    checked = asyncio.run(scenario())
+    assert checked.degraded
+    rooms = {room.room_id: room for room in checked.rooms}
+    assert rooms["r1"].booked and rooms["r1"].verified
+    assert rooms["r2"].free and not rooms["r2"].verified
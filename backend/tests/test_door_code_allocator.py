@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, func, insert, select
+
+from app.db.database import get_database, get_session_factory
+from app.models import Booking, BookingStatus, DoorAccessEvent
+from app.services.door_access_service import DoorAccessService
+from app.services.door_code_allocator import DoorCodeAllocator, VenueCodes
+from app.services.keypad_service import KeypadService
+
+
+def test_codes_are_unique_and_length_grows_past_threshold():
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    codes = VenueCodes(length=2, max_length=4, grow_threshold=0.5)
+    issued = [codes.allocate(now + timedelta(hours=1), now) for _ in range(200)]
+
+    assert len(set(issued)) == len(issued)
+    assert {len(code) for code in issued[:51]} == {2}
+    assert codes.length == 3
+    assert all(len(code) == 3 for code in issued[51:])
+
+
+def test_expired_and_released_codes_are_reusable():
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    codes = VenueCodes(length=1, max_length=1, grow_threshold=1.0)
+    for digit in "0123456789":
+        codes.reserve(digit, now + timedelta(minutes=int(digit) + 1))
+    # Re-reserving extends the expiry; the stale heap entry must not free it early.
+    codes.reserve("0", now + timedelta(hours=1))
+
+    assert codes.release_expired(now + timedelta(minutes=5)) == 4
+    assert codes.allocate(now + timedelta(hours=1), now + timedelta(minutes=5)) in {"1", "2", "3", "4"}
+    codes.release("9")
+    assert len(codes) == 6
+
+
+async def _insert_after_another_process_took_the_code() -> tuple[str, int]:
+    allocator = DoorCodeAllocator(length=1, max_length=1, grow_threshold=1.0)
+    service = DoorAccessService(code_length=1, allocator=allocator, keypad=KeypadService())
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    try:
+        async with get_session_factory()() as session:
+            theirs, ours = (
+                await session.execute(
+                    insert(Booking)
+                    .values([{"venue_id": "aurora-hall", "status": BookingStatus.DRAFT}] * 2)
+                    .returning(Booking.id)
+                )
+            ).scalars()
+            await session.commit()
+        try:
+            async with get_session_factory()() as session:
+                codes = await allocator.load(session, "aurora-hall")
+                for digit in "012345689":
+                    codes.reserve(digit, expires_at)
+                # This process has not seen the code another one committed meanwhile.
+                await session.execute(
+                    insert(DoorAccessEvent).values(
+                        booking_id=theirs, venue_id="aurora-hall", door_code="7", expires_at=expires_at
+                    )
+                )
+                await session.commit()
+                rows = [{"booking_id": ours, "venue_id": "aurora-hall", "door_code": "7", "expires_at": expires_at}]
+                await service.insert_access_rows(session, "aurora-hall", rows)
+                await session.commit()
+                stored = (
+                    await session.execute(
+                        select(func.count()).where(
+                            DoorAccessEvent.venue_id == "aurora-hall",
+                            DoorAccessEvent.door_code == rows[0]["door_code"],
+                            DoorAccessEvent.released_at.is_(None),
+                        )
+                    )
+                ).scalar_one()
+            return rows[0]["door_code"], stored
+        finally:
+            async with get_session_factory()() as session:
+                await session.execute(delete(Booking).where(Booking.id.in_([theirs, ours])))
+                await session.commit()
+    finally:
+        await get_database().dispose()
+
+
+def test_code_committed_by_another_process_is_replaced_on_insert():
+    try:
+        code, stored = asyncio.run(_insert_after_another_process_took_the_code())
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Database not available for door code test: {exc}")
+
+    assert code != "7"
+    assert stored == 1
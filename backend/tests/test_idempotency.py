@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, update
+
+from app.db.database import get_database, get_session_factory
+from app.main import app
+from app.models import IdempotencyKey
+from app.services.hold_sweeper import HoldSweeper
+from app.services.idempotency_service import IdempotencyInProgressError, IdempotencyService, request_fingerprint
+
+
+def test_fingerprint_ignores_key_order():
+    assert request_fingerprint({"a": 1, "b": [1, 2]}) == request_fingerprint({"b": [1, 2], "a": 1})
+    assert request_fingerprint({"a": 1}) != request_fingerprint({"a": 2})
+
+
+def test_retried_payment_replays_stored_response():
+    headers = {"Idempotency-Key": f"test-{uuid.uuid4().hex}"}
+    payload = {"session_id": "session-idempotency", "amount": 42, "processing_delay": 0}
+
+    with TestClient(app) as client:
+        first = client.post("/api/vapi/tools/payment/apple-pay", json=payload, headers=headers)
+        if first.status_code >= 500:
+            pytest.skip("Database not available for idempotency test")
+        assert first.status_code == 202
+        assert first.json()["status"] == "PENDING"
+
+        retry = client.post("/api/vapi/tools/payment/apple-pay", json=payload, headers=headers)
+        assert retry.status_code == 202
+        assert retry.json() == first.json()
+
+        reused = client.post("/api/vapi/tools/payment/apple-pay", json={**payload, "amount": 43}, headers=headers)
+        assert reused.status_code == 422
+
+
+async def _abandon_and_retry(key: str) -> tuple[Any, Any, int]:
+    service = IdempotencyService(claim_timeout=timedelta(minutes=2))
+    sweeper = HoldSweeper(idempotency_retention=timedelta(hours=24))
+    try:
+        async with get_session_factory()() as session:
+            assert await service.claim(session, "test", key, "hash") is None
+            with pytest.raises(IdempotencyInProgressError):
+                await service.claim(session, "test", key, "hash")
+            # The original request died without completing or releasing its claim.
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(created_at=func.now() - timedelta(minutes=5))
+            )
+            await session.commit()
+            taken_over = await service.claim(session, "test", key, "hash")
+            await service.complete(session, "test", key, {"ok": True})
+            replayed = await service.claim(session, "test", key, "hash")
+
+            await session.execute(
+                update(IdempotencyKey).where(IdempotencyKey.key == key).values(created_at=func.now() - timedelta(days=2))
+            )
+            await session.commit()
+        purged = await sweeper.purge_idempotency_keys()
+        return taken_over, replayed, purged
+    finally:
+        await get_database().dispose()
+
+
+def test_abandoned_claims_are_taken_over_and_old_keys_purged():
+    try:
+        taken_over, replayed, purged = asyncio.run(_abandon_and_retry(f"abandoned-{uuid.uuid4().hex}"))
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Database not available for idempotency test: {exc}")
+    assert taken_over is None
+    assert replayed == {"ok": True}
+    assert purged >= 1
+
+
+class _VanishingKeySession:
+    """Every claim loses the race and the winner's row is gone before it can be read."""
+
+    def __init__(self) -> None:
+        self.statements = 0
+
+    async def execute(self, _stmt: Any) -> "_VanishingKeySession":
+        self.statements += 1
+        return self
+
+    def first(self) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+def test_claim_never_reports_ownership_without_a_row():
+    session = _VanishingKeySession()
+    with pytest.raises(IdempotencyInProgressError):
+        asyncio.run(IdempotencyService().claim(session, "test", "key", "hash"))  # type: ignore[arg-type]
+    assert session.statements == 6
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from app.db.database import get_database, get_session_factory
+from app.main import app
+from app.models import Booking, DoorEntryEvent
+from app.services.keypad_service import KeypadService
+from app.stores.keypad_index import KeypadIndex
+
+
+def test_index_checks_window_and_expires_through_the_wheel():
+    now = time.time()
+    start = datetime.fromtimestamp(now, timezone.utc)
+    index = KeypadIndex(tick_seconds=1.0, slots=8)
+    index.add("v1", "1234", 1, "room-a", start, start + timedelta(seconds=5))
+    index.add("v1", "5678", 2, "room-b", start + timedelta(hours=1), start + timedelta(hours=2))
+    index.add("v1", "9999", 3, None, start, start + timedelta(seconds=3))
+    # Re-adding with a later window leaves a stale wheel slot that must not evict it.
+    index.add("v1", "9999", 3, None, start, start + timedelta(seconds=30))
+
+    assert index.verify("v1", "1234", now=now + 1).granted
+    assert index.verify("v1", "1234", room_id="room-b", now=now + 1).reason == "wrong_room"
+    assert index.verify("v2", "1234", now=now + 1).reason == "unknown_code"
+    assert index.verify("v1", "5678", now=now + 1).reason == "too_early"
+    assert index.verify("v1", "1234", now=now + 6).reason == "expired"
+
+    assert index.expire(now + 10) == 1
+    assert index.verify("v1", "1234", now=now + 10).reason == "unknown_code"
+    assert index.verify("v1", "9999", now=now + 10).granted
+    # More than a full rotation later; far deadlines were kept in their buckets until due.
+    assert index.expire(now + 40) == 1
+    assert len(index) == 1
+
+
+async def _cleanup(booking_ids: list[int], keypad_id: str) -> int:
+    try:
+        async with get_session_factory()() as session:
+            recorded = len(
+                (await session.execute(select(DoorEntryEvent.id).where(DoorEntryEvent.keypad_id == keypad_id))).all()
+            )
+            await session.execute(delete(DoorEntryEvent).where(DoorEntryEvent.keypad_id == keypad_id))
+            await session.execute(delete(Booking).where(Booking.id.in_(booking_ids)))
+            await session.commit()
+        return recorded
+    finally:
+        await get_database().dispose()
+
+
+def _verify_when_indexed(client: TestClient, body: dict) -> dict:
+    # The index loads in the background and confirmed codes arrive through the outbox.
+    for _ in range(50):
+        response = client.post("/api/access/verify", json=body)
+        if response.status_code == 200 and response.json()["reason"] != "unknown_code":
+            return response.json()
+        time.sleep(0.1)
+    return response.json()
+
+
+def test_confirmed_and_regenerated_codes_are_verified_and_recorded():
+    asyncio.run(get_database().dispose())
+    start = datetime(2170, 1, 1, tzinfo=timezone.utc) + timedelta(days=uuid.uuid4().int % 50_000)
+    session_id = f"keypad-{uuid.uuid4().hex[:8]}"
+    keypad_id = f"test-{uuid.uuid4().hex[:8]}"
+    body = {
+        "venue_id": "aurora-hall",
+        "customer": {"name": "Keypad"},
+        "mode": "best_effort",
+        "items": [{"room_id": "aurora-main", "start_time": start.isoformat(), "duration_minutes": 60}],
+    }
+    created: list[int] = []
+
+    with TestClient(app) as client:
+        confirmed = client.post(f"/api/booking/{session_id}/bulk", json=body)
+        if confirmed.status_code >= 500:
+            pytest.skip("Database not available for keypad test")
+        booking = confirmed.json()["results"][0]["booking"]
+        created = [booking["id"]]
+        old_code = booking["door_access"]["code"]
+
+        check = {"venue_id": "aurora-hall", "code": old_code, "keypad_id": keypad_id}
+        assert _verify_when_indexed(client, check)["reason"] == "too_early"
+
+        regenerated = client.post(f"/api/booking/{booking['id']}/door-code")
+        new_code = regenerated.json()["booking"]["door_access"]["code"]
+        assert client.post("/api/access/verify", json=check).json()["reason"] == "unknown_code"
+        assert client.post("/api/access/verify", json={**check, "code": new_code}).json()["reason"] == "too_early"
+
+    # Shutdown flushes the buffered entry events (polling may have recorded extra misses).
+    assert asyncio.run(_cleanup(created, keypad_id)) >= 3
+
+
+async def _stage_and_finish(service: KeypadService, code: str, commit: bool) -> None:
+    start = datetime.now(timezone.utc)
+    try:
+        async with get_session_factory()() as session:
+            service.stage(session, "activate", "v1", code, 1, None, start, start + timedelta(hours=1))
+            await (session.commit() if commit else session.rollback())
+    finally:
+        await get_database().dispose()
+
+
+def test_codes_change_only_after_commit_and_follow_other_processes():
+    service = KeypadService()
+    try:
+        asyncio.run(_stage_and_finish(service, "1111", commit=False))
+        asyncio.run(_stage_and_finish(service, "2222", commit=True))
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Database not available for keypad test: {exc}")
+    assert service.verify("v1", "1111").reason == "unknown_code"
+    assert service.verify("v1", "2222").granted
+
+    # Another process regenerated the code: its NOTIFY revokes it here too.
+    service._on_notification(
+        json.dumps({"origin": "elsewhere", "changes": [{"action": "deactivate", "venue_id": "v1", "code": "2222", "booking_id": 1}]})
+    )
+    assert service.verify("v1", "2222").reason == "unknown_code"
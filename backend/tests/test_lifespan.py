@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app, request_tracker
+from app.services.outbox import get_outbox_dispatcher
+from app.services.payment_worker import get_payment_worker
+from app.stores.event_bus import event_bus
+from app.stores.session_store import SessionRecord, session_store
+from app.utils.background import TaskSupervisor
+from app.utils.config import get_settings
+
+
+def test_supervisor_drains_finished_work_and_cancels_stragglers():
+    completed: list[str] = []
+
+    async def quick() -> None:
+        await asyncio.sleep(0.01)
+        completed.append("quick")
+
+    async def stuck() -> None:
+        await asyncio.sleep(60)
+        completed.append("stuck")
+
+    async def scenario() -> int:
+        supervisor = TaskSupervisor()
+        supervisor.spawn(quick())
+        supervisor.spawn(stuck())
+        cancelled = await supervisor.drain(timeout=0.2)
+        assert len(supervisor) == 0
+        return cancelled
+
+    assert asyncio.run(scenario()) == 1
+    assert completed == ["quick"]
+
+
+def test_shutdown_flushes_scheduled_summaries():
+    session_id = "session-lifespan"
+    session_store.upsert(SessionRecord(session_id=session_id, call_type="booking"))
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/calls/webhooks/vapi",
+            json={"event": "call.completed", "session_id": session_id},
+        )
+        assert response.status_code == 200
+
+    record = session_store.get(session_id)
+    assert record is not None
+    assert record.summary is not None
+
+
+def test_shutdown_ends_open_event_streams_before_waiting():
+    events: list[dict] = []
+
+    async def open_stream() -> None:
+        # Counted as in flight the way the middleware counts the SSE request.
+        request_tracker.enter()
+        try:
+            async for event in event_bus.stream("session-sse-shutdown"):
+                events.append(event)
+        finally:
+            request_tracker.exit()
+
+    with TestClient(app) as client:
+        client.portal.start_task_soon(open_stream)
+        client.portal.call(event_bus.publish, "session-sse-shutdown", {"type": "status"})
+        started = time.perf_counter()
+    elapsed = time.perf_counter() - started
+
+    assert events == [{"type": "status"}]
+    assert request_tracker.active == 0
+    assert elapsed < get_settings().shutdown_grace_seconds / 2
+
+
+def test_background_workers_share_one_shutdown_deadline(monkeypatch):
+    monkeypatch.setattr(get_settings(), "shutdown_grace_seconds", 1.0)
+    timeouts: list[float] = []
+
+    def slow(stop, keyword: str):
+        async def slow_stop(**kwargs: float) -> None:
+            # Uses all of the time it is given, like a gateway call or flush that never finishes early.
+            timeouts.append(kwargs[keyword])
+            await asyncio.sleep(kwargs[keyword])
+            await stop(**{keyword: 0})
+
+        return slow_stop
+
+    worker, dispatcher = get_payment_worker(), get_outbox_dispatcher()
+    with TestClient(app):
+        monkeypatch.setattr(worker, "stop", slow(worker.stop, "timeout"))
+        monkeypatch.setattr(dispatcher, "stop", slow(dispatcher.stop, "flush_timeout"))
+        started = time.perf_counter()
+    elapsed = time.perf_counter() - started
+
+    assert len(timeouts) == 2 and all(timeout <= 1.0 for timeout in timeouts)
+    assert elapsed < 1.8
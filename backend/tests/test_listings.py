@@ -0,0 +1,54 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.db.database import get_database, get_session_factory
+from app.main import app
+from app.models import Booking
+
+
+async def _cleanup(booking_ids: list[int]) -> None:
+    try:
+        async with get_session_factory()() as session:
+            await session.execute(delete(Booking).where(Booking.id.in_(booking_ids)))
+            await session.commit()
+    finally:
+        await get_database().dispose()
+
+
+def test_bookings_page_by_cursor_and_stream_as_ndjson():
+    asyncio.run(get_database().dispose())
+    start = datetime(2170, 1, 1, tzinfo=timezone.utc) + timedelta(days=uuid.uuid4().int % 50_000)
+    items = [
+        {"room_id": "aurora-main", "start_time": (start + timedelta(hours=hour)).isoformat(), "duration_minutes": 30}
+        for hour in range(3)
+    ]
+    body = {"venue_id": "aurora-hall", "customer": {"name": "Lister"}, "items": items}
+    window = {"venue_id": "aurora-hall", "start_from": start.isoformat(), "start_to": (start + timedelta(days=1)).isoformat()}
+    created: list[int] = []
+
+    with TestClient(app) as client:
+        confirmed = client.post(f"/api/booking/list-{uuid.uuid4().hex[:8]}/bulk", json=body)
+        if confirmed.status_code >= 500:
+            pytest.skip("Database not available for listing test")
+        created = [result["booking"]["id"] for result in confirmed.json()["results"]]
+
+        first = client.get("/api/vapi/tools/bookings", params={**window, "limit": 2}).json()
+        assert [row["id"] for row in first["bookings"]] == sorted(created, reverse=True)[:2]
+        assert first["bookings"][0]["customer"]["name"] == "Lister"
+        second = client.get("/api/vapi/tools/bookings", params={**window, "limit": 2, "cursor": first["next_cursor"]}).json()
+        assert [row["id"] for row in second["bookings"]] == [min(created)]
+        assert second["next_cursor"] is None
+
+        export = client.get("/api/vapi/tools/bookings", params={**window, "format": "ndjson"})
+        assert export.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["id"] for line in export.text.splitlines()] == sorted(created, reverse=True)
+
+        assert client.get("/api/vapi/tools/bookings", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    asyncio.run(_cleanup(created))
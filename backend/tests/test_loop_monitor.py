@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from app.utils.loop_monitor import LoopLagMonitor
+from app.utils.metrics import MetricsRegistry
+
+
+def _block_the_loop() -> None:
+    time.sleep(0.3)
+
+
+def test_histogram_percentiles():
+    registry = MetricsRegistry()
+    for value in range(1, 101):
+        registry.observe("latency_ms", float(value))
+
+    snapshot = registry.histogram("latency_ms")
+    assert snapshot["count"] == 100
+    assert snapshot["p50"] == 50.0
+    assert snapshot["p99"] == 99.0
+    assert snapshot["max"] == 100.0
+
+
+def test_loop_monitor_captures_blocking_stack():
+    registry = MetricsRegistry()
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1, registry=registry)
+
+    async def scenario() -> None:
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _block_the_loop()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+
+    assert registry.counter_value("event_loop_stalls_total") >= 1
+    assert any("_block_the_loop" in "".join(report.stack) for report in monitor.reports)
+    assert registry.histogram("event_loop_lag_ms")["max"] >= 100
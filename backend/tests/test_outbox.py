@@ -0,0 +1,64 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.db.database import get_database, get_session_factory
+from app.models import OutboxMessage
+from app.services.outbox import OutboxDispatcher, outbox_stmt
+
+
+def test_backoff_doubles_and_is_capped():
+    dispatcher = OutboxDispatcher(base_backoff=2.0, max_backoff=10.0)
+    assert [dispatcher.backoff(attempt) for attempt in range(1, 6)] == [2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+async def _exercise_dispatcher(topic: str) -> dict:
+    calls: list[dict] = []
+
+    async def flaky(payload: dict) -> None:
+        calls.append(payload)
+        if len(calls) == 1:
+            raise RuntimeError("lock offline")
+
+    # Zero backoff so the retry is due immediately; unknown topics are dead-lettered at once.
+    dispatcher = OutboxDispatcher(base_backoff=0.0, max_attempts=3, topics=[topic, f"{topic}.unknown"])
+    dispatcher.register(topic, flaky)
+    try:
+        async with get_session_factory()() as session:
+            await session.execute(outbox_stmt(topic, [{"n": 1}]))
+            await session.execute(outbox_stmt(f"{topic}.unknown", [{"n": 2}]))
+            await session.commit()
+
+        first = await dispatcher.dispatch_once()
+        second = await dispatcher.dispatch_once()
+        third = await dispatcher.dispatch_once()
+        async with get_session_factory()() as session:
+            rows = {
+                row.topic: row
+                for row in (
+                    await session.execute(select(OutboxMessage).where(OutboxMessage.topic.like(f"{topic}%")))
+                ).scalars()
+            }
+            await session.execute(delete(OutboxMessage).where(OutboxMessage.topic.like(f"{topic}%")))
+            await session.commit()
+        return {"claimed": [first, second, third], "calls": calls, "rows": rows}
+    finally:
+        await get_database().dispose()
+
+
+def test_dispatcher_retries_then_delivers_and_dead_letters_unknown_topics():
+    asyncio.run(get_database().dispose())
+    topic = f"test.{uuid.uuid4().hex[:8]}"
+    try:
+        result = asyncio.run(_exercise_dispatcher(topic))
+    except OSError:
+        pytest.skip("Database not available for outbox test")
+
+    assert result["claimed"] == [2, 1, 0]
+    assert result["calls"] == [{"n": 1}, {"n": 1}]
+    delivered = result["rows"][topic]
+    assert delivered.delivered_at is not None and delivered.attempts == 2
+    dead = result["rows"][f"{topic}.unknown"]
+    assert dead.failed_at is not None and "no handler" in dead.last_error
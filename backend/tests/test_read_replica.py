@@ -0,0 +1,47 @@
+import asyncio
+import os
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import database
+from app.db.replica import ReplicaLagMonitor
+from app.utils.config import get_settings
+
+
+def test_reads_fall_back_to_primary_when_replica_lags(monkeypatch):
+    config = get_settings().model_copy(update={"database_read_url": "postgresql+asyncpg://replica/voicebooking"})
+    registry = database.Database(config)
+    monitor = ReplicaLagMonitor(engine=object(), max_lag=5.0, interval=2.0)  # type: ignore[arg-type]
+    registry._replica_monitor = monitor
+    monkeypatch.setattr(database, "_database", registry)
+
+    assert database.read_pool_name() == database.POOL_REPORTING
+
+    monitor.record(0.5)
+    assert database.read_pool_name() == database.POOL_REPLICA
+
+    monitor.record(12.0)
+    assert database.read_pool_name() == database.POOL_REPORTING
+
+    monitor.record(0.5)
+    monitor.checked_at = time.monotonic() - 60
+    assert database.read_pool_name() == database.POOL_REPORTING
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_READ_URL"),
+    reason="Set TEST_DATABASE_READ_URL to a second Postgres instance to run replica checks",
+)
+def test_replica_lag_measured_against_second_instance():
+    async def scenario() -> float | None:
+        engine = create_async_engine(os.environ["TEST_DATABASE_READ_URL"])
+        try:
+            return await ReplicaLagMonitor(engine, max_lag=5.0).measure()
+        finally:
+            await engine.dispose()
+
+    lag = asyncio.run(scenario())
+    assert lag is not None
+    assert lag >= 0
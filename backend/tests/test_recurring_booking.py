@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, select
+
+from app.db.database import get_database, get_session_factory
+from app.main import app
+from app.models import Booking, BookingSeries
+from app.services.recurrence import RecurrenceRule
+from app.services.recurring_booking_service import RecurringBookingService
+
+
+def test_weekly_rule_expands_by_weekday_and_stops_at_count():
+    start = datetime(2030, 1, 1, 9, tzinfo=timezone.utc)  # a Tuesday
+    rule = RecurrenceRule.from_dict({"freq": "WEEKLY", "by_weekday": ["TU", "TH"], "count": 5})
+    occurrences = rule.occurrences(start)
+    assert [o.strftime("%a %d") for o in occurrences] == ["Tue 01", "Thu 03", "Tue 08", "Thu 10", "Tue 15"]
+    assert RecurrenceRule.from_dict(rule.to_dict()) == rule
+
+    fortnightly = RecurrenceRule(freq="DAILY", interval=14, until=datetime(2030, 2, 1))
+    assert len(fortnightly.occurrences(start)) == 3
+    with pytest.raises(ValueError):
+        RecurrenceRule(freq="WEEKLY")
+
+
+async def _materialize_and_count(series_id: int, horizon_end: datetime) -> tuple[int, int]:
+    service = RecurringBookingService()
+    async with get_session_factory()() as session:
+        added = await service.materialize(session, series_id, horizon_end)
+        total = (
+            await session.execute(select(func.count()).select_from(Booking).where(Booking.series_id == series_id))
+        ).scalar_one()
+    await get_database().dispose()
+    return len(added), total
+
+
+async def _cleanup(series_ids: list[int], booking_ids: list[int]) -> None:
+    try:
+        async with get_session_factory()() as session:
+            await session.execute(
+                delete(Booking).where((Booking.series_id.in_(series_ids)) | (Booking.id.in_(booking_ids)))
+            )
+            await session.execute(delete(BookingSeries).where(BookingSeries.id.in_(series_ids)))
+            await session.commit()
+    finally:
+        await get_database().dispose()
+
+
+def test_series_reports_conflicts_and_materializes_within_horizon():
+    asyncio.run(get_database().dispose())
+    start = datetime(2180, 1, 1, 9, tzinfo=timezone.utc) + timedelta(weeks=uuid.uuid4().int % 2_000)
+    session_id = f"series-{uuid.uuid4().hex[:8]}"
+    base = {
+        "session_id": session_id,
+        "venue_id": "aurora-hall",
+        "room_id": "aurora-main",
+        "duration_minutes": 120,
+        "customer": {"name": "Team Lead"},
+    }
+    series_ids: list[int] = []
+    booking_ids: list[int] = []
+
+    with TestClient(app) as client:
+        blocker = client.post(
+            f"/api/booking/other-{session_id}/confirm",
+            json={**base, "session_id": f"other-{session_id}", "start_time": (start + timedelta(weeks=2)).isoformat()},
+        )
+        if blocker.status_code >= 500:
+            pytest.skip("Database not available for recurring booking test")
+        booking_ids.append(blocker.json()["booking"]["id"])
+
+        recurrence = {"freq": "WEEKLY", "count": 12}
+        strict = client.post(
+            f"/api/booking/{session_id}/confirm",
+            json={**base, "start_time": start.isoformat(), "recurrence": recurrence},
+        )
+        assert strict.status_code == 409
+        assert strict.json()["detail"]["conflicts"] == [(start + timedelta(weeks=2)).isoformat()]
+
+        relaxed = client.post(
+            f"/api/booking/{session_id}/confirm",
+            json={**base, "start_time": start.isoformat(), "recurrence": {**recurrence, "skip_conflicts": True}},
+        )
+        assert relaxed.status_code == 200
+        series = relaxed.json()["series"]
+        series_ids.append(series["id"])
+        assert series["occurrence_count"] == 12
+        assert len(series["conflicts"]) == 1
+        # Default 28-day horizon from the first occurrence: weeks 0, 1, 3 and 4 (week 2 skipped).
+        assert len(series["occurrences"]) == 4
+        assert all(o["door_code"] for o in series["occurrences"])
+
+    added, total = asyncio.run(_materialize_and_count(series["id"], start + timedelta(weeks=52)))
+    assert added == 7
+    assert total == 11
+
+    asyncio.run(_cleanup(series_ids, booking_ids))
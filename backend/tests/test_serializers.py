@@ -0,0 +1,51 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from app import serializers
+from app.models import PaymentStatus
+from app.serializers import dumps, venue_shapes
+
+
+def test_dumps_handles_enums_and_decimals_compactly():
+    assert json.loads(dumps({"status": PaymentStatus.SUCCEEDED, "amount": Decimal("50.00"), "name": "Café"})) == {
+        "status": "SUCCEEDED",
+        "amount": "50.00",
+        "name": "Café",
+    }
+    assert b" " not in dumps({"a": [1, 2]})
+
+
+def test_venue_shapes_group_room_rows_and_keep_roomless_venues():
+    rows = [
+        ("a", "Aurora", None, None, None, "a-1", "Main", 10, ["tv"], None),
+        ("a", "Aurora", None, None, None, "a-2", "Side", 4, None, {"mon": "9-5"}),
+        ("b", "Borealis", "2 Main St", None, {"deposit": 20}, None, None, None, None, None),
+    ]
+    venues = venue_shapes(rows)
+
+    assert [venue["id"] for venue in venues] == ["a", "b"]
+    assert venues[0]["policies"] == {}
+    assert [room["id"] for room in venues[0]["rooms"]] == ["a-1", "a-2"]
+    assert venues[0]["rooms"][0] == {
+        "id": "a-1",
+        "venue_id": "a",
+        "label": "Main",
+        "capacity": 10,
+        "amenities": ["tv"],
+        "availability": {},
+    }
+    assert venues[1]["rooms"] == [] and venues[1]["policies"] == {"deposit": 20}
+
+
+def test_stdlib_fallback_encodes_like_orjson(monkeypatch):
+    content = {"at": datetime(2030, 1, 1, 9, 30, 0, 250, tzinfo=timezone.utc), "day": date(2030, 1, 1), "id": uuid.UUID(int=1)}
+    fast = dumps(content)
+    monkeypatch.setattr(serializers, "orjson", None)
+
+    assert json.loads(dumps(content)) == json.loads(fast) == {
+        "at": "2030-01-01T09:30:00.000250+00:00",
+        "day": "2030-01-01",
+        "id": "00000000-0000-0000-0000-000000000001",
+    }
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight: SingleFlight[int] = SingleFlight("test")
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def scenario() -> None:
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(10)))
+        assert results == [42] * 10
+        assert calls == 1
+        assert flight.coalescing_ratio == pytest.approx(0.9)
+        assert "key" not in flight
+
+        await flight.do("key", work)
+        assert calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_work_running_and_errors_are_shared():
+    flight: SingleFlight[str] = SingleFlight("test")
+
+    async def scenario() -> None:
+        gate = asyncio.Event()
+
+        async def work() -> str:
+            await gate.wait()
+            return "done"
+
+        impatient = asyncio.ensure_future(flight.do("key", work))
+        patient = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        gate.set()
+        assert await patient == "done"
+        assert impatient.cancelled()
+
+        async def fail() -> str:
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        outcomes = await asyncio.gather(flight.do("bad", fail), flight.do("bad", fail), return_exceptions=True)
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert len(flight) == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import json
+import os
+
+from app.data.venue_loader import VenueIndex, iter_venues
+from app.services.venue_sync_service import venue_rows
+
+
+VENUES = [
+    {"id": "aurora-hall", "name": "Aurora Hall", "rooms": [{"id": "aurora-main", "label": "Main", "capacity": 80}]},
+    {"id": "harbor", "name": "Harbor \"Loft\" ]", "rooms": []},
+]
+
+
+def test_streaming_parse_survives_chunk_boundaries(tmp_path):
+    path = tmp_path / "venues.json"
+    path.write_text(json.dumps(VENUES, indent=2), encoding="utf-8")
+
+    for chunk_size in (1, 7, 4096):
+        assert list(iter_venues(path, chunk_size=chunk_size)) == VENUES
+
+    path.write_text("  [ ]\n", encoding="utf-8")
+    assert list(iter_venues(path)) == []
+
+
+def test_index_reparses_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "venues.json"
+    path.write_text(json.dumps(VENUES), encoding="utf-8")
+    index = VenueIndex(path)
+
+    first = index.snapshot()
+    assert index.get("aurora-hall")["name"] == "Aurora Hall"
+    assert index.get("missing") is None
+    assert index.snapshot() is first
+
+    path.write_text(json.dumps(VENUES[:1]), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert index.get("harbor") is None
+    assert index.reload() is not first
+
+    path.unlink()
+    assert index.all() == []
+
+
+def test_venue_rows_match_the_table_columns():
+    venues, rooms = venue_rows(VENUES)
+    assert venues["harbor"]["policies"] == {}
+    assert rooms["aurora-main"] == {
+        "id": "aurora-main",
+        "venue_id": "aurora-hall",
+        "label": "Main",
+        "capacity": 80,
+        "amenities": [],
+        "availability": {},
+    }
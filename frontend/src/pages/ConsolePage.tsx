@@ -192,13 +192,13 @@ export function ConsolePage() {
 
       const knownRooms = allRooms.filter((room) => SUPPORTED_ROOM_IDS.includes(room.id));
 
-      const bookingsUrl = `${backendBase}/vapi/tools/bookings`;
+      const bookingsUrl = `${backendBase}/vapi/tools/bookings?limit=500`;
       const bookingsResponse = await fetch(bookingsUrl, { headers: { Accept: 'application/json' } });
       let bookingsPayload: { bookings?: ApiBooking[] } | null = null;
       if (bookingsResponse.ok && bookingsResponse.headers.get('content-type')?.includes('application/json')) {
         bookingsPayload = (await bookingsResponse.json()) as { bookings?: ApiBooking[] };
       } else if (backendFallback && backendFallback !== backendBase) {
-        const fallbackBookings = await fetch(`${backendFallback}/vapi/tools/bookings`, { headers: { Accept: 'application/json' } });
+        const fallbackBookings = await fetch(`${backendFallback}/vapi/tools/bookings?limit=500`, { headers: { Accept: 'application/json' } });
         if (fallbackBookings.ok && fallbackBookings.headers.get('content-type')?.includes('application/json')) {
           bookingsPayload = (await fallbackBookings.json()) as { bookings?: ApiBooking[] };
         }